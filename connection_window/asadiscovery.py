@@ -0,0 +1,95 @@
+"""
+File with class to detect ASA in the local network in the background.
+"""
+
+import ipaddress
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from PyQt5.QtCore import pyqtSignal, QObject
+from . import utils as ut
+
+
+class ASADiscovery(QObject):
+    """
+    Class keeps addresses of ASA found in the local network. Addresses are returned from the cache at once, and the
+    cache is refreshed in a separate thread. An address is forgotten if ASA has not responded for a long time.
+    """
+
+    HOST_LIFETIME: float = 60
+    TIMEOUT: float = 0.5
+    host_found: pyqtSignal = pyqtSignal(str)
+
+    def __init__(self, host_lifetime: float = HOST_LIFETIME, timeout: float = TIMEOUT,
+                 reveal: Callable[..., List[ipaddress.IPv4Address]] = ut.reveal_asa) -> None:
+        """
+        :param host_lifetime: time in seconds during which the address of ASA that has not responded is kept;
+        :param timeout: max waiting time for responses from ASA in one refresh;
+        :param reveal: function to detect ASA in the local network.
+        """
+
+        super().__init__()
+        self._host_lifetime: float = host_lifetime
+        self._hosts: Dict[ipaddress.IPv4Address, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._reveal: Callable[..., List[ipaddress.IPv4Address]] = reveal
+        self._thread: Optional[threading.Thread] = None
+        self._timeout: float = timeout
+
+    def _add_host(self, host: ipaddress.IPv4Address) -> None:
+        """
+        :param host: address of ASA that has responded.
+        """
+
+        with self._lock:
+            self._hosts[host] = time.monotonic()
+        self.host_found.emit(str(host))
+
+    def _refresh(self) -> None:
+        """
+        Method detects ASA. It is run in a separate thread.
+        """
+
+        self._reveal(self._timeout, on_found=self._add_host)
+
+    def get_hosts(self) -> List[ipaddress.IPv4Address]:
+        """
+        :return: sorted addresses of ASA that have responded recently.
+        """
+
+        min_time = time.monotonic() - self._host_lifetime
+        with self._lock:
+            self._hosts = {host: last_time for host, last_time in self._hosts.items() if last_time >= min_time}
+            return sorted(self._hosts)
+
+    def is_refreshing(self) -> bool:
+        """
+        :return: True if the cache is being refreshed.
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self) -> None:
+        """
+        Method starts refreshing the cache in a separate thread, if it is not being refreshed yet. The signal
+        host_found is emitted for every ASA as soon as it responds.
+        """
+
+        if not self.is_refreshing():
+            self._thread = threading.Thread(target=self._refresh, daemon=True)
+            self._thread.start()
+
+
+_asa_discovery: Optional[ASADiscovery] = None
+
+
+def get_asa_discovery() -> ASADiscovery:
+    """
+    :return: an object that keeps addresses of ASA found in the local network. The object is shared by all
+    connection windows, so that found addresses are available when the window is opened again.
+    """
+
+    global _asa_discovery
+    if _asa_discovery is None:
+        _asa_discovery = ASADiscovery()
+    return _asa_discovery
@@ -2,6 +2,7 @@
 File with classes to select measurers.
 """
 
+import ipaddress
 import os
 from typing import Callable, List, Optional, Tuple
 from PyQt5.QtCore import pyqtSlot, QCoreApplication as qApp, QEvent, QObject, Qt
@@ -10,6 +11,7 @@ from PyQt5.QtWidgets import QComboBox, QGridLayout, QLabel, QMessageBox, QPushBu
 from window.scaler import update_scale_of_class
 from window.utils import DIR_MEDIA, show_message
 from . import utils as ut
+from .asadiscovery import ASADiscovery, get_asa_discovery
 from .productname import MeasurerType
 from .urichecker import URIChecker
 
@@ -32,6 +34,9 @@ class MeasurerURIsWidget(QWidget):
         """
 
         super().__init__()
+        self._asa_discovery: ASADiscovery = get_asa_discovery()
+        self._asa_discovery.host_found.connect(self._add_asa_host)
+        self._asa_uri: Optional[str] = None
         self._check_uri: Callable[[str], bool] = None
         self._initial_uris: List[str] = initial_uris
         self._measurer_type: MeasurerType = None
@@ -39,6 +44,30 @@ class MeasurerURIsWidget(QWidget):
         self._uri_checker: URIChecker = URIChecker()
         self._init_ui()
 
+    @pyqtSlot(str)
+    def _add_asa_host(self, host: str) -> None:
+        """
+        Slot adds URI of ASA that has just responded to available URIs for first measurer.
+        :param host: address of ASA.
+        """
+
+        if self._measurer_type != MeasurerType.ASA:
+            return
+
+        combo_box = self.combo_boxes_measurers[0]
+        uri = f"xmlrpc://{host}"
+        if combo_box.findText(uri) != -1:
+            return
+
+        index = 0
+        while index < combo_box.count() and combo_box.itemText(index) != "virtual" and \
+                get_host_from_uri(combo_box.itemText(index)) < ipaddress.ip_address(host):
+            index += 1
+        combo_box.insertItem(index, uri)
+        if uri == self._asa_uri and combo_box.currentText() == "virtual":
+            combo_box.setCurrentText(uri)
+            self._uri_checker.color_widgets(*self.combo_boxes_measurers)
+
     def _check_uri_correctness(self) -> bool:
         """
         Method checks that there are correct values for URIs.
@@ -104,13 +133,13 @@ class MeasurerURIsWidget(QWidget):
 
     def _init_asa(self, uri: str = None) -> None:
         """
-        Method initializes available URIs for first measurer of type ASA.
+        Method initializes available URIs for first measurer of type ASA. Addresses of ASA found earlier are shown at
+        once, and addresses of ASA that respond to a new search are added as they come.
         :param uri: selected address for first measurer.
         """
 
-        ip_addresses = ut.reveal_asa()
-        ip_addresses.sort()
-        uris_for_first = [f"xmlrpc://{host}" for host in ip_addresses]
+        self._asa_uri = uri
+        uris_for_first = [f"xmlrpc://{host}" for host in self._asa_discovery.get_hosts()]
         uris_for_first.append("virtual")
         self.combo_boxes_measurers[0].clear()
         self.combo_boxes_measurers[0].addItems(uris_for_first)
@@ -120,6 +149,7 @@ class MeasurerURIsWidget(QWidget):
             self.combo_boxes_measurers[0].setCurrentText("virtual")
 
         self._uri_checker.color_widgets(*self.combo_boxes_measurers)
+        self._asa_discovery.refresh()
 
     def _init_ivm10(self, port_1: str = None, port_2: str = None) -> None:
         """
@@ -352,6 +382,18 @@ def check_string_in_list(string: Optional[str], list_of_strings: List[Optional[s
     return get_string_index_in_list(string, list_of_strings) is not None
 
 
+def get_host_from_uri(uri: str) -> ipaddress.IPv4Address:
+    """
+    :param uri: URI of ASA in the format xmlrpc://x.x.x.x.
+    :return: address of ASA. For incorrect URI the zero address is returned.
+    """
+
+    try:
+        return ipaddress.ip_address(uri.split("://")[-1])
+    except ValueError:
+        return ipaddress.IPv4Address(0)
+
+
 def get_string_index_in_list(string: Optional[str], list_of_strings: List[Optional[str]]) -> Optional[int]:
     """
     :param string: string;
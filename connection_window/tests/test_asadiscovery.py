@@ -0,0 +1,80 @@
+import ipaddress
+import socket
+import threading
+import time
+import unittest
+from typing import List
+from PyQt5.QtCore import QCoreApplication
+from connection_window.asadiscovery import ASADiscovery
+from connection_window.utils import reveal_asa
+
+
+class ASAResponder(threading.Thread):
+    """
+    Class for thread that answers requests to detect ASA on the local address.
+    """
+
+    def __init__(self, delay: float) -> None:
+        """
+        :param delay: time in seconds after which the thread answers all received requests.
+        """
+
+        super().__init__(daemon=True)
+        self._delay: float = delay
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.settimeout(0.1)
+        self.port: int = self._socket.getsockname()[1]
+        self.requests: List[bytes] = []
+
+    def run(self) -> None:
+        addresses = []
+        end_time = time.monotonic() + self._delay
+        while time.monotonic() < end_time:
+            try:
+                data, address = self._socket.recvfrom(4096)
+            except socket.timeout:
+                continue
+            self.requests.append(data)
+            addresses.append(address)
+
+        for address in addresses:
+            self._socket.sendto(b"DISCOVER_CUBIELORD_RESPONSE 8080", address)
+        self._socket.close()
+
+
+class TestASADiscovery(unittest.TestCase):
+
+    def test_cache(self) -> None:
+        app = QCoreApplication.instance() or QCoreApplication([])
+        host = ipaddress.ip_address("127.0.0.1")
+
+        def reveal(timeout: float, on_found) -> List[ipaddress.IPv4Address]:
+            on_found(host)
+            return [host]
+
+        discovery = ASADiscovery(host_lifetime=0.3, reveal=reveal)
+        found_hosts = []
+        discovery.host_found.connect(found_hosts.append)
+        self.assertEqual(discovery.get_hosts(), [])
+        discovery.refresh()
+        while discovery.is_refreshing() or not found_hosts:
+            app.processEvents()
+        self.assertEqual(found_hosts, ["127.0.0.1"])
+        self.assertEqual(discovery.get_hosts(), [host])
+        time.sleep(0.3)
+        self.assertEqual(discovery.get_hosts(), [])
+
+    def test_reveal_asa(self) -> None:
+        responder = ASAResponder(0.3)
+        responder.start()
+        found_hosts = []
+        start = time.monotonic()
+        hosts = reveal_asa(0.5, on_found=found_hosts.append, addresses=["127.0.0.1", "127.0.0.1", "127.0.0.1"],
+                           port=responder.port, broadcast_address="127.0.0.1")
+        # Requests from all addresses are sent at once, so the function waits only once
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(len(responder.requests), 3)
+        self.assertTrue(all(request.startswith(b"DISCOVER_CUBIELORD_REQUEST ") for request in responder.requests))
+        self.assertEqual(hosts, [ipaddress.ip_address("127.0.0.1")])
+        self.assertEqual(found_hosts, hosts)
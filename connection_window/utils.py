@@ -6,12 +6,12 @@ import configparser
 import ipaddress
 import logging
 import os
-import select
+import selectors
 import socket
 import struct
-from datetime import datetime, timedelta
+import time
 from platform import system
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 import psutil
 import serial.tools.list_ports
 import serial.tools.list_ports_common
@@ -21,6 +21,7 @@ from epcore.ivmeasurer import IVMeasurerVirtual, IVMeasurerVirtualASA
 from .productname import MeasurerType
 
 
+ASA_DISCOVERY_PORT: int = 8008
 logger = logging.getLogger("eplab")
 
 
@@ -81,23 +82,7 @@ def find_urpc_ports(device_type: str) -> List[str]:
     :return: list of available COM-ports.
     """
 
-    os_name = get_platform()
-    dir_name = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    config_file = os.path.join(dir_name, "resources", os_name, f"{device_type}_config.ini")
-    config = configparser.ConfigParser()
-    try:
-        config.read(config_file)
-    except Exception as exc:
-        logger.error("Cannot open '%s': %s", config_file, exc)
-        raise
-
-    try:
-        vid = int(config["Global"]["vid"], base=16)
-        pid = int(config["Global"]["pid"], base=16)
-    except Exception as exc:
-        logger.error("Cannot read 'VID' and 'PID' fields from '%s': %s", config_file, exc)
-        raise
-
+    vid, pid = get_vid_and_pid(device_type)
     serial_ports = serial.tools.list_ports.comports()
     serial_ports = filter_ports_by_vid_and_pid(serial_ports, vid, pid)
     return sorted(map(lambda port: create_uri_name(port.device), serial_ports))
@@ -152,6 +137,17 @@ def get_different_uris(uris: List[str]) -> List[str]:
     return different_uris
 
 
+def get_ipv4_addresses() -> List[str]:
+    """
+    :return: IPv4 addresses of all network interfaces of the computer.
+    """
+
+    addresses = []
+    for iface in psutil.net_if_addrs().values():
+        addresses.extend(address.address for address in iface if address.family == socket.AF_INET)
+    return addresses
+
+
 def get_platform() -> Optional[str]:
     """
     Function returns name of OS.
@@ -192,10 +188,39 @@ def get_unique_uris(uris: List[Optional[str]]) -> List[Optional[str]]:
     return unique_uris
 
 
-def reveal_asa(timeout: float = None) -> List[ipaddress.IPv4Address]:
+def get_vid_and_pid(device_type: str) -> Tuple[int, int]:
+    """
+    :param device_type: type of device.
+    :return: VID and PID of the USB devices of the given type.
     """
-    Function detects ASA in the local network.
-    :param timeout: max waiting time for responses from ASA.
+
+    dir_name = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_file = os.path.join(dir_name, "resources", get_platform(), f"{device_type}_config.ini")
+    config = configparser.ConfigParser()
+    try:
+        config.read(config_file)
+    except Exception as exc:
+        logger.error("Cannot open '%s': %s", config_file, exc)
+        raise
+
+    try:
+        return int(config["Global"]["vid"], base=16), int(config["Global"]["pid"], base=16)
+    except Exception as exc:
+        logger.error("Cannot read 'VID' and 'PID' fields from '%s': %s", config_file, exc)
+        raise
+
+
+def reveal_asa(timeout: float = None, on_found: Optional[Callable[[ipaddress.IPv4Address], None]] = None,
+               addresses: Optional[List[str]] = None, port: int = ASA_DISCOVERY_PORT,
+               broadcast_address: str = "255.255.255.255") -> List[ipaddress.IPv4Address]:
+    """
+    Function detects ASA in the local network. The request is sent from all network interfaces at once, and then
+    responses are waited for on all interfaces together.
+    :param timeout: max waiting time for responses from ASA;
+    :param on_found: function to be called for every new ASA as soon as it responds;
+    :param addresses: local addresses from which to send the request. By default, addresses of all interfaces are used;
+    :param port: port to which the request is sent;
+    :param broadcast_address: address to which the request is sent.
     :return: list of IP addresses.
     """
 
@@ -203,32 +228,60 @@ def reveal_asa(timeout: float = None) -> List[ipaddress.IPv4Address]:
     if timeout is None:
         timeout = waiting_time
 
-    timeout = timedelta(seconds=timeout)
-    ifaces = psutil.net_if_addrs()
+    if addresses is None:
+        addresses = get_ipv4_addresses()
+
     ip_addresses = []
-    for iface_name, iface in ifaces.items():
-        iface_name = iface_name.encode(errors="replace").decode(errors="replace")
-        for address in iface:
-            if address.family != socket.AF_INET:
-                continue
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-                    sock.bind((address.address, 0))
-                    sock.sendto(("DISCOVER_CUBIELORD_REQUEST " + str(sock.getsockname()[1])).encode(),
-                                ("255.255.255.255", 8008))
-                    sock.setblocking(0)
-                    time_end = datetime.utcnow() + timeout
-                    while True:
-                        time_now = datetime.utcnow()
-                        time_left = (time_end - time_now).total_seconds()
-                        if time_left < 0:
-                            break
-                        ready = select.select([sock], [], [], time_left)
-                        if ready[0]:
-                            data, addr = sock.recvfrom(4096)
-                            if data.startswith("DISCOVER_CUBIELORD_RESPONSE ".encode()):
-                                ip_addresses.append(ipaddress.ip_address(str(addr[0])))
-            except Exception as exc:
-                logger.error("Failed to bind to interface %s and address %s: %s", iface_name, address.address, exc)
+    sockets = send_asa_discovery_requests(addresses, port, broadcast_address)
+    with selectors.DefaultSelector() as selector:
+        try:
+            for sock in sockets:
+                selector.register(sock, selectors.EVENT_READ)
+
+            time_end = time.monotonic() + timeout
+            while sockets:
+                time_left = time_end - time.monotonic()
+                if time_left < 0:
+                    break
+
+                for key, _ in selector.select(time_left):
+                    try:
+                        data, addr = key.fileobj.recvfrom(4096)
+                    except OSError:
+                        continue
+
+                    if data.startswith("DISCOVER_CUBIELORD_RESPONSE ".encode()):
+                        ip_address = ipaddress.ip_address(str(addr[0]))
+                        if ip_address not in ip_addresses:
+                            ip_addresses.append(ip_address)
+                            if on_found:
+                                on_found(ip_address)
+        finally:
+            for sock in sockets:
+                sock.close()
     return ip_addresses
+
+
+def send_asa_discovery_requests(addresses: List[str], port: int = ASA_DISCOVERY_PORT,
+                                broadcast_address: str = "255.255.255.255") -> List[socket.socket]:
+    """
+    :param addresses: local addresses from which to send the request to detect ASA;
+    :param port: port to which the request is sent;
+    :param broadcast_address: address to which the request is sent.
+    :return: non-blocking sockets from which the request has been sent.
+    """
+
+    sockets = []
+    for address in addresses:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.bind((address, 0))
+            sock.setblocking(False)
+            sock.sendto(f"DISCOVER_CUBIELORD_REQUEST {sock.getsockname()[1]}".encode(), (broadcast_address, port))
+        except Exception as exc:
+            logger.error("Failed to bind to address %s: %s", address, exc)
+            sock.close()
+        else:
+            sockets.append(sock)
+    return sockets
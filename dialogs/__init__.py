@@ -3,8 +3,10 @@ from dialogs.keymapdialog import show_keymap_info
 from dialogs.languageselectionwindow import show_language_selection_window
 from dialogs.measurersettingswindow import show_measurer_settings_window
 from dialogs.progresswindow import ProgressWindow
-from dialogs.reportgenerationwindow import ReportGenerationThread, show_report_generation_window
+from dialogs.reportgenerationwindow import (ReportGenerationThread, ReportGenerationWindow, ReportStatusWidget,
+                                            show_report_generation_window)
 
 
-__all__ = ["ProgressWindow", "ReportGenerationThread", "show_keymap_info", "show_language_selection_window",
-           "show_measurer_settings_window", "show_product_info", "show_report_generation_window"]
+__all__ = ["ProgressWindow", "ReportGenerationThread", "ReportGenerationWindow", "ReportStatusWidget",
+           "show_keymap_info", "show_language_selection_window", "show_measurer_settings_window", "show_product_info",
+           "show_report_generation_window"]
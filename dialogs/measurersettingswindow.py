@@ -3,6 +3,7 @@ File with class for dialog window with settings of measurer.
 """
 
 import logging
+import threading
 from functools import partial
 from inspect import getmembers, ismethod
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -46,15 +47,17 @@ class MeasurerSettingsWindow(QDialog):
     TIME_TO_FIX_SIZE_MS: int = 50
 
     def __init__(self, parent=None, settings: Dict[str, Any] = None, measurer: IVMeasurerBase = None,
-                 device_name: str = None) -> None:
+                 device_name: str = None, device_lock: Optional[threading.RLock] = None) -> None:
         """
         :param parent: main window of application;
         :param settings: dictionary with all settings of measurer;
         :param measurer: specific measurer for which settings will be intended;
-        :param device_name: name of measurer.
+        :param device_name: name of measurer;
+        :param device_lock: lock that must be held while working with the measurer.
         """
 
         super().__init__(parent, Qt.WindowTitleHint | Qt.WindowCloseButtonHint)
+        self._device_lock: threading.RLock = device_lock or threading.RLock()
         self._measurer: IVMeasurerBase = measurer
         self._all_widgets: List[QWidget] = []
         self._widgets: Dict[str, QWidget] = dict()
@@ -296,7 +299,8 @@ class MeasurerSettingsWindow(QDialog):
             for element in settings.get("elements", []):
                 widget = None
                 if "parameter" in element:
-                    current_value = self._measurer.get_current_value_of_parameter(element["parameter"])
+                    with self._device_lock:
+                        current_value = self._measurer.get_current_value_of_parameter(element["parameter"])
                 if element["type"] == "button":
                     widget = self._create_button(element)
                 elif element["type"] == "radio_button":
@@ -355,7 +359,8 @@ class MeasurerSettingsWindow(QDialog):
 
         friendly_name = data.get(f"label_{self.lang}")
         try:
-            result = command_to_run()
+            with self._device_lock:
+                result = command_to_run()
             if "required_result" in data and result != data["required_result"]:
                 text = data.get(f"error_message_{self.lang}",
                                 qApp.translate("dialogs", "Команда '{}' завершилась неудачно.").format(friendly_name))
@@ -390,14 +395,16 @@ class MeasurerSettingsWindow(QDialog):
             else:
                 if data["type"] == "line_edit":
                     converted_value = self._process_line_edit(data, converted_value)
-                self._measurer.set_value_to_parameter(parameter_name, converted_value)
+                with self._device_lock:
+                    self._measurer.set_value_to_parameter(parameter_name, converted_value)
 
         if errors:
             ut.show_message(qApp.translate("t", "Ошибка"), "<br>".join(errors))
             return
 
         try:
-            self._measurer.set_settings()
+            with self._device_lock:
+                self._measurer.set_settings()
             self.close()
         except Exception:
             logger.error("Failed to set settings in measurer '%s'", self._measurer.name)
@@ -405,14 +412,18 @@ class MeasurerSettingsWindow(QDialog):
                             qApp.translate("dialogs", "Не удалось задать настройки для измерителя."))
 
 
-def show_measurer_settings_window(main_window, measurer: IVMeasurerBase, device_name: str) -> None:
+def show_measurer_settings_window(main_window, measurer: IVMeasurerBase, device_name: str,
+                                  device_lock: Optional[threading.RLock] = None) -> None:
     """
     :param main_window: main window of application;
     :param measurer: specific measurer for which settings will be intended;
-    :param device_name: name of measurer.
+    :param device_name: name of measurer;
+    :param device_lock: lock that must be held while working with the measurer.
     """
 
-    all_settings = measurer.get_all_settings()
-    window = MeasurerSettingsWindow(main_window, all_settings, measurer, device_name)
+    device_lock = device_lock or threading.RLock()
+    with device_lock:
+        all_settings = measurer.get_all_settings()
+    window = MeasurerSettingsWindow(main_window, all_settings, measurer, device_name, device_lock)
     main_window.measurers_disconnected.connect(window.close)
     window.exec_()
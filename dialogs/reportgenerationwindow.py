@@ -4,15 +4,16 @@ File with class for dialog window to create report for board.
 
 import queue
 import time
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from PyQt5.QtCore import pyqtSignal, pyqtSlot, QCoreApplication as qApp, Qt, QThread
-from PyQt5.QtGui import QCloseEvent
-from PyQt5.QtWidgets import QDialog, QGroupBox, QHBoxLayout, QLayout, QProgressBar, QTextEdit, QVBoxLayout
+from PyQt5.QtWidgets import (QDialog, QGroupBox, QHBoxLayout, QLayout, QProgressBar, QPushButton, QTextEdit,
+                             QVBoxLayout, QWidget)
 from epcore.elements import Board
 from report_generator import ConfigAttributes, ObjectsForReport, ReportGenerator, ReportTypes, ScalingTypes
 from window import utils as ut
 from window.common import WorkMode
 from window.language import get_language, Language
+from window.plansavingthread import create_board_snapshot
 from window.scaler import update_scale_of_class
 
 
@@ -138,7 +139,8 @@ class ReportGenerationThread(QThread):
 @update_scale_of_class
 class ReportGenerationWindow(QDialog):
     """
-    Class for dialog window to create report for board.
+    Class for dialog window to create report for board. The window is not modal, so the operator can continue working
+    while the report is being generated. Closing the window does not stop report generation.
     """
 
     def __init__(self, parent, thread: ReportGenerationThread) -> None:
@@ -150,20 +152,11 @@ class ReportGenerationWindow(QDialog):
         super().__init__(parent, Qt.WindowTitleHint | Qt.WindowCloseButtonHint)
         self._number_of_steps_done: int = 0
         self._thread: ReportGenerationThread = thread
-        self._total_number: int = None
+        self._total_number: Optional[int] = None
         self._init_ui()
         self._init_thread()
 
     def _init_thread(self) -> None:
-        for signal_name in ("exception_raised", "generation_finished", "generation_stopped", "step_done",
-                            "step_started", "total_number_of_steps_calculated"):
-            signal = getattr(self._thread.report_generator, signal_name, None)
-            if signal:
-                try:
-                    signal.disconnect()
-                except Exception:
-                    pass
-
         self._thread.close_window_signal.connect(self.close)
         self._thread.report_generator.step_done.connect(self.change_progress)
         self._thread.report_generator.step_started.connect(self.text_edit_info.append)
@@ -171,6 +164,7 @@ class ReportGenerationWindow(QDialog):
 
     def _init_ui(self) -> None:
         self.setWindowTitle(qApp.translate("dialogs", "Генератор отчетов"))
+        self.setModal(False)
         self.progress_bar: QProgressBar = QProgressBar()
         self.progress_bar.setMinimum(0)
         self.progress_bar.setMaximum(100)
@@ -188,9 +182,13 @@ class ReportGenerationWindow(QDialog):
         h_box_layout.addWidget(self.text_edit_info)
         self.group_box_info.setLayout(h_box_layout)
 
+        self.button_stop: QPushButton = QPushButton(qApp.translate("dialogs", "Остановить"))
+        self.button_stop.clicked.connect(self._thread.stop_generation)
+
         v_box_layout = QVBoxLayout()
         v_box_layout.addWidget(self.progress_bar)
         v_box_layout.addWidget(self.group_box_info)
+        v_box_layout.addWidget(self.button_stop, alignment=Qt.AlignRight)
         v_box_layout.setSizeConstraint(QLayout.SetFixedSize)
         self.setLayout(v_box_layout)
         self.adjustSize()
@@ -198,15 +196,83 @@ class ReportGenerationWindow(QDialog):
     @pyqtSlot()
     def change_progress(self) -> None:
         self._number_of_steps_done += 1
-        self.progress_bar.setValue(int(self._number_of_steps_done / self._total_number * 100))
+        if self._total_number:
+            self.progress_bar.setValue(int(self._number_of_steps_done / self._total_number * 100))
+
+    @pyqtSlot(int)
+    def set_total_number_of_steps(self, number: int) -> None:
+        """
+        :param number: total number of steps to generate a report.
+        """
+
+        self._number_of_steps_done = 0
+        self._total_number = number
+        self.progress_bar.setValue(0)
+        self.text_edit_info.clear()
+
+    def start_generation(self, board: Board, dir_for_report: str, tolerance: float, work_mode: WorkMode) -> None:
+        """
+        Method starts report generation for the snapshot of the board, so the board can be changed while the report is
+        being generated.
+        :param board: board or measurement plan for which to generate a report;
+        :param dir_for_report: directory where to save the report;
+        :param tolerance: tolerance;
+        :param work_mode: application work mode.
+        """
+
+        self._thread.add_task(create_board_snapshot(board), dir_for_report, tolerance, work_mode)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+
+class ReportStatusWidget(QWidget):
+    """
+    Class for widget in the status bar of the main window that shows the progress of report generation.
+    """
+
+    def __init__(self, thread: ReportGenerationThread, window: ReportGenerationWindow) -> None:
+        """
+        :param thread: thread in which reports are generated;
+        :param window: dialog window with details of report generation.
+        """
 
-    def closeEvent(self, event: QCloseEvent) -> None:
+        super().__init__()
+        self._number_of_steps_done: int = 0
+        self._total_number: Optional[int] = None
+        self._init_ui(thread, window)
+        thread.close_window_signal.connect(self.hide)
+        thread.report_generator.step_done.connect(self.change_progress)
+        thread.report_generator.total_number_of_steps_calculated.connect(self.set_total_number_of_steps)
+        self.hide()
+
+    def _init_ui(self, thread: ReportGenerationThread, window: ReportGenerationWindow) -> None:
         """
-        :param event: close event.
+        :param thread: thread in which reports are generated;
+        :param window: dialog window with details of report generation.
         """
 
-        self._thread.stop_generation()
-        super().closeEvent(event)
+        self.button_details: QPushButton = QPushButton(qApp.translate("dialogs", "Генерация отчета"))
+        self.button_details.setFlat(True)
+        self.button_details.clicked.connect(window.show)
+        self.progress_bar: QProgressBar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedWidth(120)
+        self.button_stop: QPushButton = QPushButton(qApp.translate("dialogs", "Остановить"))
+        self.button_stop.clicked.connect(thread.stop_generation)
+
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.button_details)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.button_stop)
+        self.setLayout(layout)
+
+    @pyqtSlot()
+    def change_progress(self) -> None:
+        self._number_of_steps_done += 1
+        if self._total_number:
+            self.progress_bar.setValue(int(self._number_of_steps_done / self._total_number * 100))
 
     @pyqtSlot(int)
     def set_total_number_of_steps(self, number: int) -> None:
@@ -214,20 +280,20 @@ class ReportGenerationWindow(QDialog):
         :param number: total number of steps to generate a report.
         """
 
+        self._number_of_steps_done = 0
         self._total_number = number
+        self.progress_bar.setValue(0)
+        self.show()
 
 
-def show_report_generation_window(parent, thread: ReportGenerationThread, board: Board, dir_for_report: str,
+def show_report_generation_window(window: ReportGenerationWindow, board: Board, dir_for_report: str,
                                   tolerance: float, work_mode: WorkMode) -> None:
     """
-    :param parent: main window;
-    :param thread: thread in which the report will be generated;
+    :param window: dialog window to create reports;
     :param board: board for which to generate a report;
     :param dir_for_report: directory where to save the report;
     :param tolerance: tolerance;
     :param work_mode: application work mode.
     """
 
-    window = ReportGenerationWindow(parent, thread)
-    thread.add_task(board, dir_for_report, tolerance, work_mode)
-    window.exec()
+    window.start_generation(board, dir_for_report, tolerance, work_mode)
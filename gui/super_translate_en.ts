@@ -562,6 +562,31 @@ leading to a numbering shift</translation>
         <source>Отмена</source>
         <translation>Cancel</translation>
     </message>
+    <message>
+        <location filename="../window/eplabwindow.py" line="1710"/>
+        <source>Не удалось сохранить план тестирования.</source>
+        <translation>Failed to save the measurement plan.</translation>
+    </message>
+    <message>
+        <location filename="../window/eplabwindow.py" line="1725"/>
+        <source>План тестирования сохранен в &apos;{}&apos;</source>
+        <translation>The measurement plan is saved to &apos;{}&apos;</translation>
+    </message>
+    <message>
+        <location filename="../window/eplabwindow.py" line="1736"/>
+        <source>Сохранение плана тестирования в &apos;{}&apos;...</source>
+        <translation>Saving the measurement plan to &apos;{}&apos;...</translation>
+    </message>
+    <message>
+        <location filename="../window/boardwidget.py" line="108"/>
+        <source>Загрузка изображения платы...</source>
+        <translation>Loading board image...</translation>
+    </message>
+    <message>
+        <location filename="../window/eplabwindow.py" line="1783"/>
+        <source>Сохранение плана тестирования... {}%</source>
+        <translation>Saving the measurement plan... {}%</translation>
+    </message>
 </context>
 <context>
     <name>mux</name>
@@ -791,6 +816,16 @@ leading to a numbering shift</translation>
         <source>Шаги генерации отчета</source>
         <translation>Steps to generate report</translation>
     </message>
+    <message>
+        <location filename="../dialogs/reportgenerationwindow.py" line="186"/>
+        <source>Остановить</source>
+        <translation>Stop</translation>
+    </message>
+    <message>
+        <location filename="../dialogs/reportgenerationwindow.py" line="256"/>
+        <source>Генерация отчета</source>
+        <translation>Generating report</translation>
+    </message>
 </context>
 <context>
     <name>settings</name>
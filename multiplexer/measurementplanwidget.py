@@ -2,15 +2,13 @@
 File with class for widget to show short information from measurement plan.
 """
 
-from typing import Generator, List, Optional
+from typing import Dict, Generator, List, Optional, Tuple
 from PyQt5.QtCore import QCoreApplication as qApp
 from PyQt5.QtGui import QCloseEvent
 from epcore.analogmultiplexer.base import MultiplexerOutput
 from epcore.elements import MeasurementSettings, Pin
-from epcore.product import EyePointProduct
 from window.common import WorkMode
 from window.language import get_language, Language
-from window.pinindextableitem import PinIndexTableItem
 from window.scaler import update_scale_of_class
 from window.tablewidget import disconnect_item_signals, TableWidget
 
@@ -31,31 +29,43 @@ class MeasurementPlanWidget(TableWidget):
                               qApp.translate("mux", "Чувствительность")]
         super().__init__(main_window, headers)
         self._lang: Language = get_language()
+        self._mux_outputs: Optional[Dict[int, Tuple[int, int]]] = None
+        self._pin_indexes: Dict[Tuple[int, int], int] = {}
         self._standby_mode: bool = False
 
-    def _add_pin(self, index: int, pin: Pin) -> None:
+    def _create_mux_outputs(self) -> Dict[int, Tuple[int, int]]:
         """
-        Method adds pin to table with information about measurement plan.
-        :param index: index of pin to be added;
-        :param pin: pin to be added.
+        Method creates the mapping between multiplexer outputs and pin indexes when it is needed for the first time
+        after filling the table.
+        :return: dictionary with multiplexer outputs of pins.
         """
 
-        self.insertRow(index)
-        self.setItem(index, 0, PinIndexTableItem(index))
-
-        for column in range(1, 7):
-            item = self._create_table_item()
-            self.setItem(index, column, item)
-        self._write_pin_info_into_table(index, pin)
+        if self._mux_outputs is None:
+            self._mux_outputs = {}
+            self._pin_indexes = {}
+            if self._main_window.measurement_plan:
+                for index, pin in self._main_window.measurement_plan.all_pins_iterator():
+                    self._set_mux_output(index, pin)
+        return self._mux_outputs
 
     @disconnect_item_signals
     def _fill_table(self) -> None:
         """
-        Method fills table for measurement plan.
+        Method fills table for measurement plan. Information about pins is obtained from the measurement plan when the
+        rows are drawn.
+        """
+
+        self._mux_outputs = None
+        self._pin_indexes = {}
+        self._reset_rows()
+
+    def _get_pin_indexes(self, mux_output: Tuple[int, int]) -> List[int]:
+        """
+        :param mux_output: module and channel numbers of multiplexer output.
+        :return: indexes of pins with the given multiplexer output.
         """
 
-        for pin_index, pin in self._main_window.measurement_plan.all_pins_iterator():
-            self._add_pin(pin_index, pin)
+        return [index for index, pin_mux_output in self._mux_outputs.items() if pin_mux_output == mux_output]
 
     def _get_values_for_parameters(self, settings: MeasurementSettings) -> Generator[str, None, None]:
         """
@@ -64,50 +74,72 @@ class MeasurementPlanWidget(TableWidget):
         :return: values of frequency, voltage and sensitivity.
         """
 
-        options = self._main_window.product.settings_to_options(settings)
-        available = self._main_window.product.get_available_options(settings)
-        parameters = (EyePointProduct.Parameter.frequency, EyePointProduct.Parameter.voltage,
-                      EyePointProduct.Parameter.sensitive)
-        for parameter in parameters:
-            for available_option in available[parameter]:
-                if available_option.name == options[parameter]:
-                    yield available_option.label_ru if self._lang is Language.RU else available_option.label_en
+        yield from self._main_window.options_cache.get_labels(settings, self._lang)
+
+    def _remove_mux_output(self, index: int) -> None:
+        """
+        Method removes the pin from the mapping between multiplexer outputs and pin indexes.
+        :param index: pin index.
+        """
+
+        mux_output = self._mux_outputs.pop(index, None)
+        if mux_output is not None and self._pin_indexes.get(mux_output) == index:
+            # Several pins may have the same multiplexer output, then the first of the remaining pins is found
+            indexes = self._get_pin_indexes(mux_output)
+            if indexes:
+                self._pin_indexes[mux_output] = min(indexes)
+            else:
+                self._pin_indexes.pop(mux_output)
 
-    def _write_pin_info_into_table(self, index: int, pin: Pin) -> None:
+    def _set_mux_output(self, index: int, pin: Pin) -> None:
         """
-        Method writes pin information into the table.
+        Method updates the mapping between multiplexer outputs and pin indexes for the given pin.
         :param index: pin index;
         :param pin: pin.
         """
 
+        mux_output = None
         if pin.multiplexer_output:
-            channel = pin.multiplexer_output.channel_number
-            module = pin.multiplexer_output.module_number
-        else:
-            channel = None
-            module = None
-        for column, value in enumerate((module, channel), start=1):
-            item = self.item(index, column)
-            if value:
-                item.setText(str(value))
+            mux_output = pin.multiplexer_output.module_number, pin.multiplexer_output.channel_number
+        if self._mux_outputs.get(index) == mux_output:
+            return
 
-        self._write_pin_measurements(index, pin)
+        self._remove_mux_output(index)
+        if mux_output is not None:
+            self._mux_outputs[index] = mux_output
+        if mux_output is not None and self._pin_indexes.get(mux_output, index) >= index:
+            self._pin_indexes[mux_output] = index
 
-    def _write_pin_measurements(self, index: int, pin: Pin) -> None:
+    def _shift_mux_outputs(self, start_index: int, shift: int) -> None:
         """
-        :param index: pin index;
-        :param pin: pin.
+        Method changes pin indexes in the mapping between multiplexer outputs and pin indexes.
+        :param start_index: index of the first pin whose index is changed;
+        :param shift: change of pin indexes.
         """
 
-        settings = pin.get_reference_and_test_measurements()[-1]
-        if settings:
-            for i, value in enumerate(self._get_values_for_parameters(settings)):
-                item = self.item(index, 3 + i)
-                item.setText(value)
-        else:
-            for i in range(3):
-                item = self.item(index, 3 + i)
-                item.setText("")
+        # Pins are moved starting from the end of the shift, so that the new index is always free. The order of pins
+        # does not change, so the first pin with each multiplexer output remains the first
+        indexes = sorted((index for index in self._mux_outputs if index >= start_index), reverse=shift > 0)
+        for index in indexes:
+            self._mux_outputs[index + shift] = self._mux_outputs.pop(index)
+        for mux_output, index in self._pin_indexes.items():
+            if index >= start_index:
+                self._pin_indexes[mux_output] = index + shift
+
+    def add_pin(self, index: int, pin: Pin) -> None:
+        """
+        :param index: index of the pin that has been added to the measurement plan;
+        :param pin: added pin.
+        """
+
+        if self.rowCount() + 1 != self._main_window.measurement_plan.pins_number:
+            self.update_info()
+            return
+
+        if self._mux_outputs is not None:
+            self._shift_mux_outputs(index, 1)
+            self._set_mux_output(index, pin)
+        self._insert_row(index)
 
     def closeEvent(self, event: QCloseEvent) -> None:
         """
@@ -126,32 +158,66 @@ class MeasurementPlanWidget(TableWidget):
 
         return self.rowCount()
 
+    def get_cell_text(self, row: int, column: int) -> str:
+        """
+        :param row: row number;
+        :param column: column number.
+        :return: text of the cell: pin index, module and channel of multiplexer, frequency, voltage or sensitivity.
+        """
+
+        pin = self._get_pin(row)
+        if column == 0 or pin is None:
+            return super().get_cell_text(row, column)
+
+        if column in (1, 2):
+            mux_output = pin.multiplexer_output
+            value = None
+            if mux_output:
+                value = mux_output.module_number if column == 1 else mux_output.channel_number
+            return str(value) if value else ""
+
+        settings = pin.get_reference_and_test_measurements()[-1]
+        if settings:
+            for i, value in enumerate(self._get_values_for_parameters(settings), start=3):
+                if i == column:
+                    return value
+        return ""
+
     def get_pin_index(self, mux_output: MultiplexerOutput) -> Optional[int]:
         """
         :param mux_output: multiplexer output.
         :return: pin index with a given multiplexer output.
         """
 
-        channel = str(mux_output.channel_number)
-        module = str(mux_output.module_number)
-        for index in range(self.rowCount()):
-            pin_module = self.item(index, 1).text()
-            pin_channel = self.item(index, 2).text()
-            if pin_channel == channel and pin_module == module:
-                return index
+        self._create_mux_outputs()
+        return self._pin_indexes.get((mux_output.module_number, mux_output.channel_number))
+
+    def remove_pin(self, index: int) -> None:
+        """
+        :param index: index of the pin that has been removed from the measurement plan.
+        """
+
+        if self.rowCount() - 1 != self._main_window.measurement_plan.pins_number:
+            self.update_info()
+            return
 
-        return None
+        if self._mux_outputs is not None:
+            self._remove_mux_output(index)
+            self._shift_mux_outputs(index + 1, -1)
+        self._remove_row(index)
 
     def save_measurement(self, index: int) -> None:
         """
-        :param index: index of the pin whose measurements need to be saved to the table.
+        :param index: index of the pin whose measurements and multiplexer output need to be saved to the table.
         """
 
-        pin = self._main_window.measurement_plan.get_pin_with_index(index)
+        pin = self._get_pin(index)
         if not pin:
             return
 
-        self._write_pin_measurements(index, pin)
+        if self._mux_outputs is not None:
+            self._set_mux_output(index, pin)
+        self._model.update_rows(index, index)
 
     def set_work_mode(self, work_mode: WorkMode) -> None:
         """
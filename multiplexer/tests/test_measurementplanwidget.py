@@ -6,12 +6,52 @@ import os
 import sys
 import unittest
 from PyQt5.QtWidgets import QApplication
+from epcore.analogmultiplexer.base import MultiplexerOutput
 from multiplexer.measurementplanwidget import MeasurementPlanWidget
 from .utils import create_dummy_main_window
 
 
 class TestMeasurementPlanWidget(unittest.TestCase):
 
+    def test_get_pin_index(self):
+        """
+        Test checks search of pin by multiplexer output.
+        """
+
+        app = QApplication(sys.argv)
+        dummy_main_window = create_dummy_main_window()
+        board_path = os.path.join(os.path.dirname(__file__), "test_data", "test_board.json")
+        dummy_main_window.update_measurement_plan(board_path)
+        measurement_plan_widget = MeasurementPlanWidget(dummy_main_window)
+        measurement_plan_widget.update_info()
+        mux_output = MultiplexerOutput(channel_number=45, module_number=2)
+        self.assertEqual(measurement_plan_widget.get_pin_index(mux_output), 1)
+        self.assertIsNone(measurement_plan_widget.get_pin_index(MultiplexerOutput(channel_number=1, module_number=1)))
+        app.exit(0)
+
+    def test_remove_pin(self):
+        """
+        Test checks that the search of pin by multiplexer output takes into account removed pins.
+        """
+
+        app = QApplication(sys.argv)
+        dummy_main_window = create_dummy_main_window()
+        board_path = os.path.join(os.path.dirname(__file__), "test_data", "test_board.json")
+        dummy_main_window.update_measurement_plan(board_path)
+        measurement_plan_widget = MeasurementPlanWidget(dummy_main_window)
+        measurement_plan_widget.update_info()
+        mux_output = MultiplexerOutput(channel_number=45, module_number=2)
+        self.assertEqual(measurement_plan_widget.get_pin_index(mux_output), 1)
+        dummy_main_window.measurement_plan.go_pin(0)
+        dummy_main_window.measurement_plan.remove_current_pin()
+        measurement_plan_widget.remove_pin(0)
+        self.assertEqual(measurement_plan_widget.rowCount(), 1)
+        self.assertEqual(measurement_plan_widget.get_pin_index(mux_output), 0)
+        dummy_main_window.measurement_plan.remove_current_pin()
+        measurement_plan_widget.remove_pin(0)
+        self.assertIsNone(measurement_plan_widget.get_pin_index(mux_output))
+        app.exit(0)
+
     def test_table_content(self):
         """
         Test checks content of table for measurement plan.
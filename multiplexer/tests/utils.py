@@ -10,6 +10,7 @@ from epcore.ivmeasurer import IVMeasurerVirtual
 from epcore.measurementmanager import MeasurementPlan
 from epcore.product import EyePointProduct
 from window.common import DeviceErrorsHandler, WorkMode
+from window.optionscache import OptionsCache
 
 
 def create_dummy_main_window():
@@ -28,6 +29,7 @@ def create_dummy_main_window():
             board = Board(elements=[Element(pins=[Pin(x=0, y=0, measurements=[])])])
             self.measurement_plan: MeasurementPlan = MeasurementPlan(board, self.measurer, self.multiplexer)
             self.product: EyePointProduct = EyePointProduct()
+            self.options_cache: OptionsCache = OptionsCache(self.product)
             self.work_mode: WorkMode = WorkMode.COMPARE
 
         def go_to_selected_pin(self, _: int):
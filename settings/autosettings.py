@@ -46,6 +46,7 @@ class AutoSettings(SettingsHandler):
     sensitive: str = None
     voltage: str = None
     auto_transition: bool = False
+    binary_signatures: bool = False
     language: Language = get_default_language()
     max_optimal_voltage: float = 12
     measurer_1_port: str = None
@@ -72,6 +73,7 @@ class AutoSettings(SettingsHandler):
         settings.endGroup()
 
         params = {"auto_transition": {"convert": ut.to_bool},
+                  "binary_signatures": {"convert": ut.to_bool},
                   "language": {"convert": get_language_from_str},
                   "pin_shift_warning_info": {"convert": ut.to_bool}}
         settings.beginGroup("Main")
@@ -104,6 +106,7 @@ class AutoSettings(SettingsHandler):
         settings.endGroup()
 
         params = {"auto_transition": {"convert": str},
+                  "binary_signatures": {"convert": str},
                   "language": {"convert": convert_language_to_str},
                   "pin_shift_warning_info": {"convert": str}}
         settings.beginGroup("Main")
@@ -0,0 +1,107 @@
+"""
+File with class for thread to decode images of boards.
+"""
+
+import logging
+import sys
+from typing import Optional, Tuple
+from PIL import Image
+from PyQt5.QtCore import pyqtSignal, QThread
+from PyQt5.QtGui import QImage
+from .boardtiles import TilePyramid
+from .sharedimage import load_shared_image
+
+
+logger = logging.getLogger("eplab")
+
+
+def pil_to_qimage(image: Image.Image) -> Tuple[QImage, bytes]:
+    """
+    Function creates QImage over the pixel data of the PIL image. The QImage format is chosen to match the byte order
+    of the PIL mode, so channels are not swapped and the data is copied only once. The QImage does not own the data,
+    so the returned bytes must be kept alive while the QImage is used.
+    :param image: PIL image.
+    :return: QImage and its pixel data.
+    """
+
+    formats = {"L": (QImage.Format_Grayscale8, 1),
+               "RGB": (QImage.Format_RGB888, 3),
+               "RGBA": (QImage.Format_RGBA8888, 4),
+               "RGBX": (QImage.Format_RGBX8888, 4)}
+    if image.mode not in formats:
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    image_format, bytes_per_pixel = formats[image.mode]
+    width, height = image.size
+    data = image.tobytes()
+    return QImage(data, width, height, width * bytes_per_pixel, image_format), data
+
+
+class BoardImageThread(QThread):
+    """
+    Class for thread that decodes the image of the board and prepares the pyramid of its tiles. The pyramid is sent
+    as soon as its smallest level is written, and then the thread reports every next written level, so the image is
+    shown before the pyramid is complete. If the pyramid cannot be created, the image is converted to QImage. QPixmap
+    can only be created in the GUI thread, so the thread sends QImage, and the GUI thread converts it to QPixmap.
+    """
+
+    image_ready: pyqtSignal = pyqtSignal(int, QImage)
+    pyramid_ready: pyqtSignal = pyqtSignal(int, object)
+    pyramid_updated: pyqtSignal = pyqtSignal(int, bool)
+
+    def __init__(self, image: Image.Image, task_id: int, plan_path: Optional[str] = None, parent=None,
+                 image_in_plan_file: bool = False) -> None:
+        """
+        :param image: image of the board;
+        :param task_id: ID of the task to decode the image;
+        :param plan_path: path to the measurement plan file. The pyramid of tiles is cached next to it;
+        :param parent: parent object;
+        :param image_in_plan_file: if True, then the image is the same as the image in the measurement plan file.
+        """
+
+        super().__init__(parent=parent)
+        self._data: Optional[bytes] = None
+        self._image: Image.Image = image
+        self._image_in_plan_file: bool = image_in_plan_file
+        self._plan_path: Optional[str] = plan_path
+        self._sent_pyramid: Optional[TilePyramid] = None
+        self._task_id: int = task_id
+
+    def _send_pyramid(self, pyramid: TilePyramid) -> None:
+        """
+        Method sends the pyramid when its first level has been written and reports next levels.
+        :param pyramid: pyramid of tiles of the image.
+        """
+
+        if pyramid is not self._sent_pyramid:
+            self._sent_pyramid = pyramid
+            self.pyramid_ready.emit(self._task_id, pyramid)
+        else:
+            self.pyramid_updated.emit(self._task_id, False)
+
+    def release_data(self) -> None:
+        """
+        Method releases the pixel data. The method must be called after the QImage is converted to QPixmap.
+        """
+
+        self._data = None
+        self._image = None
+
+    def run(self) -> None:
+        try:
+            pyramid = TilePyramid.create(self._image, self._plan_path, self._image_in_plan_file, self._send_pyramid)
+        except Exception:
+            logger.error("Failed to create tiles of the board image", exc_info=sys.exc_info())
+            pyramid = None
+        if pyramid is not None:
+            if pyramid is not self._sent_pyramid:
+                self.pyramid_ready.emit(self._task_id, pyramid)
+            self.pyramid_updated.emit(self._task_id, True)
+            return
+
+        try:
+            q_image, self._data = pil_to_qimage(load_shared_image(self._image))
+        except Exception:
+            logger.error("Failed to decode image of the board", exc_info=sys.exc_info())
+            q_image = QImage()
+        self.image_ready.emit(self._task_id, q_image)
@@ -0,0 +1,387 @@
+"""
+File with classes to show large images of boards as a pyramid of tiles.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from PIL import Image
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainter, QPixmap
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+from .sharedimage import load_shared_image
+
+
+logger = logging.getLogger("eplab")
+
+
+class TilePyramid:
+    """
+    Class for pyramid of tiles of the board image. Level 0 contains the image in full resolution, each next level is
+    two times smaller. Each level is split into square tiles that are stored in PNG files. The pyramid is stored in the
+    directory named by the hash of the image key. The key is the hash of the image file stored in the measurement plan
+    archive, so pixels are not hashed when the plan is opened again. Levels are written from the smallest one, so the
+    image can be shown before the pyramid is complete. Only a few recently used pyramids are kept in each cache
+    directory.
+    """
+
+    DIR_EXTENSION: str = ".tiles"
+    INFO_FILE_NAME: str = "pyramid.json"
+    MAX_CACHED_PYRAMIDS: int = 4
+    TILE_SIZE: int = 512
+    VERSION: int = 2
+
+    def __init__(self, dir_path: str, width: int, height: int, levels_number: int,
+                 available_level: Optional[int] = None) -> None:
+        """
+        :param dir_path: directory with tiles of the pyramid;
+        :param width: width of the image;
+        :param height: height of the image;
+        :param levels_number: number of levels in the pyramid;
+        :param available_level: the most detailed level whose tiles have been written. If None, then all levels have
+        been written.
+        """
+
+        self._available_level: int = 0 if available_level is None else available_level
+        self._dir_path: str = dir_path
+        self._height: int = height
+        self._levels_number: int = levels_number
+        self._width: int = width
+
+    @property
+    def available_level(self) -> int:
+        """
+        :return: the most detailed level whose tiles have been written.
+        """
+
+        return self._available_level
+
+    @property
+    def height(self) -> int:
+        """
+        :return: height of the image in full resolution.
+        """
+
+        return self._height
+
+    @property
+    def levels_number(self) -> int:
+        """
+        :return: number of levels in the pyramid.
+        """
+
+        return self._levels_number
+
+    @property
+    def width(self) -> int:
+        """
+        :return: width of the image in full resolution.
+        """
+
+        return self._width
+
+    @staticmethod
+    def _get_cache_dirs(plan_path: Optional[str]) -> Tuple[str, ...]:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: directories in which pyramids can be stored. The directory next to the plan is preferred, the
+        temporary directory is used if the plan has not been saved or its directory is not writable.
+        """
+
+        temp_dir = os.path.join(tempfile.gettempdir(), "eplab" + TilePyramid.DIR_EXTENSION)
+        if plan_path:
+            return os.path.abspath(plan_path) + TilePyramid.DIR_EXTENSION, temp_dir
+        return temp_dir,
+
+    @staticmethod
+    def _get_image_hash(image: Image.Image, plan_path: Optional[str], image_in_plan_file: bool) -> str:
+        """
+        :param image: image;
+        :param plan_path: path to the measurement plan file;
+        :param image_in_plan_file: if True, then the image is the same as the image in the measurement plan file.
+        :return: hash of the image mode, size and key. The key is the checksum and the size of the image file stored
+        in the measurement plan archive. If there is no such file, the pixels of the image are hashed.
+        """
+
+        hash_object = hashlib.sha1(repr((image.mode, image.size)).encode())
+        stored_image_key = get_stored_image_key(plan_path) if image_in_plan_file and plan_path else None
+        if stored_image_key is not None:
+            hash_object.update(stored_image_key.encode())
+        else:
+            load_shared_image(image)
+            for top in range(0, image.height, TilePyramid.TILE_SIZE):
+                hash_object.update(image.crop((0, top, image.width, min(top + TilePyramid.TILE_SIZE, image.height))
+                                              ).tobytes())
+        return hash_object.hexdigest()
+
+    @staticmethod
+    def _get_levels_number(width: int, height: int) -> int:
+        """
+        :param width: width of the image;
+        :param height: height of the image.
+        :return: number of levels in the pyramid. The last level fits into one tile.
+        """
+
+        levels_number = 1
+        while max(width, height) > TilePyramid.TILE_SIZE:
+            width, height = math.ceil(width / 2), math.ceil(height / 2)
+            levels_number += 1
+        return levels_number
+
+    @classmethod
+    def _open(cls, dir_path: str, image: Image.Image) -> Optional["TilePyramid"]:
+        """
+        :param dir_path: directory with tiles of the pyramid;
+        :param image: image of the board.
+        :return: pyramid if the directory contains the complete pyramid for the image.
+        """
+
+        info_path = os.path.join(dir_path, cls.INFO_FILE_NAME)
+        try:
+            with open(info_path, "r", encoding="utf-8") as file:
+                info = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if info.get("version") != cls.VERSION or (info.get("width"), info.get("height")) != image.size:
+            return None
+
+        try:
+            # The modification time of the information file is the time of the last use of the pyramid
+            os.utime(info_path)
+        except OSError:
+            pass
+        return cls(dir_path, image.width, image.height, info["levels_number"])
+
+    @classmethod
+    def _prune(cls, cache_dir: str, used_dir_path: str) -> None:
+        """
+        Method removes pyramids that have not been used for the longest time, so that the cache directory contains no
+        more than MAX_CACHED_PYRAMIDS pyramids.
+        :param cache_dir: directory with pyramids;
+        :param used_dir_path: directory of the pyramid that is used now.
+        """
+
+        def get_last_use_time(dir_path: str) -> float:
+            info_path = os.path.join(dir_path, cls.INFO_FILE_NAME)
+            return os.path.getmtime(info_path if os.path.exists(info_path) else dir_path)
+
+        try:
+            dir_paths = [entry.path for entry in os.scandir(cache_dir)
+                         if entry.is_dir() and entry.path != used_dir_path]
+            dir_paths.sort(key=get_last_use_time, reverse=True)
+        except OSError:
+            return
+
+        for dir_path in dir_paths[cls.MAX_CACHED_PYRAMIDS - 1:]:
+            shutil.rmtree(dir_path, ignore_errors=True)
+
+    @classmethod
+    def _write(cls, dir_path: str, image: Image.Image, level_ready: Optional[Callable[["TilePyramid"], None]] = None
+               ) -> "TilePyramid":
+        """
+        :param dir_path: directory for tiles of the pyramid;
+        :param image: image of the board;
+        :param level_ready: function that is called every time the next level of the pyramid has been written.
+        :return: created pyramid.
+        """
+
+        shutil.rmtree(dir_path, ignore_errors=True)
+        load_shared_image(image)
+        levels_number = cls._get_levels_number(image.width, image.height)
+        pyramid = cls(dir_path, image.width, image.height, levels_number, levels_number)
+        for level in reversed(range(levels_number)):
+            # Each level is reduced from the image in full resolution, so previous levels are not kept in memory
+            level_image = image.reduce(2 ** level) if level > 0 else image
+            level_dir = os.path.join(dir_path, str(level))
+            os.makedirs(level_dir, exist_ok=True)
+            for top in range(0, level_image.height, cls.TILE_SIZE):
+                for left in range(0, level_image.width, cls.TILE_SIZE):
+                    tile = level_image.crop((left, top, min(left + cls.TILE_SIZE, level_image.width),
+                                             min(top + cls.TILE_SIZE, level_image.height)))
+                    tile_name = f"{left // cls.TILE_SIZE}_{top // cls.TILE_SIZE}.png"
+                    tile.save(os.path.join(level_dir, tile_name), compress_level=1)
+            pyramid._available_level = level
+            if level_ready is not None:
+                level_ready(pyramid)
+
+        # The information file is written last, so an incomplete pyramid is never opened from the cache
+        with open(os.path.join(dir_path, cls.INFO_FILE_NAME), "w", encoding="utf-8") as file:
+            json.dump({"version": cls.VERSION, "width": image.width, "height": image.height,
+                       "levels_number": levels_number}, file)
+        return pyramid
+
+    @classmethod
+    def create(cls, image: Image.Image, plan_path: Optional[str] = None, image_in_plan_file: bool = False,
+               level_ready: Optional[Callable[["TilePyramid"], None]] = None) -> Optional["TilePyramid"]:
+        """
+        Method opens the pyramid for the image from the cache or creates it.
+        :param image: image of the board;
+        :param plan_path: path to the measurement plan file;
+        :param image_in_plan_file: if True, then the image is the same as the image in the measurement plan file, and
+        the pyramid is found by the checksum of the stored image file instead of the pixels;
+        :param level_ready: function that is called every time the next level of the created pyramid has been
+        written, so the image can be shown before the pyramid is complete.
+        :return: pyramid or None if it could not be created.
+        """
+
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = load_shared_image(image).convert("RGBA" if has_alpha else "RGB")
+        image_hash = cls._get_image_hash(image, plan_path, image_in_plan_file)
+        for cache_dir in cls._get_cache_dirs(plan_path):
+            dir_path = os.path.join(cache_dir, image_hash)
+            pyramid = cls._open(dir_path, image)
+            if pyramid is None:
+                try:
+                    pyramid = cls._write(dir_path, image, level_ready)
+                except Exception:
+                    logger.warning("Failed to create tiles of the board image in directory '%s'", dir_path)
+                    shutil.rmtree(dir_path, ignore_errors=True)
+                    continue
+
+            cls._prune(cache_dir, dir_path)
+            return pyramid
+        return None
+
+    def get_level_size(self, level: int) -> Tuple[int, int]:
+        """
+        :param level: level of the pyramid.
+        :return: width and height of the image at the level.
+        """
+
+        width, height = self._width, self._height
+        for _ in range(level):
+            width, height = math.ceil(width / 2), math.ceil(height / 2)
+        return width, height
+
+    def get_tile_path(self, level: int, column: int, row: int) -> str:
+        """
+        :param level: level of the pyramid;
+        :param column: column of the tile;
+        :param row: row of the tile.
+        :return: path to the tile file.
+        """
+
+        return os.path.join(self._dir_path, str(level), f"{column}_{row}.png")
+
+
+def get_stored_image_key(plan_path: str) -> Optional[str]:
+    """
+    :param plan_path: path to the measurement plan file.
+    :return: checksum and size of the image file stored in the measurement plan archive. They are read from the
+    directory of the archive, so the image is not read. None is returned if the plan has no image file.
+    """
+
+    try:
+        with zipfile.ZipFile(plan_path) as archive:
+            image_infos = [info for info in archive.infolist() if not info.filename.lower().endswith(".json")]
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if len(image_infos) != 1:
+        return None
+    return f"{image_infos[0].CRC:08x}-{image_infos[0].file_size}"
+
+
+class TiledImageItem(QGraphicsItem):
+    """
+    Class for graphics item that draws the board image from the pyramid of tiles. Only the tiles that intersect the
+    exposed area are drawn, and the level of the pyramid is chosen by the current zoom, so the number of drawn pixels
+    does not depend on the image size. Loaded tiles are kept in a bounded cache.
+    """
+
+    MAX_CACHED_TILES: int = 128
+
+    def __init__(self, pyramid: TilePyramid, max_cached_tiles: int = MAX_CACHED_TILES) -> None:
+        """
+        :param pyramid: pyramid of tiles of the image;
+        :param max_cached_tiles: maximum number of loaded tiles.
+        """
+
+        super().__init__()
+        self._max_cached_tiles: int = max_cached_tiles
+        self._pyramid: TilePyramid = pyramid
+        self._tiles: OrderedDict = OrderedDict()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setZValue(-1)
+
+    def _get_level(self, level_of_detail: float) -> int:
+        """
+        :param level_of_detail: scale of the view.
+        :return: level of the pyramid with resolution not less than the resolution of the view, if the level is
+        available.
+        """
+
+        if level_of_detail <= 0:
+            return self._pyramid.levels_number - 1
+        level = int(math.floor(math.log2(1 / level_of_detail))) if level_of_detail < 1 else 0
+        # While the pyramid is being created, more detailed levels may be missing
+        return max(self._pyramid.available_level, min(level, self._pyramid.levels_number - 1))
+
+    def _get_tile(self, level: int, column: int, row: int) -> Optional[QPixmap]:
+        """
+        :param level: level of the pyramid;
+        :param column: column of the tile;
+        :param row: row of the tile.
+        :return: image of the tile.
+        """
+
+        key = level, column, row
+        pixmap = self._tiles.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(self._pyramid.get_tile_path(level, column, row))
+            if pixmap.isNull():
+                return None
+            self._tiles[key] = pixmap
+            if len(self._tiles) > self._max_cached_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+        return pixmap
+
+    def boundingRect(self) -> QRectF:
+        """
+        :return: rectangle of the image in scene coordinates.
+        """
+
+        return QRectF(0, 0, self._pyramid.width, self._pyramid.height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None) -> None:
+        """
+        :param painter: painter;
+        :param option: style options of the item;
+        :param widget: widget on which the item is drawn.
+        """
+
+        level = self._get_level(option.levelOfDetailFromTransform(painter.worldTransform()))
+        scale = 2 ** level
+        level_width, level_height = self._pyramid.get_level_size(level)
+        tile_size = TilePyramid.TILE_SIZE
+        exposed_rect = option.exposedRect.intersected(self.boundingRect())
+        first_column = max(0, int(exposed_rect.left() / scale) // tile_size)
+        last_column = min((level_width - 1) // tile_size, int(exposed_rect.right() / scale) // tile_size)
+        first_row = max(0, int(exposed_rect.top() / scale) // tile_size)
+        last_row = min((level_height - 1) // tile_size, int(exposed_rect.bottom() / scale) // tile_size)
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, level > 0)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                pixmap = self._get_tile(level, column, row)
+                if pixmap is not None:
+                    target = QRectF(column * tile_size * scale, row * tile_size * scale, pixmap.width() * scale,
+                                    pixmap.height() * scale)
+                    painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+    def release_tiles(self) -> None:
+        """
+        Method removes loaded tiles from the cache.
+        """
+
+        self._tiles.clear()
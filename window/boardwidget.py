@@ -2,37 +2,27 @@
 File with class to show image of board.
 """
 
+import logging
 import os
-from typing import Optional, Tuple, Union
-from PIL import Image
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QEvent, QObject, QPoint, QPointF, QRect, QRectF, Qt, QTimer
-from PyQt5.QtGui import QIcon, QImage, QKeyEvent, QPixmap, QResizeEvent, QWheelEvent
-from PyQt5.QtWidgets import QVBoxLayout, QWidget
+from typing import Dict, List, Optional, Tuple, Union
+from PyQt5.QtCore import (pyqtSignal, pyqtSlot, QCoreApplication as qApp, QEvent, QObject, QPoint, QPointF, QRect,
+                          QRectF, Qt, QTimer)
+from PyQt5.QtGui import QIcon, QImage, QKeyEvent, QMouseEvent, QPixmap, QResizeEvent, QWheelEvent
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsPixmapItem, QGraphicsScene, QLabel, QVBoxLayout, QWidget
 from boardview.BoardViewWidget import BoardView, GraphicsManualPinItem
 from epcore.measurementmanager import MeasurementPlan
 from dialogs.save_geometry import update_widget_to_save_geometry
 from . import utils as ut
+from .boardimagethread import BoardImageThread
+from .boardtiles import TiledImageItem, TilePyramid
 from .common import WorkMode
 from .pedalhandler import add_pedal_handler
+from .pinclusters import PinClusterItem
+from .pinspatialindex import PinSpatialIndex
+from .scorewrapper import check_difference_not_greater_tolerance
 
 
-def pil_to_pixmap(image: Image) -> QPixmap:
-    """
-    See https://stackoverflow.com/questions/34697559/pil-image-to-qpixmap-conversion-issue
-    """
-
-    if image.mode == "RGB":
-        red, green, blue = image.split()
-        image = Image.merge("RGB", (blue, green, red))
-    elif image.mode == "RGBA":
-        red, green, blue, alpha = image.split()
-        image = Image.merge("RGBA", (blue, green, red, alpha))
-    elif image.mode == "L":
-        image = image.convert("RGBA")
-    image_2 = image.convert("RGBA")
-    data = image_2.tobytes("raw", "RGBA")
-    q_image = QImage(data, image.size[0], image.size[1], QImage.Format_ARGB32)
-    return QPixmap.fromImage(q_image)
+logger = logging.getLogger("eplab")
 
 
 @add_pedal_handler
@@ -42,7 +32,14 @@ class BoardWidget(QWidget):
     Class to show board image.
     """
 
+    DIRECTIONS: Dict[int, Tuple[int, int]] = {Qt.Key_Down: (0, 1),
+                                              Qt.Key_Left: (-1, 0),
+                                              Qt.Key_Right: (1, 0),
+                                              Qt.Key_Up: (0, -1)}
     HEIGHT: int = 600
+    LEVEL_OF_DETAIL_SCALE: float = 0.5
+    MIN_PINS_NUMBER_FOR_CLUSTERS: int = 100
+    NEAREST_PIN_DISTANCE: int = 30
     WIDTH: int = 600
     current_pin_signal: pyqtSignal = pyqtSignal(int, bool)
 
@@ -52,10 +49,18 @@ class BoardWidget(QWidget):
         """
 
         super().__init__()
+        self._background_item: Optional[QGraphicsItem] = None
         self._board: Optional[MeasurementPlan] = None
-        self._board_image: Optional[QPixmap] = None
+        self._board_rect: Optional[QRectF] = None
+        self._cluster_item: Optional[PinClusterItem] = None
+        self._clusters_shown: bool = False
         self._control_pressed: bool = False
+        self._image_task_id: int = 0
+        self._image_threads: Dict[int, BoardImageThread] = {}
         self._main_window = main_window
+        self._pin_index: PinSpatialIndex = PinSpatialIndex()
+        self._pin_items: List[GraphicsManualPinItem] = []
+        self._press_pos: Optional[QPoint] = None
         self._previous_pos: Optional[QRect] = None
         self._timer: QTimer = QTimer()
         self._timer.timeout.connect(self._set_scene_rect)
@@ -71,6 +76,31 @@ class BoardWidget(QWidget):
 
         return self._main_window.measurement_plan
 
+    def _go_to_pin_in_direction(self, dx: int, dy: int) -> None:
+        """
+        Method makes current the nearest pin in the given direction from the current pin.
+        :param dx: X component of the direction;
+        :param dy: Y component of the direction.
+        """
+
+        index = self.measurement_plan.get_current_index() if self.measurement_plan else None
+        if index is None or not 0 <= index < len(self._pin_index):
+            return
+
+        next_index = self._pin_index.find_nearest_in_direction(index, dx, dy)
+        if next_index is not None:
+            self.current_pin_signal.emit(next_index, True)
+
+    def _get_pin_states(self) -> Dict[int, bool]:
+        """
+        :return: dictionary with pin indexes and True for pins whose difference is not greater than the tolerance.
+        Only differences that have already been calculated are used.
+        """
+
+        tolerance = self._main_window.tolerance
+        return {index: check_difference_not_greater_tolerance(difference, tolerance)
+                for index, difference in self._main_window.get_cached_differences().items()}
+
     def _handle_key_press_event(self, obj: QObject, event: QEvent) -> bool:
         """
         Method handles key press events for board view.
@@ -79,15 +109,44 @@ class BoardWidget(QWidget):
         :return: handling result.
         """
 
-        key = QKeyEvent(event).key()
+        key_event = QKeyEvent(event)
+        key = key_event.key()
         if key == Qt.Key_Control:
             self._control_pressed = True
 
-        if self._control_pressed and key in (Qt.Key_Down, Qt.Key_Left, Qt.Key_Right, Qt.Key_Up):
+        if self._control_pressed and key in BoardWidget.DIRECTIONS:
             return super().eventFilter(obj, event)
 
+        if key_event.modifiers() & Qt.ShiftModifier and key in BoardWidget.DIRECTIONS:
+            self._go_to_pin_in_direction(*BoardWidget.DIRECTIONS[key])
+            return True
+
         return self._main_window.eventFilter(self._main_window, event)
 
+    def _handle_mouse_click(self, event: QMouseEvent) -> None:
+        """
+        Method selects the pin nearest to the point of the click if the user clicked near the pin, but not on it.
+        :param event: mouse event on the viewport of the board view.
+        """
+
+        if event.type() == QEvent.MouseButtonPress:
+            self._press_pos = event.pos()
+            return
+
+        if event.type() != QEvent.MouseButtonRelease or self._press_pos is None:
+            return
+
+        moved = (event.pos() - self._press_pos).manhattanLength() > 3
+        self._press_pos = None
+        if moved or isinstance(self._scene.itemAt(event.pos()), GraphicsManualPinItem):
+            return
+
+        point = self._scene.mapToScene(event.pos())
+        scale = self._scene.transform().m11() or 1
+        index = self._pin_index.find_nearest(point.x(), point.y(), BoardWidget.NEAREST_PIN_DISTANCE / scale)
+        if index is not None:
+            self.send_current_pin_index(index)
+
     def _handle_key_release_event(self, obj: QObject, event: QEvent) -> bool:
         """
         Method handles key release event for board view.
@@ -116,11 +175,110 @@ class BoardWidget(QWidget):
         self._scene.point_moved.connect(self.change_pin_coordinates)
         self._scene.point_selected.connect(self.send_current_pin_index)
         self._scene.installEventFilter(self)
+        self._scene.viewport().installEventFilter(self)
+
+        self._placeholder: QLabel = QLabel(qApp.translate("t", "Загрузка изображения платы..."))
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: gray;")
+        self._placeholder.hide()
 
         layout = QVBoxLayout(self)
         layout.addWidget(self._scene)
+        layout.addWidget(self._placeholder)
         self.setLayout(layout)
 
+    def _add_pins_to_scene(self) -> None:
+        """
+        Method adds the pins of the measurement plan to the scene and to the spatial index and selects the current
+        pin. While the pins are added, the scene does not update its index of items and the view is not repainted.
+        """
+
+        scene = self._scene.scene()
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self._scene.setUpdatesEnabled(False)
+        try:
+            points = []
+            for index, pin in self.measurement_plan.all_pins_iterator():
+                self._scene.add_point(QPointF(pin.x, pin.y), index)
+                points.append((pin.x, pin.y))
+            self._pin_index.reset(points)
+            self._pin_items = sorted((item for item in scene.items() if isinstance(item, GraphicsManualPinItem)),
+                                     key=lambda item: item.number)
+            if self._cluster_item is not None:
+                scene.removeItem(self._cluster_item)
+            self._cluster_item = PinClusterItem(self._pin_index, self._get_pin_states)
+            self._cluster_item.setVisible(False)
+            scene.addItem(self._cluster_item)
+            self._clusters_shown = False
+            self._update_level_of_detail()
+        finally:
+            scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            self._scene.setUpdatesEnabled(True)
+        self.select_pin_on_scene(self.measurement_plan.get_current_index(), False)
+
+    def _clear_scene(self) -> None:
+        """
+        Method removes the image of the board and the pins from the scene.
+        """
+
+        for item in (self._background_item, self._cluster_item):
+            if item is not None:
+                self._scene.scene().removeItem(item)
+        self._background_item = None
+        self._cluster_item = None
+        self._clusters_shown = False
+        self._pin_items = []
+        self._scene.clear_scene()
+
+    def _find_pin_item(self, index: int) -> Optional[GraphicsManualPinItem]:
+        """
+        :param index: pin index.
+        :return: visible item of the pin on the scene. The item is searched only near the pin with the index of the
+        scene, so the search does not depend on the number of pins.
+        """
+
+        if index is None or not 0 <= index < len(self._pin_index):
+            return None
+
+        x, y = self._pin_index.get_point(index)
+        for item in self._scene.scene().items(QRectF(x - 1, y - 1, 2, 2), Qt.IntersectsItemBoundingRect):
+            if isinstance(item, GraphicsManualPinItem) and item.number == index:
+                return item
+        return None
+
+    def _finish_image_thread(self, task_id: int) -> bool:
+        """
+        :param task_id: ID of the task to decode the image.
+        :return: True if the task decoded the image of the current measurement plan.
+        """
+
+        thread = self._image_threads.pop(task_id, None)
+        if thread is not None:
+            thread.release_data()
+            thread.wait()
+            thread.deleteLater()
+        is_current = task_id == self._image_task_id and self.measurement_plan is not None
+        if is_current:
+            self._show_placeholder(False)
+        return is_current
+
+    def _set_background(self, item: QGraphicsItem) -> None:
+        """
+        Method sets the item with the image of the board as the background of the scene. The pins are already on the
+        scene, the item is drawn under them.
+        :param item: item with the image of the board.
+        """
+
+        if self._background_item is not None:
+            self._scene.scene().removeItem(self._background_item)
+        item.setZValue(-1)
+        self._scene.scene().addItem(item)
+        self._background_item = item
+        self._board_rect = item.boundingRect()
+        self._scene.setSceneRect(self._board_rect)
+        self._scene.fitInView(self._board_rect, Qt.KeepAspectRatio)
+        self._update_level_of_detail()
+
     @pyqtSlot()
     def _set_scene_rect(self) -> None:
         """
@@ -144,12 +302,48 @@ class BoardWidget(QWidget):
             return left, right
 
         viewport_width, viewport_height = get_viewport_size_in_scene_coordinates()
-        image_rect = self._board_image.rect()
+        image_rect = self._board_rect
         x_left, x_right = get_left_and_right(viewport_width, image_rect.width())
         y_top, y_bottom = get_left_and_right(viewport_height, image_rect.height())
         self._scene.setSceneRect(QRectF(x_left, y_top, x_right - x_left, y_bottom - y_top))
+        self._update_level_of_detail()
         self._scene.update()
 
+    def _set_pin_items_visible(self, visible: bool) -> None:
+        """
+        :param visible: if True, then pins are drawn as separate items, otherwise they are hidden.
+        """
+
+        for item in self._pin_items:
+            item.setVisible(visible)
+
+    def _show_placeholder(self, show: bool) -> None:
+        """
+        :param show: if True, then the placeholder is shown instead of the board while the image is being decoded.
+        """
+
+        self._placeholder.setVisible(show)
+        self._scene.setVisible(not show)
+
+    def _update_level_of_detail(self) -> None:
+        """
+        Method chooses how pins are drawn for the current zoom. If the board is zoomed out and there are many pins,
+        then pins are drawn as clusters, otherwise each pin is drawn as a separate item.
+        """
+
+        if self._cluster_item is None:
+            return
+
+        show_clusters = (self._scene.transform().m11() < BoardWidget.LEVEL_OF_DETAIL_SCALE and
+                         len(self._pin_index) >= BoardWidget.MIN_PINS_NUMBER_FOR_CLUSTERS)
+        if show_clusters != self._clusters_shown:
+            self._clusters_shown = show_clusters
+            self._set_pin_items_visible(not show_clusters)
+            self._cluster_item.setVisible(show_clusters)
+            if not show_clusters:
+                # Hidden items cannot be selected, so the current pin is selected again
+                self.select_pin_on_scene(self.measurement_plan.get_current_index(), False)
+
     def add_pin_to_board_image(self, x: float, y: float, index: int) -> None:
         """
         Method adds new pin to board image.
@@ -158,7 +352,15 @@ class BoardWidget(QWidget):
         :param index: pin index.
         """
 
+        if self._cluster_item is not None:
+            self._cluster_item.insert_point(index, x, y)
         self._scene.add_point(QPointF(x, y), index)
+        self._pin_index.insert(index, x, y)
+        item = self._find_pin_item(index)
+        if item is not None:
+            self._pin_items.insert(index, item)
+            item.setVisible(not self._clusters_shown)
+        self._update_level_of_detail()
 
     def allow_drag(self, allow: bool) -> None:
         """
@@ -179,6 +381,10 @@ class BoardWidget(QWidget):
         current_pin = self.measurement_plan.get_current_pin()
         current_pin.x = pin.x()
         current_pin.y = pin.y()
+        if self._cluster_item is not None:
+            self._cluster_item.move_point(index, pin.x(), pin.y())
+        self._pin_index.move(index, pin.x(), pin.y())
+        self._main_window.mark_measurement_plan_changed()
 
     @pyqtSlot(QPointF)
     def create_new_pin(self, point: QPointF) -> None:
@@ -205,9 +411,13 @@ class BoardWidget(QWidget):
             if key_event.type() == QEvent.KeyRelease:
                 return self._handle_key_release_event(obj, event)
 
+        if obj == self._scene.viewport() and isinstance(event, QMouseEvent) and event.button() == Qt.LeftButton:
+            self._handle_mouse_click(event)
+
         if obj == self._scene and isinstance(event, QWheelEvent):
             result = super().eventFilter(obj, event)
-            if self._board_image:
+            self._update_level_of_detail()
+            if self._board_rect:
                 self._timer.start()
             return result
 
@@ -223,12 +433,70 @@ class BoardWidget(QWidget):
         point = self._scene.mapToScene(int(width / 2), int(height / 2))
         return point.x(), point.y()
 
+    def get_visible_pin_indexes(self) -> List[int]:
+        """
+        :return: indexes of pins in the visible area of the board.
+        """
+
+        rect = self._scene.mapToScene(self._scene.viewport().rect()).boundingRect()
+        return self._pin_index.get_pins_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom())
+
+    @pyqtSlot(int, QImage)
+    def handle_image_ready(self, task_id: int, image: QImage) -> None:
+        """
+        Slot shows the decoded image of the board. Images of measurement plans that have already been replaced are
+        ignored.
+        :param task_id: ID of the task to decode the image;
+        :param image: decoded image.
+        """
+
+        # The QImage does not own its pixel data, so it is converted before the thread releases the data
+        pixmap = None
+        if task_id == self._image_task_id and not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+        if self._finish_image_thread(task_id):
+            if pixmap is None:
+                logger.warning("Image of the board is not shown")
+            else:
+                self._set_background(QGraphicsPixmapItem(pixmap))
+
+    @pyqtSlot(int, object)
+    def handle_pyramid_ready(self, task_id: int, pyramid: TilePyramid) -> None:
+        """
+        Slot shows the image of the board from the pyramid of tiles. The pyramid may be incomplete, the thread keeps
+        writing more detailed levels.
+        :param task_id: ID of the task to decode the image;
+        :param pyramid: pyramid of tiles of the image.
+        """
+
+        if task_id == self._image_task_id and self.measurement_plan is not None:
+            self._show_placeholder(False)
+            self._set_background(TiledImageItem(pyramid))
+
+    @pyqtSlot(int, bool)
+    def handle_pyramid_updated(self, task_id: int, completed: bool) -> None:
+        """
+        Slot redraws the image of the board when a more detailed level of the pyramid has been written.
+        :param task_id: ID of the task to decode the image;
+        :param completed: if True, then the pyramid is complete and the thread has finished its work.
+        """
+
+        is_current = self._finish_image_thread(task_id) if completed else task_id == self._image_task_id
+        if is_current and self._board_rect is not None:
+            self._scene.scene().update()
+
     def remove_pin_from_board_image(self, index: int) -> None:
         """
         :param index: pin index to delete from board image.
         """
 
+        if self._cluster_item is not None:
+            self._cluster_item.remove_point(index)
+        if 0 <= index < len(self._pin_items):
+            self._pin_items.pop(index)
         self._scene.remove_point(index)
+        self._pin_index.remove(index)
+        self._update_level_of_detail()
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         """
@@ -236,7 +504,7 @@ class BoardWidget(QWidget):
         """
 
         super().resizeEvent(event)
-        if self._board_image:
+        if self._board_rect:
             self._timer.start()
 
     def select_pin_on_scene(self, index: int, pin_centering: bool = True) -> None:
@@ -245,11 +513,19 @@ class BoardWidget(QWidget):
         :param pin_centering: if True, then the selected pin will be centered on the board window.
         """
 
+        if self._cluster_item is not None:
+            self._cluster_item.set_current_index(index)
+
         if index is None:
             self._scene.remove_all_selections()
             return
 
-        self._scene.select_point(index)
+        item = self._find_pin_item(index)
+        if item is not None:
+            self._scene.scene().clearSelection()
+            item.setSelected(True)
+        elif not self._clusters_shown:
+            self._scene.select_point(index)
         if pin_centering:
             self.show_component_centered(index)
 
@@ -269,34 +545,41 @@ class BoardWidget(QWidget):
         """
 
         if isinstance(index_or_component, GraphicsManualPinItem):
-            component = index_or_component
-        else:
-            for component_ in getattr(self._scene, "_components", []):
-                if component_.number == index_or_component:
-                    component = component_
-                    break
-            else:
-                component = None
+            self._scene.centerOn(index_or_component)
+        elif 0 <= index_or_component < len(self._pin_index):
+            self._scene.centerOn(QPointF(*self._pin_index.get_point(index_or_component)))
 
-        if component is not None:
-            self._scene.centerOn(component)
+    def update_pin_colors(self) -> None:
+        """
+        Method must be called when differences of pins or tolerance change.
+        """
+
+        if self._cluster_item is not None:
+            self._cluster_item.invalidate_states()
 
     def update_board(self) -> None:
         """
         Method updates board image.
         """
 
-        self._scene.clear_scene()
-        if self.measurement_plan.image:
-            self._board_image = pil_to_pixmap(self.measurement_plan.image)
-            self._scene.set_background(self._board_image)
-            self._scene.scale_to_window_size(self.width(), self.height())
-            image_rect = self._board_image.rect()
-            self._scene.setSceneRect(image_rect.x(), image_rect.y(), image_rect.width(), image_rect.height())
+        self._clear_scene()
+        self._board_rect = None
+        self._image_task_id += 1
+        image = self.measurement_plan.image
+        if image:
+            # The image is decoded in a separate thread and is put under the pins when it is ready
+            width, height = image.size
+            self._scene.setSceneRect(0, 0, width, height)
+            self._show_placeholder(True)
+            thread = BoardImageThread(image, self._image_task_id, self._main_window.measurement_plan_path, self,
+                                      not self._main_window.is_measurement_plan_modified)
+            thread.image_ready.connect(self.handle_image_ready)
+            thread.pyramid_ready.connect(self.handle_pyramid_ready)
+            thread.pyramid_updated.connect(self.handle_pyramid_updated)
+            self._image_threads[self._image_task_id] = thread
+            thread.start()
         else:
-            del self._board_image
-            self._board_image = None
+            self._show_placeholder(False)
             self.close()
 
-        for index, pin in self.measurement_plan.all_pins_iterator():
-            self._scene.add_point(QPointF(pin.x, pin.y), index)
+        self._add_pins_to_scene()
@@ -0,0 +1,231 @@
+"""
+File with classes to detect that the probes are raised, that is, the measured signature is a break signature.
+"""
+
+import logging
+import operator
+from collections import namedtuple
+from typing import Callable, Optional, Tuple
+from epcore.elements import IVCurve, MeasurementSettings
+from .scorewrapper import check_difference_not_greater_tolerance
+
+
+logger = logging.getLogger("eplab")
+BreakDetectorConfig = namedtuple("BreakDetectorConfig", ["accept_distance", "reject_distance", "feature_weight",
+                                                         "comparator_weight", "required_confidence"])
+CurveFeatures = namedtuple("CurveFeatures", ["area", "max_current", "max_voltage", "slope"])
+
+
+def calculate_features(curve: IVCurve) -> CurveFeatures:
+    """
+    :param curve: signature.
+    :return: area of the signature loop, maximum absolute current and voltage and slope of the line that fits the
+    signature best.
+    """
+
+    currents, voltages = curve.currents, curve.voltages
+    if not currents or not voltages:
+        return CurveFeatures(0.0, 0.0, 0.0, 0.0)
+
+    squared_voltages = sum(map(operator.mul, voltages, voltages))
+    slope = sum(map(operator.mul, voltages, currents)) / squared_voltages if squared_voltages else 0.0
+    next_currents = currents[1:] + currents[:1]
+    next_voltages = voltages[1:] + voltages[:1]
+    area = abs(sum(map(operator.mul, voltages, next_currents)) - sum(map(operator.mul, next_voltages, currents))) / 2
+    return CurveFeatures(area, max(map(abs, currents)), max(map(abs, voltages)), slope)
+
+
+class BreakDetector:
+    """
+    Class detects that the probes are raised. The probes are considered to be raised if the measured signature
+    matches the break signature a certain number of times in a row. Each measured signature is compared with the
+    break signature by the comparator.
+    """
+
+    BREAK_NUMBER: int = 10
+    BREAK_TOLERANCE: float = 0.15
+
+    def __init__(self, calculate_score: Callable[[IVCurve, IVCurve, MeasurementSettings], float],
+                 break_number: int = BREAK_NUMBER, tolerance: float = BREAK_TOLERANCE) -> None:
+        """
+        :param calculate_score: function to calculate the difference between two signatures;
+        :param break_number: number of break signatures in a row after which the probes are considered raised;
+        :param tolerance: maximum difference between the measured signature and the break signature.
+        """
+
+        self._break_number: int = break_number
+        self._calculate_score: Callable[[IVCurve, IVCurve, MeasurementSettings], float] = calculate_score
+        self._confidence: float = 0
+        self._tolerance: float = tolerance
+
+    @property
+    def confidence(self) -> float:
+        """
+        :return: accumulated confidence that the probes are raised.
+        """
+
+        return self._confidence
+
+    def _add_confidence(self, weight: float, message: str, *args) -> bool:
+        """
+        :param weight: weight of the measured signature. If weight is zero, then the signature is not a break signature
+        and the accumulated confidence is reset;
+        :param message: message for the log;
+        :param args: arguments of the message.
+        :return: True if the probes are considered raised.
+        """
+
+        if weight > 0:
+            self._confidence += weight
+            logger.info("Waiting for a break: " + message + ", confidence = %.1f", *args, self._confidence)
+        else:
+            logger.info("Waiting for a break: " + message + ". Signature does not correspond to the break, the "
+                        "confidence is reset to zero", *args)
+            self._confidence = 0
+
+        if self._confidence >= self._get_required_confidence():
+            logger.info("Probes raised")
+            self._confidence = 0
+            return True
+        return False
+
+    def _check_score(self, settings: MeasurementSettings, curve: Optional[IVCurve], break_signature: IVCurve
+                     ) -> Tuple[Optional[float], bool]:
+        """
+        :param settings: measurement settings;
+        :param curve: measured signature;
+        :param break_signature: break signature.
+        :return: difference between the signatures and True if the difference is within the tolerance.
+        """
+
+        if curve is None:
+            return None, False
+
+        score = self._calculate_score(curve, break_signature, settings)
+        return score, score is not None and check_difference_not_greater_tolerance(score, self._tolerance)
+
+    def _get_required_confidence(self) -> float:
+        """
+        :return: confidence after which the probes are considered raised.
+        """
+
+        return self._break_number
+
+    def add_signature(self, settings: MeasurementSettings, curve: Optional[IVCurve], break_signature: IVCurve
+                      ) -> bool:
+        """
+        :param settings: measurement settings;
+        :param curve: measured signature;
+        :param break_signature: break signature for the measurement settings.
+        :return: True if the probes are considered raised.
+        """
+
+        score, is_break = self._check_score(settings, curve, break_signature)
+        return self._add_confidence(1 if is_break else 0, "score = %s", score)
+
+    def reset(self) -> None:
+        """
+        Method resets the accumulated confidence.
+        """
+
+        self._confidence = 0
+
+
+class FeatureBreakDetector(BreakDetector):
+    """
+    Class detects that the probes are raised using simple features of signatures: current envelope, slope and loop
+    area. Differences of features are measured in units of noise amplitudes. If the features of the measured
+    signature are close to the features of the break signature, the signature adds a large weight to the confidence.
+    If the features are far, the confidence is reset. Only in the ambiguous case the signatures are compared by the
+    comparator.
+    """
+
+    DEFAULT_CONFIG: BreakDetectorConfig = BreakDetectorConfig(accept_distance=0.5, reject_distance=3.0,
+                                                              feature_weight=2.5, comparator_weight=1.0,
+                                                              required_confidence=10.0)
+    MIN_NOISE_AMPLITUDE: float = 1e-12
+
+    def __init__(self, calculate_score: Callable[[IVCurve, IVCurve, MeasurementSettings], float],
+                 get_noise_amplitudes: Callable[[MeasurementSettings], Tuple[float, float]],
+                 config: BreakDetectorConfig = DEFAULT_CONFIG, tolerance: float = BreakDetector.BREAK_TOLERANCE
+                 ) -> None:
+        """
+        :param calculate_score: function to calculate the difference between two signatures;
+        :param get_noise_amplitudes: function that returns noise amplitudes of voltage and current for given
+        measurement settings;
+        :param config: parameters of the confidence model;
+        :param tolerance: maximum difference between the measured signature and the break signature.
+        """
+
+        super().__init__(calculate_score, tolerance=tolerance)
+        self._break_features: Optional[Tuple[IVCurve, CurveFeatures]] = None
+        self._config: BreakDetectorConfig = config
+        self._get_noise_amplitudes: Callable[[MeasurementSettings], Tuple[float, float]] = get_noise_amplitudes
+
+    def _get_break_features(self, break_signature: IVCurve) -> CurveFeatures:
+        """
+        :param break_signature: break signature.
+        :return: features of the break signature. Features are kept only for the last break signature, since the
+        break signature changes only with the measurement settings.
+        """
+
+        if self._break_features is None or self._break_features[0] is not break_signature:
+            self._break_features = break_signature, calculate_features(break_signature)
+        return self._break_features[1]
+
+    def _get_distance(self, settings: MeasurementSettings, curve: IVCurve, break_signature: IVCurve) -> float:
+        """
+        :param settings: measurement settings;
+        :param curve: measured signature;
+        :param break_signature: break signature.
+        :return: the largest difference between features of the signatures in units of noise amplitudes.
+        """
+
+        break_features = self._get_break_features(break_signature)
+        features = calculate_features(curve)
+        voltage_noise, current_noise = self._get_noise_amplitudes(settings)
+        # Noise amplitudes are clamped so that zero noise in the settings does not lead to division by zero
+        current_noise = max(current_noise, FeatureBreakDetector.MIN_NOISE_AMPLITUDE)
+        voltage = max(break_features.max_voltage, voltage_noise, FeatureBreakDetector.MIN_NOISE_AMPLITUDE)
+        return max(abs(features.max_current - break_features.max_current) / current_noise,
+                   abs(features.slope - break_features.slope) * voltage / current_noise,
+                   abs(features.area - break_features.area) / (current_noise * voltage))
+
+    def _get_required_confidence(self) -> float:
+        """
+        :return: confidence after which the probes are considered raised.
+        """
+
+        return self._config.required_confidence
+
+    def add_signature(self, settings: MeasurementSettings, curve: Optional[IVCurve], break_signature: IVCurve
+                      ) -> bool:
+        """
+        :param settings: measurement settings;
+        :param curve: measured signature;
+        :param break_signature: break signature for the measurement settings.
+        :return: True if the probes are considered raised.
+        """
+
+        if curve is None:
+            return self._add_confidence(0, "no signature")
+
+        distance = self._get_distance(settings, curve, break_signature)
+        if distance <= self._config.accept_distance:
+            return self._add_confidence(self._config.feature_weight, "feature distance = %f", distance)
+
+        if distance >= self._config.reject_distance:
+            return self._add_confidence(0, "feature distance = %f", distance)
+
+        score, is_break = self._check_score(settings, curve, break_signature)
+        return self._add_confidence(self._config.comparator_weight if is_break else 0,
+                                    "feature distance = %f, score = %s", distance, score)
+
+    def reset(self) -> None:
+        """
+        Method resets the accumulated confidence and forgets features of the break signature, because break
+        signatures may be reloaded.
+        """
+
+        super().reset()
+        self._break_features = None
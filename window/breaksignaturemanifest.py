@@ -0,0 +1,148 @@
+"""
+File with class for manifest of break signature files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger("eplab")
+
+
+def get_file_hash(path: str) -> str:
+    """
+    :param path: path to the file.
+    :return: SHA-256 hash of the file content.
+    """
+
+    hash_object = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            hash_object.update(chunk)
+    return hash_object.hexdigest()
+
+
+class BreakSignatureManifest:
+    """
+    Class for manifest of break signature files. For each file the manifest stores its size, modification time,
+    content hash and values of product options for which the signature was measured. So a file that has not been
+    changed since the last check does not need to be read again. The manifest can be kept outside the directory with
+    break signature files, because that directory may be read-only.
+    """
+
+    FILE_NAME: str = "manifest.json"
+    VERSION: int = 1
+
+    def __init__(self, dir_path: str, manifest_dir_path: Optional[str] = None) -> None:
+        """
+        :param dir_path: directory with break signature files;
+        :param manifest_dir_path: directory with the manifest file. If None, then the manifest file is in the
+        directory with break signature files.
+        """
+
+        self._dir_path: str = dir_path
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._is_modified: bool = False
+        self._manifest_dir_path: str = manifest_dir_path or dir_path
+        self._read()
+
+    @property
+    def path(self) -> str:
+        """
+        :return: path to the manifest file.
+        """
+
+        return os.path.join(self._manifest_dir_path, BreakSignatureManifest.FILE_NAME)
+
+    def _read(self) -> None:
+        """
+        Method reads the manifest file. If the file does not exist or cannot be read, the manifest is empty.
+        """
+
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") == BreakSignatureManifest.VERSION:
+                self._files = data["files"]
+        except Exception:
+            logger.warning("Failed to read manifest of break signatures from file '%s'", self.path)
+            self._files = {}
+
+    def check_hash(self, filename: str) -> bool:
+        """
+        Method compares the content hash of the file with the hash in the manifest. If they are equal, the size and
+        modification time of the file in the manifest are updated.
+        :param filename: name of break signature file.
+        :return: True if the content of the file has not been changed.
+        """
+
+        entry = self._files.get(filename)
+        path = os.path.join(self._dir_path, filename)
+        if entry is None or entry["sha256"] != get_file_hash(path):
+            return False
+
+        stat = os.stat(path)
+        entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+        self._is_modified = True
+        return True
+
+    def check_options(self, filename: str, options: List[float]) -> bool:
+        """
+        :param filename: name of break signature file;
+        :param options: values of product options for the signature.
+        :return: True if the signature was measured with the given values of options or the values for the signature
+        are unknown.
+        """
+
+        entry = self._files.get(filename)
+        return entry is not None and entry["options"] in (None, options)
+
+    def check_stat(self, filename: str) -> bool:
+        """
+        :param filename: name of break signature file.
+        :return: True if the size and modification time of the file are the same as in the manifest.
+        """
+
+        entry = self._files.get(filename)
+        if entry is None:
+            return False
+
+        stat = os.stat(os.path.join(self._dir_path, filename))
+        return (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns)
+
+    def save(self) -> None:
+        """
+        Method writes the manifest to the file if it has been changed. If the file cannot be written, the checked
+        files are just not cached.
+        """
+
+        if not self._is_modified:
+            return
+
+        try:
+            os.makedirs(self._manifest_dir_path, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump({"version": BreakSignatureManifest.VERSION, "files": self._files}, file, indent=1)
+            self._is_modified = False
+        except OSError:
+            logger.warning("Failed to write manifest of break signatures to file '%s'", self.path)
+
+    def update_file(self, filename: str, options: Optional[List[float]]) -> None:
+        """
+        :param filename: name of break signature file that has been verified or saved;
+        :param options: values of product options for which the signature was measured or None if they are unknown.
+        """
+
+        path = os.path.join(self._dir_path, filename)
+        stat = os.stat(path)
+        self._files[filename] = {"size": stat.st_size,
+                                 "mtime_ns": stat.st_mtime_ns,
+                                 "sha256": get_file_hash(path),
+                                 "options": options}
+        self._is_modified = True
@@ -1,15 +1,19 @@
+import hashlib
 import json
 import logging
 import math
 import os
-from typing import Generator, Optional, Tuple, Union
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QCoreApplication as qApp, QObject, QTimer
+import tempfile
+from typing import Generator, List, Optional, Tuple, Union
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QCoreApplication as qApp, QObject, QStandardPaths, QTimer
 from PyQt5.QtWidgets import QMessageBox
 from epcore.elements import IVCurve, MeasurementSettings
 from epcore.product import EyePointProduct, MeasurementParameterOption
 from dialogs import ProgressWindow
 from settings.autosettings import AutoSettings
 from . import utils as ut
+from .breaksignaturemanifest import BreakSignatureManifest
+from .breaksignaturestore import BreakSignatureStore
 from .language import get_language, Language
 
 
@@ -106,6 +110,8 @@ class BreakSignaturesSaver(QObject):
 
     def _save_signature(self, curve: IVCurve) -> None:
         """
+        Method saves the signature to its JSON file. The binary file with break signatures is created again only once,
+        after all signatures have been saved.
         :param curve: signature to be saved to file.
         """
 
@@ -115,6 +121,11 @@ class BreakSignaturesSaver(QObject):
             os.makedirs(BreakSignaturesSaver.DIR_PATH, exist_ok=True)
         with open(path, "w") as file:
             json.dump(curve.to_json(), file)
+        manifest = BreakSignatureManifest(BreakSignaturesSaver.DIR_PATH,
+                                          get_generated_files_dir(BreakSignaturesSaver.DIR_PATH))
+        manifest.update_file(filename, get_options_values(self._current_frequency, self._current_sensitive,
+                                                          self._current_voltage))
+        manifest.save()
 
     @pyqtSlot()
     def _send_settings(self) -> None:
@@ -129,6 +140,7 @@ class BreakSignaturesSaver(QObject):
             except StopIteration as exc:
                 logger.error("An error occurred while sending settings (%s)", exc)
                 self._is_running = False
+                open_break_signature_store(BreakSignaturesSaver.DIR_PATH)
                 return
 
         self._timer.start()
@@ -150,8 +162,16 @@ class BreakSignaturesSaver(QObject):
         """
 
         self._update_product()
-        if self.auto_transition and not check_break_signatures(BreakSignaturesSaver.DIR_PATH, self._product,
-                                                               self._required_frequency, self._required_sensitive):
+        if not self.auto_transition:
+            return
+
+        manifest = BreakSignatureManifest(BreakSignaturesSaver.DIR_PATH,
+                                          get_generated_files_dir(BreakSignaturesSaver.DIR_PATH))
+        signatures_ready = check_break_signatures(BreakSignaturesSaver.DIR_PATH, self._product,
+                                                  self._required_frequency, self._required_sensitive, manifest)
+        # Results of the check are cached here, because the check itself does not write files
+        manifest.save()
+        if not signatures_ready:
             result = ut.show_message(qApp.translate("t", "Информация"),
                                      qApp.translate("t", "Чтобы включить автопереход в режиме тестирования по плану, "
                                                          "нужно измерить сигнатуры разрыва. Для этого:\n<ul>\n"
@@ -175,28 +195,33 @@ class BreakSignaturesSaver(QObject):
 
 
 def check_break_signatures(dir_path: str, product: EyePointProduct, required_frequency: Optional[str] = None,
-                           required_sensitive: Optional[str] = None) -> bool:
+                           required_sensitive: Optional[str] = None,
+                           manifest: Optional[BreakSignatureManifest] = None) -> bool:
     """
+    Function checks that all required break signatures are present. The function does not write files, the results
+    of the check are only stored in the manifest object.
     :param dir_path: directory containing files with break signatures;
     :param product: product;
     :param required_frequency: name of the frequency mode for break signatures. If None, then each frequency requires
     its own break signature;
     :param required_sensitive: name of the sensitivity mode for break signatures. If None, then each sensitivity
-    requires its own break signature.
+    requires its own break signature;
+    :param manifest: manifest of break signature files. If None, then the manifest is read from its file.
     :return: True if all required break signatures are present.
     """
 
     if not os.path.isdir(dir_path):
         return False
 
+    generated_files_dir = get_generated_files_dir(dir_path)
+    if manifest is None:
+        manifest = BreakSignatureManifest(dir_path, generated_files_dir)
     try:
         for frequency, sensitive, voltage in iterate_settings(product, required_frequency, required_sensitive):
             filename = create_filename(frequency, sensitive, voltage)
-            path = os.path.join(dir_path, filename)
-            if not os.path.exists(path):
+            options = get_options_values(frequency, sensitive, voltage)
+            if not verify_break_signature(dir_path, filename, options, manifest):
                 return False
-
-            load_signature(path)
     except Exception as exc:
         logger.error("An error occurred while checking break signatures (%s)", exc)
         return False
@@ -204,6 +229,28 @@ def check_break_signatures(dir_path: str, product: EyePointProduct, required_fre
     return True
 
 
+def convert_break_signatures(dir_path: str) -> BreakSignatureStore:
+    """
+    Function collects break signatures from JSON files in the directory into one binary file. The binary file is
+    saved to the directory for generated files.
+    :param dir_path: directory containing files with break signatures.
+    :return: store with break signatures.
+    """
+
+    signatures = {}
+    for filename in sorted(os.listdir(dir_path)):
+        if filename.endswith(".json"):
+            try:
+                signatures[filename] = load_signature(os.path.join(dir_path, filename))
+            except Exception as exc:
+                logger.error("Failed to read break signature from file '%s' (%s)", filename, exc)
+
+    store = BreakSignatureStore(get_generated_files_dir(dir_path))
+    store.save_signatures(signatures)
+    logger.info("Break signatures from %d files were saved to file '%s'", len(signatures), store.path)
+    return store
+
+
 def create_filename(frequency: Union[str, MeasurementParameterOption],
                     sensitive: Union[str, MeasurementParameterOption],
                     voltage: Union[str, MeasurementParameterOption]) -> str:
@@ -241,6 +288,49 @@ def create_settings(frequency: MeasurementParameterOption, sensitive: Measuremen
                                probe_signal_frequency=probe_frequency)
 
 
+def get_generated_files_dir(dir_path: str) -> str:
+    """
+    :param dir_path: directory containing files with break signatures.
+    :return: directory for files generated from break signatures. It is the same directory if it is writable,
+    otherwise a directory in the user cache location, so the application can be installed in a read-only directory.
+    """
+
+    if os.access(dir_path, os.W_OK):
+        return dir_path
+
+    cache_path = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation) or tempfile.gettempdir()
+    dir_hash = hashlib.sha1(os.path.abspath(dir_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_path, "eplab", "break_signatures", dir_hash)
+
+
+def get_last_modification_time(dir_path: str) -> int:
+    """
+    :param dir_path: directory containing files with break signatures.
+    :return: the latest modification time of JSON files with break signatures in nanoseconds.
+    """
+
+    mtime_ns = 0
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                mtime_ns = max(mtime_ns, entry.stat().st_mtime_ns)
+    return mtime_ns
+
+
+def get_options_values(frequency: MeasurementParameterOption, sensitive: MeasurementParameterOption,
+                       voltage: MeasurementParameterOption) -> List[float]:
+    """
+    :param frequency: frequency;
+    :param sensitive: sensitive;
+    :param voltage: voltage.
+    :return: values of product options that define the break signature.
+    """
+
+    settings = create_settings(frequency, sensitive, voltage)
+    return [settings.probe_signal_frequency, settings.sampling_rate, settings.internal_resistance,
+            settings.max_voltage]
+
+
 def iterate_settings(product: EyePointProduct, required_frequency: Optional[str] = None,
                      required_sensitive: Optional[str] = None
                      ) -> Generator[Tuple[MeasurementParameterOption, MeasurementParameterOption,
@@ -277,3 +367,42 @@ def load_signature(path: str) -> Optional[IVCurve]:
         with open(path, "r") as file:
             return IVCurve.create_from_json(json.load(file))
     return None
+
+
+def open_break_signature_store(dir_path: str) -> BreakSignatureStore:
+    """
+    :param dir_path: directory containing files with break signatures.
+    :return: store with break signatures. If there is no binary file with break signatures yet or any JSON file has
+    been changed after the binary file was created, the binary file is created again from JSON files.
+    """
+
+    store = BreakSignatureStore(get_generated_files_dir(dir_path))
+    if os.path.isdir(dir_path) and (not store.exists or get_last_modification_time(dir_path) > store.mtime_ns):
+        try:
+            store = convert_break_signatures(dir_path)
+        except OSError as exc:
+            logger.error("Failed to save binary file with break signatures (%s)", exc)
+    return store
+
+
+def verify_break_signature(dir_path: str, filename: str, options: List[float], manifest: BreakSignatureManifest
+                           ) -> bool:
+    """
+    Function checks the break signature. If the signature file has not been changed since the last check, only the
+    manifest is used. Otherwise, the file is read completely and the manifest is updated. Values of product options
+    are known only for signatures saved by the application, so for other files they are recorded as unknown.
+    :param dir_path: directory containing files with break signatures;
+    :param filename: name of break signature file;
+    :param options: values of product options for the signature;
+    :param manifest: manifest of break signature files.
+    :return: True if the break signature is valid.
+    """
+
+    path = os.path.join(dir_path, filename)
+    if not os.path.exists(path):
+        return False
+
+    if not manifest.check_stat(filename) and not manifest.check_hash(filename):
+        load_signature(path)
+        manifest.update_file(filename, None)
+    return manifest.check_options(filename, options)
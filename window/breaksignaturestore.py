@@ -0,0 +1,184 @@
+"""
+File with class to store all break signatures in one binary file.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from epcore.elements import IVCurve
+
+
+logger = logging.getLogger("eplab")
+
+
+class BreakSignatureStore:
+    """
+    Class for binary file with break signatures. The file contains the header, the block of float values of all
+    signatures and the index in JSON format at the end. The header contains the position of the index. The index
+    contains the position and lengths of arrays of currents and voltages for each name of signature file. The file is
+    generated from JSON files with break signatures and is never changed in place.
+    """
+
+    FILE_NAME: str = "break_signatures.bin"
+    HEADER: struct.Struct = struct.Struct("<8sH6xQQ")
+    MAGIC: bytes = b"EPLABBRK"
+    TYPE_CODE: str = "d"
+    VERSION: int = 1
+
+    def __init__(self, dir_path: str) -> None:
+        """
+        :param dir_path: directory with break signatures.
+        """
+
+        self._path: str = os.path.join(dir_path, BreakSignatureStore.FILE_NAME)
+
+    @property
+    def exists(self) -> bool:
+        """
+        :return: True if the file with break signatures exists.
+        """
+
+        return os.path.isfile(self._path)
+
+    @property
+    def mtime_ns(self) -> int:
+        """
+        :return: modification time of the file with break signatures.
+        """
+
+        return os.stat(self._path).st_mtime_ns
+
+    @property
+    def path(self) -> str:
+        """
+        :return: path to the file with break signatures.
+        """
+
+        return self._path
+
+    @staticmethod
+    def _get_bytes(curve: IVCurve) -> bytes:
+        """
+        :param curve: signature.
+        :return: bytes of currents and voltages of the signature.
+        """
+
+        values = array(BreakSignatureStore.TYPE_CODE, curve.currents)
+        values.extend(curve.voltages)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def _read_index(self, file) -> Tuple[Dict[str, List[int]], int]:
+        """
+        :param file: opened file with break signatures.
+        :return: index of signatures and position of the index in the file.
+        """
+
+        magic, version, index_offset, index_length = self.HEADER.unpack(file.read(self.HEADER.size))
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Unknown format of file with break signatures")
+
+        file.seek(index_offset)
+        index = json.loads(file.read(index_length).decode("utf-8"))
+        item_size = array(self.TYPE_CODE).itemsize
+        for offset, currents_number, voltages_number in index.values():
+            if self.HEADER.size + (offset + currents_number + voltages_number) * item_size > index_offset:
+                raise ValueError("Index of file with break signatures is broken")
+        return index, index_offset
+
+    def _read_signature(self, memory: mmap.mmap, offset: int, currents_number: int, voltages_number: int
+                        ) -> IVCurve:
+        """
+        :param memory: memory-mapped file with break signatures;
+        :param offset: position of the signature in the block of values;
+        :param currents_number: number of currents;
+        :param voltages_number: number of voltages.
+        :return: signature.
+        """
+
+        values = array(self.TYPE_CODE)
+        start = self.HEADER.size + offset * values.itemsize
+        values.frombytes(memory[start:start + (currents_number + voltages_number) * values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+        values = values.tolist()
+        return IVCurve(currents=values[:currents_number], voltages=values[currents_number:])
+
+    def get_names(self) -> List[str]:
+        """
+        :return: names of signature files whose signatures are in the store.
+        """
+
+        if not self.exists:
+            return []
+
+        try:
+            with open(self._path, "rb") as file:
+                return list(self._read_index(file)[0].keys())
+        except Exception:
+            logger.error("Failed to read index of break signatures from file '%s'", self._path)
+            return []
+
+    def load_signatures(self, names: Iterable[str]) -> Dict[str, Optional[IVCurve]]:
+        """
+        :param names: names of signature files.
+        :return: dictionary with signatures. If there is no signature for a name, then its value is None.
+        """
+
+        names = list(names)
+        signatures = dict.fromkeys(names)
+        if not self.exists:
+            return signatures
+
+        try:
+            with open(self._path, "rb") as file:
+                index, _ = self._read_index(file)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+                    for name in names:
+                        if name in index:
+                            signatures[name] = self._read_signature(memory, *index[name])
+        except Exception:
+            logger.error("Failed to read break signatures from file '%s'", self._path)
+        return signatures
+
+    def save_signatures(self, signatures: Dict[str, IVCurve]) -> None:
+        """
+        Method rewrites the file with the given signatures. The data is written to a temporary file, which is flushed
+        to the disk and then replaces the file, so readers see either the old or the new file.
+        :param signatures: dictionary with names of signature files and signatures.
+        """
+
+        data = []
+        index = {}
+        offset = 0
+        for name, curve in signatures.items():
+            if curve is None:
+                continue
+            index[name] = [offset, len(curve.currents), len(curve.voltages)]
+            offset += len(curve.currents) + len(curve.voltages)
+            data.append(self._get_bytes(curve))
+        data = b"".join(data)
+        index_bytes = json.dumps(index).encode("utf-8")
+
+        dir_name = os.path.dirname(self._path)
+        os.makedirs(dir_name, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(prefix=".eplab_", dir=dir_name)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.HEADER.size + len(data), len(index_bytes)))
+                file.write(data)
+                file.write(index_bytes)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self._path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -1,14 +1,14 @@
 import logging
 import os
-from typing import Optional
-from PyQt5.QtCore import pyqtSlot, QCoreApplication as qApp, QPoint, QSize, Qt
+from typing import Dict, Optional, Set, Tuple
+from PyQt5.QtCore import pyqtSlot, QCoreApplication as qApp, QItemSelection, QPoint, QSize, Qt, QTimer
 from PyQt5.QtGui import QBrush, QColor, QIcon, QKeySequence
-from PyQt5.QtWidgets import QAction, QMenu, QShortcut, QTableWidgetItem
+from PyQt5.QtWidgets import QAction, QMenu, QShortcut
 from epcore.elements import Pin
 from . import utils as ut
 from .common import WorkMode
-from .pinindextableitem import PinIndexTableItem
-from .tablewidget import change_item_state, disconnect_item_signals, TableWidget
+from .scorewrapper import check_difference_not_greater_tolerance
+from .tablewidget import disconnect_item_signals, TableWidget
 
 
 logger = logging.getLogger("eplab")
@@ -16,7 +16,9 @@ logger = logging.getLogger("eplab")
 
 class CommentWidget(TableWidget):
     """
-    Widget for working with comments to measurement plan pins.
+    Widget for working with comments to measurement plan pins. Colors of rows are not calculated while the rows are
+    drawn: a row without a calculated color is drawn with the default background and is added to a batch. The batch
+    is calculated for all visible rows after the drawing, and then the view is notified that the rows have changed.
     """
 
     BAD_BRUSH: QBrush = QBrush(QColor(255, 129, 129))
@@ -30,51 +32,54 @@ class CommentWidget(TableWidget):
         """
 
         super().__init__(main_window, ["№", qApp.translate("t", "Комментарий")])
+        self._brush_timer: QTimer = QTimer(self)
+        self._brush_timer.setSingleShot(True)
+        self._brush_timer.setInterval(0)
+        self._brush_timer.timeout.connect(self._calculate_row_brushes)
+        self._brushes: Dict[int, Tuple[Optional[str], QBrush]] = {}
         self._default_style_sheet: str = self.styleSheet()
         self._read_only: bool = False
+        self._rows_to_calculate: Set[int] = set()
         self.adjustSize()
         self._set_f2_hotkey()
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
 
-    def _add_row(self, index: int, comment: Optional[str] = None) -> None:
-        """
-        Method inserts a new comment to the table.
-        :param index: index of the pin for which the comment needs to be added;
-        :param comment: comment.
-        """
-
-        self.insertRow(index)
-        self.setItem(index, 0, PinIndexTableItem(index))
-
-        item = self._create_table_item(self._read_only)
-        item.setText(comment or "")
-        self.setItem(index, 1, item)
-
-    def _change_row_color(self, index: int, pin: Pin) -> None:
-        """
-        Method sets the color of the row depending on the difference value. If the pin to which the row corresponds has
-        test and reference IV-curves, then the difference is calculated. If difference is not greater than the
-        tolerance, then the row is colored light green, otherwise pink.
-        :param index: index of the pin;
-        :param pin: pin.
-        """
-
-        if pin is None:
+    @pyqtSlot()
+    def _calculate_row_brushes(self) -> None:
+        """
+        Slot calculates colors of the rows of the batch and of the visible rows depending on the difference value. If
+        the pin to which the row corresponds has test and reference IV-curves, then the difference is calculated. If
+        difference is not greater than the tolerance, then the row is colored light green, otherwise pink. Colors are
+        stored with the hashes of measurements, so the color of a row is not calculated again while the pin has the
+        same measurements.
+        """
+
+        rows = self._rows_to_calculate.union(row for row in self._get_visible_rows() if row not in self._brushes)
+        self._rows_to_calculate.clear()
+        pins = {row: self._get_pin(row) for row in rows if 0 <= row < self.rowCount()}
+        hashes = {row: self._main_window.get_pin_hash(row, pin) for row, pin in pins.items() if pin is not None}
+        pins = {row: pins[row] for row, pin_hash in hashes.items()
+                if row not in self._brushes or self._brushes[row][0] != pin_hash}
+        if not pins:
             return
 
-        reference, test, settings = pin.get_reference_and_test_measurements()
-        if None not in (reference, test, settings):
-            brush = CommentWidget.GOOD_BRUSH \
-                if self._main_window.check_good_difference(reference.ivc, test.ivc, settings) \
-                else CommentWidget.BAD_BRUSH
-        else:
-            brush = CommentWidget.WHITE_BRUSH
-
-        for column in range(self.columnCount()):
-            item = self.item(index, column)
-            item.setBackground(brush)
+        differences = self._get_differences(pins)
+        for row, pin in pins.items():
+            reference, test, settings = pin.get_reference_and_test_measurements()
+            if None not in (reference, test, settings):
+                difference = differences.get(row)
+                if difference is None:
+                    good_difference = self._main_window.check_good_difference(reference.ivc, test.ivc, settings)
+                else:
+                    good_difference = check_difference_not_greater_tolerance(difference, self._main_window.tolerance)
+                brush = CommentWidget.GOOD_BRUSH if good_difference else CommentWidget.BAD_BRUSH
+            else:
+                brush = CommentWidget.WHITE_BRUSH
+            self._brushes[row] = hashes[row], brush
+        self._model.update_rows(min(pins), max(pins))
+        self._change_style_for_selected_row()
 
     def _change_style_for_selected_row(self, index: Optional[int] = None) -> None:
         """
@@ -104,17 +109,36 @@ class CommentWidget(TableWidget):
         """
 
         return (self._main_window.new_point_action.isEnabled() and self._main_window.remove_point_action.isEnabled() and
-                self.row(self.itemAt(pos)) >= 0)
+                self.indexAt(pos).row() >= 0)
 
     @disconnect_item_signals
     def _fill_table(self) -> None:
         """
-        Method fills in a table with comments on the measurement plan pins.
+        Method fills in a table with comments on the measurement plan pins. Comments and colors of rows are obtained
+        from the measurement plan when the rows are drawn.
         """
 
-        for index, pin in self._main_window.measurement_plan.all_pins_iterator():
-            self._add_row(index, pin.comment)
-            self._change_row_color(index, pin)
+        self._brushes.clear()
+        self._rows_to_calculate.clear()
+        self._reset_rows()
+
+    def _get_differences(self, pins: Dict[int, Optional[Pin]]) -> Dict[int, float]:
+        """
+        :param pins: dictionary with pins and their indexes.
+        :return: dictionary with differences for pins that have reference and test signatures.
+        """
+
+        return self._main_window.calculate_differences_for_pins(pins)
+
+    def _schedule_row_brushes(self, *rows) -> None:
+        """
+        Method adds rows to the batch whose colors will be calculated after the current event is processed.
+        :param rows: numbers of rows.
+        """
+
+        self._rows_to_calculate.update(rows)
+        if not self._brush_timer.isActive():
+            self._brush_timer.start()
 
     def _set_f2_hotkey(self) -> None:
         """
@@ -131,31 +155,38 @@ class CommentWidget(TableWidget):
         Slot sets the item with the current comment into editable mode.
         """
 
-        item = self.item(self.currentRow(), 1)
-        if item and self._main_window.work_mode in (WorkMode.TEST, WorkMode.WRITE):
+        model_index = self.model().index(self.currentRow(), 1)
+        if model_index.isValid() and self._main_window.work_mode in (WorkMode.TEST, WorkMode.WRITE):
             self._main_window.activateWindow()
-            self.editItem(item)
+            self.edit(model_index)
 
-    def _set_read_only(self, read_only: bool) -> None:
+    def _shift_brushes(self, start_row: int, shift: int) -> None:
         """
-        :param read_only: if True, then set the table to an editable state, otherwise to a non-editable state.
+        Method shifts calculated colors of rows after a row has been inserted or removed.
+        :param start_row: number of the first row to be shifted;
+        :param shift: shift of row numbers.
         """
 
-        column = 1
-        for row in range(self.rowCount()):
-            item = self.item(row, column)
-            change_item_state(item, read_only)
+        self._brushes = {row + shift if row >= start_row else row: value for row, value in self._brushes.items()}
+        self._rows_to_calculate = {row + shift if row >= start_row else row for row in self._rows_to_calculate}
 
-    @disconnect_item_signals
     def add_comment(self, index: int, pin: Pin) -> None:
         """
         :param index: index of the pin whose comment to add;
         :param pin: pin whose comment to add.
         """
 
-        self._add_row(index, pin.comment)
-        self._change_row_color(index, pin)
-        self._update_indexes(index)
+        self._shift_brushes(index, 1)
+        self._insert_row(index)
+
+    def check_cell_editable(self, row: int, column: int) -> bool:
+        """
+        :param row: row number;
+        :param column: column number.
+        :return: True if the cell can be edited.
+        """
+
+        return column == 1 and not self._read_only
 
     def clear_table(self) -> None:
         """
@@ -163,70 +194,90 @@ class CommentWidget(TableWidget):
         """
 
         self._clear_table()
+        self._brushes.clear()
+        self._rows_to_calculate.clear()
         self._read_only = False
 
-    @pyqtSlot(QTableWidgetItem)
-    def handle_item_changed(self, item: QTableWidgetItem) -> None:
+    def get_cell_text(self, row: int, column: int) -> str:
         """
-        :param item: item whose data changed.
+        :param row: row number;
+        :param column: column number.
+        :return: text of the cell.
         """
 
-        pin_index = self.row(item)
-        self.save_comment(pin_index)
+        if column != 1:
+            return super().get_cell_text(row, column)
 
-    @disconnect_item_signals
-    def remove_comment(self, index: int) -> None:
+        pin = self._get_pin(row)
+        return (pin.comment or "") if pin else ""
+
+    def get_row_brush(self, row: int) -> Optional[QBrush]:
         """
-        :param index: index of the row to be deleted.
+        :param row: row number.
+        :return: background brush for the row. If the color of the row has not been calculated yet, the row is added
+        to the batch and None is returned.
         """
 
-        self._remove_row(index)
-        self._update_indexes(index)
+        cached = self._brushes.get(row)
+        if cached is None:
+            self._schedule_row_brushes(row)
+            return None
+        return cached[1]
 
-    def save_comment(self, index: int) -> None:
+    def remove_comment(self, index: int) -> None:
         """
-        Method saves comment to pin.
-        :param index: pin index.
+        :param index: index of the row to be deleted.
         """
 
-        pin = self._main_window.measurement_plan.get_pin_with_index(index)
-        if not pin:
-            return
-
-        item = self.item(index, 1)
-        if item:
-            pin.comment = item.text()
+        self._brushes.pop(index, None)
+        self._shift_brushes(index + 1, -1)
+        self._remove_row(index)
 
     def select_row(self) -> None:
         super().select_row()
         self._change_style_for_selected_row()
 
-    @pyqtSlot()
-    def send_current_row_index(self) -> None:
+    @pyqtSlot(QItemSelection, QItemSelection)
+    def send_current_row_index(self, selected: Optional[QItemSelection] = None, _: Optional[QItemSelection] = None
+                               ) -> None:
         """
         Slot sends a signal with the number of the table row that is activated.
+        :param selected: selected cells.
         """
 
-        super().send_current_row_index()
+        super().send_current_row_index(selected)
         for model_index in self.selectedIndexes():
             self._change_style_for_selected_row(model_index.row())
             break
 
+    def set_cell_text(self, row: int, column: int, text: str) -> bool:
+        """
+        Method saves comment to pin.
+        :param row: row number;
+        :param column: column number;
+        :param text: new comment.
+        :return: True if the comment has been saved.
+        """
+
+        pin = self._get_pin(row)
+        if column != 1 or not pin:
+            return False
+
+        if pin.comment != text:
+            pin.comment = text
+            self._main_window.mark_measurement_plan_changed()
+        return True
+
     def set_work_mode(self, mode: WorkMode) -> None:
         """
         Method sets widgets according to new work mode. Comment is only for test and write modes.
         :param mode: new work mode.
         """
 
-        if mode is WorkMode.READ_PLAN:
-            if not self._read_only:
-                self._read_only = True
-                self._set_read_only(self._read_only)
+        self._read_only = mode is WorkMode.READ_PLAN
+        if self._read_only:
             self.setEnabled(True)
         else:
-            if self._read_only:
-                self._read_only = False
-                self._set_read_only(self._read_only)
             self.setEnabled(mode in (WorkMode.TEST, WorkMode.WRITE))
 
     @pyqtSlot(QPoint)
@@ -274,9 +325,9 @@ class CommentWidget(TableWidget):
         """
 
         if len(indexes) == 0:
-            indexes = range(self.rowCount())
-
-        for index in indexes:
-            pin = self._main_window.measurement_plan.get_pin_with_index(index)
-            self._change_row_color(index, pin)
+            self._brushes.clear()
+            self._rows_to_calculate.clear()
+            self._model.update_rows()
+        else:
+            self._schedule_row_brushes(*indexes)
         self._change_style_for_selected_row()
@@ -1,8 +1,9 @@
 import logging
 import os
+import threading
 from collections import namedtuple
 from typing import List, Optional, Tuple, Union
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject, QCoreApplication as qApp, QTimer
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject, QCoreApplication as qApp
 from epcore.analogmultiplexer import AnalogMultiplexer, AnalogMultiplexerBase, AnalogMultiplexerVirtual
 from epcore.ivmeasurer import IVMeasurerASA, IVMeasurerBase, IVMeasurerIVM10, IVMeasurerVirtual, IVMeasurerVirtualASA
 from epcore.ivmeasurer.safe_opener import BadFirmwareVersion
@@ -10,6 +11,7 @@ from epcore.measurementmanager import MeasurementSystem
 import connection_window as cw
 from settings.autosettings import AutoSettings
 from . import utils as ut
+from .devicewatcher import DeviceWatcher, WatchTask
 
 
 logger = logging.getLogger("eplab")
@@ -18,11 +20,13 @@ ConnectionData = namedtuple("ConnectionData", ["measurement_system", "product"])
 
 class ConnectionChecker(QObject):
     """
-    Class checks whether IV-measurers and multiplexer can be connected to the given ports.
+    Class checks whether IV-measurers and multiplexer can be connected to the given ports. Devices are waited for in
+    a separate thread that watches serial ports, so GUI is not blocked by attempts to connect missing devices.
     """
 
-    TIMEOUT: int = 300
+    bad_firmware_signal: pyqtSignal = pyqtSignal(int, str)
     connect_signal: pyqtSignal = pyqtSignal(ConnectionData)
+    devices_connected_signal: pyqtSignal = pyqtSignal(int, ConnectionData)
 
     def __init__(self, auto_settings: AutoSettings) -> None:
         """
@@ -31,29 +35,51 @@ class ConnectionChecker(QObject):
 
         super().__init__()
         self._auto_settings: AutoSettings = auto_settings
+        self._bad_firmware_reported: bool = False
         self._force_open: Optional[bool] = None
+        self._lock: threading.Lock = threading.Lock()
         self._measurer_1_uri: Optional[str] = None
         self._measurer_2_uri: Optional[str] = None
         self._mux_uri: Optional[str] = None
         self._product_name: Optional[cw.ProductName] = None
-        self._timer: QTimer = QTimer()
-        self._timer.timeout.connect(self.check_connection)
-        self._timer.setInterval(ConnectionChecker.TIMEOUT)
-        self._timer.setSingleShot(True)
+        self._task_id: Optional[int] = None
+        self._task_number: int = 0
+        self.bad_firmware_signal.connect(self._ask_to_open_with_bad_firmware)
+        self.devices_connected_signal.connect(self._handle_connected_devices)
+        self._watcher: DeviceWatcher = DeviceWatcher(self._connect_devices_in_background)
+        self._watcher.start()
+
+    @pyqtSlot(int, str)
+    def _ask_to_open_with_bad_firmware(self, task_id: int, bad_firmwares: str) -> None:
+        """
+        :param task_id: ID of the task in which IV-measurers with the wrong firmware were found;
+        :param bad_firmwares: error text for IV-measurers with the wrong firmware.
+        """
+
+        if task_id != self._task_id or self._force_open is not None:
+            return
+
+        force_open = ut.show_message_with_option(qApp.translate("t", "Ошибка"), bad_firmwares,
+                                                 qApp.translate("t", "Все равно открыть"))[1]
+        if task_id == self._task_id:
+            self._force_open = force_open
+            self._watcher.request_attempt()
 
     def _connect_devices(self, measurer_1_uri: Optional[str], measurer_2_uri: Optional[str], mux_uri: Optional[str],
-                         product_name: Optional[cw.ProductName], error_report_required: Optional[bool] = False
-                         ) -> ConnectionData:
+                         product_name: Optional[cw.ProductName], error_report_required: Optional[bool] = False,
+                         task_id: Optional[int] = None) -> ConnectionData:
         """
         :param measurer_1_uri: URI for the first IV-measurer;
         :param measurer_2_uri: URI for the second IV-measurer;
         :param mux_uri: URI for multiplexer;
         :param product_name: name of product to work with application.
-        :param error_report_required: if True, then connection errors must be reported, otherwise errors are ignored.
+        :param error_report_required: if True, then connection errors must be reported, otherwise errors are ignored;
+        :param task_id: ID of the background task to connect devices. If the ID is given, the method is called in the
+        thread of the device watcher and must not show dialogs.
         :return: an object with a created measurement system and product name.
         """
 
-        measurers, bad_measurer_uris = self._create_measurers_by_force(measurer_1_uri, measurer_2_uri)
+        measurers, bad_measurer_uris = self._create_measurers_by_force(measurer_1_uri, measurer_2_uri, task_id=task_id)
         mux, bad_mux_uris = create_multiplexer(mux_uri)
 
         if error_report_required:
@@ -75,34 +101,49 @@ class ConnectionChecker(QObject):
         close_devices(*measurers, mux)
         return ConnectionData(None, product_name)
 
-    def _connect_devices_in_background(self) -> bool:
+    def _connect_devices_in_background(self, task_id: int) -> bool:
         """
-        :return: True if IV-measurers and multiplexer have been created to connect.
+        Method is called in the thread of the device watcher.
+        :param task_id: ID of the task to connect devices.
+        :return: True if IV-measurers and multiplexer have been created to connect or the task is no longer relevant.
         """
 
-        if not self._measurer_1_uri and not self._measurer_2_uri and not self._mux_uri:
+        with self._lock:
+            if task_id != self._task_id:
+                return True
+            uris = self._measurer_1_uri, self._measurer_2_uri, self._mux_uri
+            product_name = self._product_name
+
+        if not any(uris):
             return True
 
-        connection_data = self._connect_devices(self._measurer_1_uri, self._measurer_2_uri, self._mux_uri,
-                                                self._product_name)
+        connection_data = self._connect_devices(*uris, product_name, task_id=task_id)
         if connection_data.measurement_system:
-            self.connect_signal.emit(connection_data)
+            self.devices_connected_signal.emit(task_id, connection_data)
             return True
 
         return False
 
-    def _create_measurers_by_force(self, *uris: str) -> Tuple[Optional[List[IVMeasurerBase]], List[str]]:
+    def _create_measurers_by_force(self, *uris: str, task_id: Optional[int] = None
+                                   ) -> Tuple[Optional[List[IVMeasurerBase]], List[str]]:
         """
         Method creates IV-measurers for the given list of URIs. If during creation it turns out that the IV-measurer
         has the wrong firmware, then you can create the IV-measurer anyway.
-        :param uris: URIs for which to create IV-measurers.
+        :param uris: URIs for which to create IV-measurers;
+        :param task_id: ID of the background task to connect devices. If the ID is given, the user is asked about the
+        wrong firmware in GUI thread, and the IV-measurers with the wrong firmware are not created in this attempt.
         :return: list of IV-measurers created for a given list of URIs and list of URIs for which IV-measurers could
         not be created.
         """
 
         measurers, bad_uris, bad_firmwares, bad_firmwares_uris = create_measurers(*uris)
         if bad_firmwares:
-            if self._force_open is None:
+            if self._force_open is None and task_id is not None:
+                if not self._bad_firmware_reported:
+                    self._bad_firmware_reported = True
+                    self.bad_firmware_signal.emit(task_id, bad_firmwares)
+                bad_uris.extend(uri for _, uri in bad_firmwares_uris)
+            elif self._force_open is None:
                 self._force_open = ut.show_message_with_option(qApp.translate("t", "Ошибка"), bad_firmwares,
                                                                qApp.translate("t", "Все равно открыть"))[1]
 
@@ -115,6 +156,14 @@ class ConnectionChecker(QObject):
                         bad_uris.extend(new_bad_uris)
         return list(filter(lambda x: x is not None, measurers)), bad_uris
 
+    def _create_watch_task(self) -> WatchTask:
+        """
+        :return: task for the device watcher to wait for IV-measurers and multiplexer from auto settings.
+        """
+
+        uris = (self._measurer_1_uri, "ivm"), (self._measurer_2_uri, "ivm"), (self._mux_uri, "epmux")
+        return WatchTask(self._task_id, {uri: device_type for uri, device_type in uris if uri and "com:" in uri})
+
     def _get_connection_params(self) -> None:
         """
         Method gets URI of the IV-measurers and multiplexer from auto settings.
@@ -131,10 +180,22 @@ class ConnectionChecker(QObject):
                                                                                                      product_name)
         self._mux_uri = get_uri(connection_params.get("mux_port", None))
 
-    @pyqtSlot()
-    def check_connection(self) -> None:
-        if not self._connect_devices_in_background():
-            self._timer.start()
+    @pyqtSlot(int, ConnectionData)
+    def _handle_connected_devices(self, task_id: int, connection_data: ConnectionData) -> None:
+        """
+        :param task_id: ID of the task in which devices have been connected;
+        :param connection_data: an object with a created measurement system and product name.
+        """
+
+        if task_id != self._task_id:
+            # The user has connected other devices or stopped checking while the devices were being connected
+            measurement_system = connection_data.measurement_system
+            close_devices(*measurement_system.measurers, *measurement_system.multiplexers)
+            return
+
+        with self._lock:
+            self._task_id = None
+        self.connect_signal.emit(connection_data)
 
     def connect_devices_by_user(self, measurer_1_uri: Optional[str], measurer_2_uri: Optional[str],
                                 mux_uri: Optional[str], product_name: Optional[cw.ProductName]) -> ConnectionData:
@@ -154,15 +215,30 @@ class ConnectionChecker(QObject):
         Method starts checking the connection of IV-measurers and multiplexer.
         """
 
-        self._get_connection_params()
-        self._timer.start()
+        self._task_number += 1
+        with self._lock:
+            self._get_connection_params()
+            self._task_id = self._task_number
+        self._bad_firmware_reported = False
+        self._watcher.watch(self._create_watch_task())
 
     def stop_check(self) -> None:
         """
         Method stops checking the connection of IV-measurers and multiplexer.
         """
 
-        self._timer.stop()
+        with self._lock:
+            self._task_id = None
+        self._watcher.stop_watching()
+
+    def stop_thread(self) -> None:
+        """
+        Method stops the thread of the device watcher.
+        """
+
+        self.stop_check()
+        self._watcher.stop_thread()
+        self._watcher.wait()
 
 
 def analyze_connection_params(uris: List[Optional[str]], product_name: Optional[cw.ProductName] = None
@@ -0,0 +1,195 @@
+"""
+File with class for thread that waits for devices to appear on serial ports.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import serial.tools.list_ports
+import serial.tools.list_ports_common
+from PyQt5.QtCore import QThread
+import connection_window as cw
+
+
+logger = logging.getLogger("eplab")
+PortInfo = serial.tools.list_ports_common.ListPortInfo
+
+
+def normalize_uri(uri: str) -> str:
+    """
+    :param uri: URI of device.
+    :return: URI that can be compared with other URIs. Names of ports are case-insensitive on Windows.
+    """
+
+    return uri if cw.utils.get_platform() == "debian" else uri.lower()
+
+
+class WatchTask:
+    """
+    Class for task to connect devices. The task has serial ports on which devices of the given types should appear.
+    Other devices of the task (virtual and network devices) are connected by periodic attempts.
+    """
+
+    def __init__(self, task_id: int, serial_uris: Dict[str, str]) -> None:
+        """
+        :param task_id: ID of the task;
+        :param serial_uris: dictionary with URIs of serial ports and types of devices on them ("ivm" or "epmux").
+        """
+
+        self.serial_uris: Dict[str, str] = {normalize_uri(uri): device_type for uri, device_type in serial_uris.items()}
+        self.task_id: int = task_id
+
+
+class DeviceWatcher(QThread):
+    """
+    Class for thread that waits for devices to appear. Only the list of serial ports is read periodically, and an
+    attempt to connect devices is made when all required ports are present with VID and PID of the expected devices
+    and the list of ports has changed. If ports are present, but the devices could not be opened (for example, they
+    are used by another program), attempts are repeated rarely. Devices that are not connected to serial ports are
+    connected by rare periodic attempts. Attempts are made in this thread, so a failing attempt does not block GUI.
+    """
+
+    POLL_INTERVAL: float = 1.0
+    RETRY_INTERVAL: float = 5.0
+
+    def __init__(self, connect: Callable[[int], bool],
+                 list_ports: Callable[[], Iterable[PortInfo]] = serial.tools.list_ports.comports,
+                 poll_interval: float = POLL_INTERVAL, retry_interval: float = RETRY_INTERVAL) -> None:
+        """
+        :param connect: function that tries to connect devices for the task with the given ID and returns True if the
+        devices have been connected;
+        :param list_ports: function that returns serial ports;
+        :param poll_interval: interval in seconds between reading the list of serial ports;
+        :param retry_interval: interval in seconds between attempts to connect devices if the ports have not changed.
+        """
+
+        super().__init__()
+        self._condition: threading.Condition = threading.Condition()
+        self._connect: Callable[[int], bool] = connect
+        self._forced: bool = False
+        self._list_ports: Callable[[], Iterable[PortInfo]] = list_ports
+        self._poll_interval: float = poll_interval
+        self._retry_interval: float = retry_interval
+        self._stop_thread: bool = False
+        self._task: Optional[WatchTask] = None
+        self._vids_and_pids: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def _check_ports(self, task: WatchTask, ports: Dict[str, Tuple[Optional[int], Optional[int]]]) -> bool:
+        """
+        :param task: task to connect devices;
+        :param ports: dictionary with URIs of present serial ports and their VIDs and PIDs.
+        :return: True if all serial ports of the task are present with VIDs and PIDs of the expected devices.
+        """
+
+        for uri, device_type in task.serial_uris.items():
+            if uri not in ports:
+                return False
+
+            vid_and_pid = self._get_vid_and_pid(device_type)
+            if vid_and_pid is not None and ports[uri] != vid_and_pid:
+                return False
+        return True
+
+    def _get_ports(self) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        """
+        :return: dictionary with URIs of present serial ports and their VIDs and PIDs.
+        """
+
+        ports = {}
+        try:
+            for port in self._list_ports():
+                ports[normalize_uri(cw.utils.create_uri_name(port.device))] = port.vid, port.pid
+        except Exception as exc:
+            logger.error("Failed to get the list of serial ports: %s", exc)
+        return ports
+
+    def _get_vid_and_pid(self, device_type: str) -> Optional[Tuple[int, int]]:
+        """
+        :param device_type: type of device.
+        :return: VID and PID of devices of the given type or None if they are unknown.
+        """
+
+        if device_type not in self._vids_and_pids:
+            try:
+                self._vids_and_pids[device_type] = cw.utils.get_vid_and_pid(device_type)
+            except Exception:
+                self._vids_and_pids[device_type] = None
+        return self._vids_and_pids[device_type]
+
+    def _wait_for_task(self) -> Tuple[Optional[WatchTask], bool]:
+        """
+        :return: current task and True if an attempt to connect devices should be made without waiting.
+        """
+
+        with self._condition:
+            while not self._stop_thread and self._task is None:
+                self._condition.wait()
+            forced = self._forced
+            self._forced = False
+            return self._task, forced
+
+    def request_attempt(self) -> None:
+        """
+        Method asks the thread to try to connect devices of the current task immediately.
+        """
+
+        with self._condition:
+            self._forced = True
+            self._condition.notify_all()
+
+    def run(self) -> None:
+        last_attempt_time = None
+        last_ports = None
+        last_task = None
+        while True:
+            task, forced = self._wait_for_task()
+            if task is None:
+                return
+
+            if task is not last_task:
+                last_attempt_time, last_ports, last_task = None, None, task
+
+            ports = self._get_ports() if task.serial_uris else {}
+            now = time.monotonic()
+            if self._check_ports(task, ports):
+                retry = last_attempt_time is None or now - last_attempt_time >= self._retry_interval
+                if forced or retry or (task.serial_uris and ports != last_ports):
+                    last_attempt_time = now
+                    if self._connect(task.task_id):
+                        with self._condition:
+                            if self._task is task:
+                                self._task = None
+            last_ports = ports
+
+            with self._condition:
+                if not self._stop_thread and self._task is task and not self._forced:
+                    self._condition.wait(self._poll_interval)
+
+    def stop_thread(self) -> None:
+        """
+        Method stops the thread.
+        """
+
+        with self._condition:
+            self._stop_thread = True
+            self._task = None
+            self._condition.notify_all()
+
+    def stop_watching(self) -> None:
+        """
+        Method stops waiting for devices. An attempt to connect devices that has already started is not interrupted.
+        """
+
+        with self._condition:
+            self._task = None
+            self._condition.notify_all()
+
+    def watch(self, task: WatchTask) -> None:
+        """
+        :param task: new task to connect devices.
+        """
+
+        with self._condition:
+            self._task = task
+            self._condition.notify_all()
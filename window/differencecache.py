@@ -0,0 +1,269 @@
+"""
+File with class to cache differences between reference and test signatures of measurement plan pins.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from epcore.elements import Measurement, MeasurementSettings, Pin
+
+
+logger = logging.getLogger("eplab")
+PinHashRecord = Tuple[Measurement, Measurement, Tuple[float, float], str]
+
+
+def get_measurement_hash(reference: Measurement, test: Measurement, noise_amplitudes: Tuple[float, float]) -> str:
+    """
+    :param reference: reference measurement;
+    :param test: test measurement;
+    :param noise_amplitudes: noise amplitudes of voltage and current with which the measurements are compared.
+    :return: hash of the measurements and their settings.
+    """
+
+    settings = reference.settings
+    hash_object = hashlib.sha1()
+    hash_object.update(repr((settings.sampling_rate, settings.internal_resistance, settings.max_voltage,
+                             settings.probe_signal_frequency, tuple(noise_amplitudes))).encode())
+    for measurement in (reference, test):
+        for values in (measurement.ivc.currents, measurement.ivc.voltages):
+            hash_object.update(len(values).to_bytes(4, "little"))
+            hash_object.update(array("d", values).tobytes())
+    return hash_object.hexdigest()
+
+
+class DifferenceCache:
+    """
+    Class stores differences between reference and test signatures for pins of the measurement plan. Each difference
+    is stored with the pin index and the hash of the measurements, so when the tolerance changes there is no need to
+    compare signatures again. The cache can be saved to a file next to the measurement plan file.
+
+    The hash of the measurements of a pin is calculated once and recorded with the measurement objects: when the pin
+    is saved, when the plan is loaded with an up-to-date cache file, or at the first lookup. Later lookups only check
+    that the pin still has the same measurement objects, so they do not read signatures.
+    """
+
+    FILE_EXTENSION: str = ".differences.json"
+    VERSION: int = 2
+
+    def __init__(self, get_noise_amplitudes: Callable[[MeasurementSettings], Tuple[float, float]]) -> None:
+        """
+        :param get_noise_amplitudes: function that returns noise amplitudes of voltage and current for given
+        measurement settings.
+        """
+
+        self._differences: Dict[int, Tuple[str, float]] = {}
+        self._get_noise_amplitudes: Callable[[MeasurementSettings], Tuple[float, float]] = get_noise_amplitudes
+        self._pin_hashes: Dict[int, PinHashRecord] = {}
+
+    @staticmethod
+    def _get_plan_file_state(plan_path: str) -> Optional[List[int]]:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: size and modification time of the measurement plan file.
+        """
+
+        try:
+            stat = os.stat(plan_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _get_validated_differences(self) -> Dict[int, Tuple[str, float]]:
+        """
+        :return: cached differences whose hashes match the recorded hashes of the current measurements of pins.
+        """
+
+        return {index: value for index, value in self._differences.items()
+                if index in self._pin_hashes and self._pin_hashes[index][3] == value[0]}
+
+    def _record_loaded_hashes(self, pins: Iterable[Tuple[int, Pin]]) -> None:
+        """
+        Method records the hashes read from the up-to-date cache file for the measurements of the loaded pins.
+        Signatures of the pins are not read.
+        :param pins: pins of the loaded measurement plan and their indexes.
+        """
+
+        for index, pin in pins:
+            if index not in self._differences:
+                continue
+
+            reference, test, settings = pin.get_reference_and_test_measurements()
+            if None not in (reference, test, settings):
+                self._pin_hashes[index] = (reference, test, tuple(self._get_noise_amplitudes(settings)),
+                                           self._differences[index][0])
+
+    def clear(self) -> None:
+        """
+        Method removes all cached differences and recorded hashes.
+        """
+
+        self._differences.clear()
+        self._pin_hashes.clear()
+
+    def get_cached_differences(self) -> Dict[int, float]:
+        """
+        :return: dictionary with cached differences that have been checked against the current measurements of pins.
+        Differences are returned without access to the pins.
+        """
+
+        return {index: difference for index, (_, difference) in self._get_validated_differences().items()}
+
+    def get_differences(self, pins: Dict[int, Optional[Pin]]
+                        ) -> Tuple[Dict[int, float], Dict[int, Pin], Dict[int, str]]:
+        """
+        :param pins: dictionary with pins and their indexes.
+        :return: dictionary with cached differences, dictionary with pins whose differences are not in the cache and
+        dictionary with hashes of these pins.
+        """
+
+        differences = {}
+        missing_pins = {}
+        missing_hashes = {}
+        for index, pin in pins.items():
+            pin_hash = self.get_pin_hash(index, pin)
+            if pin_hash is None:
+                continue
+
+            cached = self._differences.get(index)
+            if cached is not None and cached[0] == pin_hash:
+                differences[index] = cached[1]
+            else:
+                missing_pins[index] = pin
+                missing_hashes[index] = pin_hash
+        return differences, missing_pins, missing_hashes
+
+    @staticmethod
+    def get_file_name(plan_path: str) -> str:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: path to the file with cached differences for the measurement plan.
+        """
+
+        return os.path.splitext(plan_path)[0] + DifferenceCache.FILE_EXTENSION
+
+    def get_pin_hash(self, index: int, pin: Optional[Pin]) -> Optional[str]:
+        """
+        :param index: pin index;
+        :param pin: pin.
+        :return: hash of the reference and test measurements of the pin or None if the pin does not have them. The
+        recorded hash is returned if the pin has the same measurements.
+        """
+
+        if pin is None:
+            return None
+
+        reference, test, settings = pin.get_reference_and_test_measurements()
+        if None in (reference, test, settings):
+            self._pin_hashes.pop(index, None)
+            return None
+
+        noise_amplitudes = tuple(self._get_noise_amplitudes(settings))
+        record = self._pin_hashes.get(index)
+        if record is None or record[0] is not reference or record[1] is not test or record[2] != noise_amplitudes:
+            record = reference, test, noise_amplitudes, get_measurement_hash(reference, test, noise_amplitudes)
+            self._pin_hashes[index] = record
+        return record[3]
+
+    def insert_pin(self, index: int) -> None:
+        """
+        Method shifts the indexes of cached differences when a new pin is inserted.
+        :param index: index of the inserted pin.
+        """
+
+        self._differences = {pin_index + 1 if pin_index >= index else pin_index: value
+                             for pin_index, value in self._differences.items()}
+        self._pin_hashes = {pin_index + 1 if pin_index >= index else pin_index: value
+                            for pin_index, value in self._pin_hashes.items()}
+
+    def invalidate(self, index: int) -> None:
+        """
+        :param index: index of the pin whose measurements have changed.
+        """
+
+        self._differences.pop(index, None)
+        self._pin_hashes.pop(index, None)
+
+    def load(self, plan_path: Optional[str], pins: Iterable[Tuple[int, Pin]] = ()) -> None:
+        """
+        Method reads cached differences from a file next to the measurement plan file. If the measurement plan file
+        has not changed since the cache file was written, the hashes from the cache file are recorded for the pins.
+        Otherwise, the hashes are checked at the first lookup of each pin.
+        :param plan_path: path to the measurement plan file;
+        :param pins: pins of the loaded measurement plan and their indexes.
+        """
+
+        self.clear()
+        if not plan_path:
+            return
+
+        file_name = self.get_file_name(plan_path)
+        if not os.path.isfile(file_name):
+            return
+
+        try:
+            with open(file_name, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != DifferenceCache.VERSION:
+                return
+
+            self._differences = {int(index): (pin_hash, float(difference))
+                                 for index, (pin_hash, difference) in data["differences"].items()}
+            plan_file_state = self._get_plan_file_state(plan_path)
+            if plan_file_state is not None and data.get("plan_file_state") == plan_file_state:
+                self._record_loaded_hashes(pins)
+        except Exception:
+            logger.warning("Failed to read cached differences from file '%s'", file_name)
+            self.clear()
+
+    def record_pin(self, index: int, pin: Optional[Pin]) -> None:
+        """
+        Method records the hash of new measurements of the pin. The cached difference of the pin is removed.
+        :param index: index of the pin whose measurements have changed;
+        :param pin: pin with new measurements.
+        """
+
+        self.invalidate(index)
+        self.get_pin_hash(index, pin)
+
+    def remove_pin(self, index: int) -> None:
+        """
+        Method removes the difference of the deleted pin and shifts the indexes of the following pins.
+        :param index: index of the deleted pin.
+        """
+
+        self._differences = {pin_index - 1 if pin_index > index else pin_index: value
+                             for pin_index, value in self._differences.items() if pin_index != index}
+        self._pin_hashes = {pin_index - 1 if pin_index > index else pin_index: value
+                            for pin_index, value in self._pin_hashes.items() if pin_index != index}
+
+    def save(self, plan_path: Optional[str]) -> None:
+        """
+        Method writes cached differences to a file next to the measurement plan file. Only differences checked against
+        the current measurements of pins are written, and the state of the measurement plan file is written with them.
+        :param plan_path: path to the saved measurement plan file.
+        """
+
+        if not plan_path:
+            return
+
+        file_name = self.get_file_name(plan_path)
+        data = {"version": DifferenceCache.VERSION,
+                "plan_file_state": self._get_plan_file_state(plan_path),
+                "differences": {str(index): list(value) for index, value in self._get_validated_differences().items()}}
+        try:
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+        except OSError:
+            logger.warning("Failed to write cached differences to file '%s'", file_name)
+
+    def update(self, differences: Dict[int, float], hashes: Dict[int, str]) -> None:
+        """
+        :param differences: dictionary with new differences for pins;
+        :param hashes: dictionary with hashes of measurements of the pins.
+        """
+
+        for index, difference in differences.items():
+            self._differences[index] = hashes[index], difference
@@ -10,7 +10,8 @@ from datetime import datetime
 from functools import partial
 from platform import system
 from typing import Any, Dict, List, Optional, Tuple
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QCoreApplication as qApp, QEvent, QPointF, Qt, QTimer, QTranslator
+from PyQt5.QtCore import (pyqtSignal, pyqtSlot, QCoreApplication as qApp, QEvent, QEventLoop, QPointF, Qt, QTimer,
+                          QTranslator)
 from PyQt5.QtGui import QCloseEvent, QColor, QIcon, QKeySequence, QMouseEvent, QResizeEvent
 from PyQt5.QtWidgets import (QAction, QFileDialog, QHBoxLayout, QMainWindow, QMessageBox, QShortcut, QStyle,
                              QVBoxLayout, QWidget)
@@ -24,26 +25,34 @@ from epcore.product import EyePointProduct, MeasurementParameterOption
 from ivviewer import Viewer as IVViewer
 from ivviewer.ivcviewer import PlotCurve
 import connection_window as cw
-from dialogs import (ReportGenerationThread, show_keymap_info, show_language_selection_window,
-                     show_measurer_settings_window, show_product_info, show_report_generation_window)
+from dialogs import (ReportGenerationThread, ReportGenerationWindow, ReportStatusWidget, show_keymap_info,
+                     show_language_selection_window, show_measurer_settings_window, show_product_info,
+                     show_report_generation_window)
 from multiplexer import MuxAndPlanWindow
 from settings import AutoSettings, LowSettingsPanel, Settings, SettingsWindow
 from version import Version
 from . import utils as ut
 from .boardwidget import BoardWidget
+from .breakdetector import FeatureBreakDetector
 from .breaksignaturessaver import BreakSignaturesSaver, check_break_signatures
 from .commentwidget import CommentWidget
 from .common import DeviceErrorsHandler, WorkMode
 from .connectionchecker import analyze_connection_params, ConnectionChecker, ConnectionData
 from .curvestates import CurveStates
+from .differencecache import DifferenceCache
 from .language import get_language, Language, Translator
+from .lazyplanloader import load_board_lazily
 from .measuredpinschecker import MeasuredPinsChecker
+from .measurementthread import MeasurementFrame, MeasurementThread
+from .optionscache import OptionsCache
 from .measurementplanpath import MeasurementPlanPath
 from .parameterwidget import ParameterWidget
 from .pedalhandler import add_pedal_handler
 from .pinindexwidget import PinIndexWidget
 from .planautotransition import PlanAutoTransition
 from .plancompatibility import PlanCompatibility
+from .planrevision import PlanRevision
+from .plansavingthread import PlanSavingThread
 from .scaler import get_scale_factor, update_scale_of_action, update_scale_of_class
 from .scorewrapper import check_difference_not_greater_tolerance, ScoreWrapper
 from .soundplayer import SoundPlayer
@@ -73,8 +82,10 @@ class EPLabWindow(QMainWindow):
     INIT_HEIGHT: int = 730
     MIN_WIDTH_IN_LINUX: int = 700
     MIN_WIDTH_IN_WINDOWS: int = 650
+    STATUS_MESSAGE_TIMEOUT_MS: int = 5000
     measurers_connected: pyqtSignal = pyqtSignal(bool)
     measurers_disconnected: pyqtSignal = pyqtSignal()
+    plan_saving_done: pyqtSignal = pyqtSignal(int, bool)
     work_mode_changed: pyqtSignal = pyqtSignal(WorkMode)
 
     def __init__(self, product: EyePointProduct, uri_1: Optional[str] = None, uri_2: Optional[str] = None,
@@ -91,21 +102,32 @@ class EPLabWindow(QMainWindow):
         self._auto_settings: AutoSettings = AutoSettings(path=EPLabWindow.FILENAME_FOR_AUTO_SETTINGS)
         self._comparator: IVCComparator = IVCComparator()
         self._device_errors_handler: DeviceErrorsHandler = DeviceErrorsHandler()
+        self._difference_cache: DifferenceCache = DifferenceCache(self._get_noise_amplitudes)
         self._dir_chosen_by_user: str = ut.get_user_documents_path()
         self._hide_reference_curve: bool = False
         self._hide_current_curve: bool = False
-        self._last_saved_measurement_plan_data: Optional[Dict[str, Any]] = None
         self._measurement_plan: Optional[MeasurementPlan] = None
         self._measured_pins_checker: MeasuredPinsChecker = MeasuredPinsChecker(self)
         self._measured_pins_checker.measured_pin_in_plan_signal.connect(self.handle_measurement_plan_change)
         self._measurement_plan_path: MeasurementPlanPath = MeasurementPlanPath(self)
         self._measurement_plan_path.name_changed.connect(self.change_window_title)
+        self._measurement_thread: Optional[MeasurementThread] = None
         self._msystem: Optional[MeasurementSystem] = None
+        self._plan_revision: PlanRevision = PlanRevision()
+        self._plan_saving_tasks: Dict[int, Tuple[MeasurementPlan, int]] = {}
+        self._plan_saving_thread: PlanSavingThread = PlanSavingThread(self)
+        self._plan_saving_thread.saving_failed.connect(self.handle_plan_saving_failure)
+        self._plan_saving_thread.saving_finished.connect(self.handle_plan_saving_finish)
+        self._plan_saving_thread.saving_progress.connect(self.handle_plan_saving_progress)
+        self._plan_saving_thread.saving_started.connect(self.handle_plan_saving_start)
+        self._plan_saving_thread.start()
         self._product: EyePointProduct = product
+        self._options_cache: OptionsCache = OptionsCache(product)
         self._product_name: Optional[cw.ProductName] = None
         self._report_generation_thread: ReportGenerationThread = ReportGenerationThread(self)
         self._report_generation_thread.start()
-        self._skip_curve: bool = False  # set to True to skip next measured curves
+        # Settings generation of the measurement thread for which the plot parameters are adjusted
+        self._plot_settings_generation: int = 0
 
         self._timer: QTimer = QTimer()
         self._timer.setInterval(10)
@@ -129,10 +151,13 @@ class EPLabWindow(QMainWindow):
         self._connection_checker.connect_signal.connect(self.handle_connection_signal_from_checker)
         self._break_signature_saver: BreakSignaturesSaver = BreakSignaturesSaver(self.product, self._auto_settings)
         self._break_signature_saver.new_settings_signal.connect(self.set_measurement_settings_and_update_ui)
+        break_detector = FeatureBreakDetector(self._calculate_difference, self._get_noise_amplitudes)
         self._plan_auto_transition: PlanAutoTransition = PlanAutoTransition(self.product, self._auto_settings,
                                                                             self._score_wrapper,
                                                                             self._calculate_difference,
-                                                                            self._break_signature_saver.DIR_PATH)
+                                                                            self._break_signature_saver.DIR_PATH,
+                                                                            break_detector=break_detector,
+                                                                            options_cache=self._options_cache)
         self._plan_auto_transition.go_to_next_signal.connect(self.go_to_left_or_right_pin)
         self._plan_auto_transition.save_pin_signal.connect(self.save_pin)
 
@@ -198,6 +223,14 @@ class EPLabWindow(QMainWindow):
 
         return self._measured_pins_checker.is_measured_pin
 
+    @property
+    def is_measurement_plan_modified(self) -> bool:
+        """
+        :return: True if the measurement plan has been changed since it was loaded from the file or saved.
+        """
+
+        return self._plan_revision.is_modified
+
     @property
     def measurement_plan(self) -> Optional[MeasurementPlan]:
         """
@@ -206,6 +239,22 @@ class EPLabWindow(QMainWindow):
 
         return self._measurement_plan
 
+    @property
+    def measurement_plan_path(self) -> Optional[str]:
+        """
+        :return: path to the measurement plan file.
+        """
+
+        return self._measurement_plan_path.path
+
+    @property
+    def options_cache(self) -> OptionsCache:
+        """
+        :return: cache of product options for measurement settings.
+        """
+
+        return self._options_cache
+
     @property
     def product(self) -> EyePointProduct:
         """
@@ -384,6 +433,19 @@ class EPLabWindow(QMainWindow):
                                                 "нет некоторых сигнатур разрыва, поэтому автопереход может работать "
                                                 "некорректно."), icon=QMessageBox.Information)
 
+    def _check_measurement_plan_modified(self) -> bool:
+        """
+        :return: True if the measurement plan has changes that are not saved and are not being saved now.
+        """
+
+        if not self._plan_revision.is_modified:
+            return False
+
+        for plan, revision in self._plan_saving_tasks.values():
+            if plan is self._measurement_plan and revision == self._plan_revision.revision:
+                return False
+        return True
+
     def _check_plan_compatibility(self, plan: MeasurementPlan, is_new_plan: bool = False,
                                   filename: Optional[str] = None) -> None:
         """
@@ -397,8 +459,9 @@ class EPLabWindow(QMainWindow):
         checker = PlanCompatibility(self, self._msystem, self._product)
         self._measurement_plan, new_plan_created = checker.get_compatible_plan(plan, is_new_plan, filename)
         self._measurement_plan_path.path = None if new_plan_created else filename
+        self._difference_cache.load(self._measurement_plan_path.path, self._measurement_plan.all_pins_iterator())
 
-        self._last_saved_measurement_plan_data = self._measurement_plan.to_json()
+        self._plan_revision.mark_saved()
         self._measured_pins_checker.set_new_plan()
         self._update_mux_actions()
 
@@ -438,8 +501,7 @@ class EPLabWindow(QMainWindow):
         self._mux_and_plan_window.close()
         self._score_wrapper.set_dummy_difference()
 
-        self._settings_update_next_cycle = None
-        self._skip_curve = False
+        self._plot_settings_generation = 0
         self._work_mode = None
         self._hide_current_curve = False
         self._hide_reference_curve = False
@@ -457,12 +519,15 @@ class EPLabWindow(QMainWindow):
         """
 
         self._msystem = measurement_system
+        self._measurement_thread = MeasurementThread(self._msystem, self)
+        self._measurement_thread.device_error_signal.connect(self.handle_device_error_in_measurement_thread)
 
         self._clear_widgets()
         self._comment_widget.clear_table()
         self._iv_window.plot.clear_center_text()
         options_data = self._read_options_from_json()
         self._product.change_options(options_data)
+        self._options_cache.clear()
         if product_name is None:
             self._product_name = cw.ProductName.get_default_product_name_for_measurers(self._msystem.measurers)
         else:
@@ -476,6 +541,7 @@ class EPLabWindow(QMainWindow):
 
         self._set_widgets_to_init_state()
         self.measurers_connected.emit(True)
+        self._measurement_thread.start()
         self._timer.start()
 
     def _connect_scale_change_signal(self) -> None:
@@ -541,7 +607,8 @@ class EPLabWindow(QMainWindow):
             layout.addWidget(widget)
 
     def _delete_measurement_plan(self) -> None:
-        self._last_saved_measurement_plan_data = None
+        self._difference_cache.clear()
+        self._plan_revision.reset()
         self._measurement_plan = None
         self._measured_pins_checker.set_new_plan()
         self._measurement_plan_path.path = None
@@ -564,6 +631,7 @@ class EPLabWindow(QMainWindow):
 
     def _disconnect_devices(self) -> None:
         self._timer.stop()
+        self._stop_measurement_thread()
         if self.start_or_stop_entire_plan_measurement_action.isChecked():
             self.start_or_stop_entire_plan_measurement_action.setChecked(False)
         if self._msystem:
@@ -589,16 +657,17 @@ class EPLabWindow(QMainWindow):
                 "reference": bool(self.reference_curve_plot.curve),
                 "test": bool(self.test_curve_plot.curve)}
 
-    def _get_curves_for_periodic_task(self) -> Tuple[Dict[str, IVCurve], MeasurementSettings]:
+    def _get_curves_for_periodic_task(self, frame: MeasurementFrame) -> Tuple[Dict[str, IVCurve], MeasurementSettings]:
         """
+        :param frame: frame with signatures from the measurement thread.
         :return: dictionary with current measurements and measurement settings.
         """
 
-        curves = {"current": self._msystem.measurers[0].get_last_cached_iv_curve()}
-        if self._work_mode is WorkMode.COMPARE and len(self._msystem.measurers) > 1:
+        curves = {"current": frame.curves[0]}
+        if self._work_mode is WorkMode.COMPARE and len(frame.curves) > 1:
             # Display two current curves
-            curves["reference"] = self._msystem.measurers[1].get_last_cached_iv_curve()
-        measurement_settings = self._msystem.get_settings()
+            curves["reference"] = frame.curves[1]
+        measurement_settings = frame.settings
 
         if self._compare_measurement:
             if self._compare_measurement.settings == measurement_settings:
@@ -680,6 +749,10 @@ class EPLabWindow(QMainWindow):
 
         self._board_window: BoardWidget = BoardWidget(self)
         self._board_window.current_pin_signal.connect(self.go_to_selected_pin)
+        self._report_generation_window: ReportGenerationWindow = ReportGenerationWindow(
+            self, self._report_generation_thread)
+        self.statusBar().addPermanentWidget(ReportStatusWidget(self._report_generation_thread,
+                                                               self._report_generation_window))
         self._parameters_widgets: Dict[EyePointProduct.Parameter, ParameterWidget] = dict()
         self._player: SoundPlayer = SoundPlayer()
         self._player.set_mute(not self.sound_enabled_action.isChecked())
@@ -758,8 +831,6 @@ class EPLabWindow(QMainWindow):
         self._comment_widget.current_row_signal.connect(self.go_to_selected_pin)
         self.comment_vertical_layout.insertWidget(0, self._comment_widget)
 
-        # Update plot settings at next measurement cycle (place settings here or None)
-        self._settings_update_next_cycle: Optional[MeasurementSettings] = None
         self._compare_measurement: Optional[Measurement] = None
         self._current_curve: Optional[IVCurve] = None
         self._reference_curve: Optional[IVCurve] = None
@@ -803,7 +874,7 @@ class EPLabWindow(QMainWindow):
         board = None
         if filename:
             try:
-                board = epfilemanager.load_board_from_ufiv(filename, auto_convert_p10=True)
+                board = load_board_lazily(filename)
                 self.dir_chosen_by_user = filename
             except ImageNotFoundError:
                 ut.show_message(qApp.translate("t", "Ошибка"),
@@ -815,11 +886,11 @@ class EPLabWindow(QMainWindow):
         return board, filename
 
     def _read_curves_periodic_task(self) -> None:
-        if self._msystem.measurements_are_ready():
-            if self._skip_curve:
-                self._skip_curve = False
-            else:
-                curves, measurement_settings = self._get_curves_for_periodic_task()
+        frame = self._measurement_thread.get_last_frame()
+        if frame is not None:
+            # Frames measured before the last change of settings are stale
+            if frame.settings_generation == self._measurement_thread.settings_generation:
+                curves, measurement_settings = self._get_curves_for_periodic_task(frame)
                 self._update_signatures(curves, measurement_settings)
                 if self._mux_and_plan_window.measurement_plan_runner.is_running:
                     self._mux_and_plan_window.measurement_plan_runner.check_pin()
@@ -830,13 +901,13 @@ class EPLabWindow(QMainWindow):
                     # Break signatures are only saved when debugging the application
                     # self._break_signature_saver.save_signature(measurement_settings, curves["current"])
 
-                if self._settings_update_next_cycle:
+                if frame.settings_generation != self._plot_settings_generation:
                     # New curve with new settings - we must update plot parameters
-                    self._adjust_plot_params(self._settings_update_next_cycle)
-                    self._settings_update_next_cycle = None
+                    self._adjust_plot_params(measurement_settings)
+                    self._plot_settings_generation = frame.settings_generation
                     # You need to redraw markers with new plot parameters (the scale of the plot has changed)
                     self._iv_window.plot.redraw_cursors()
-            self._msystem.trigger_measurements()
+            self._measurement_thread.frame_processed()
 
     def _read_options_from_json(self) -> Optional[Dict[str, Any]]:
         """
@@ -881,7 +952,7 @@ class EPLabWindow(QMainWindow):
         """
 
         result = 0
-        if self._measurement_plan and self._last_saved_measurement_plan_data != self._measurement_plan.to_json():
+        if self._measurement_plan and self._check_measurement_plan_modified():
             if self._measurement_plan_path.path:
                 main_text = qApp.translate("t", "Сохранить изменения в '{}'?").format(self._measurement_plan_path.path)
             else:
@@ -890,11 +961,40 @@ class EPLabWindow(QMainWindow):
             result = ut.show_message(qApp.translate("t", "Внимание"), text, icon=QMessageBox.Information,
                                      yes_button=True, no_button=True, cancel_button=True)
             if result == 0:
-                # You need to save the changes to an existing file
-                if self.save_board() is None:
+                # You need to save the changes to an existing file. The plan is replaced or closed after the changes,
+                # so it is necessary to wait until the file is written
+                if not self.save_board(True):
                     result = 2
         return result in (0, 1)
 
+    def _save_measurement_plan_in_background(self, path: str, wait: bool = False) -> bool:
+        """
+        Method creates a snapshot of the measurement plan and passes it to the thread that saves plans to files.
+        :param path: path to the file;
+        :param wait: if True, then the method waits until the file is written. Events are processed while waiting, so
+        the window shows the progress of saving.
+        :return: True if saving has started or, if the method waits, if the measurement plan has been saved.
+        """
+
+        task_id = self._plan_saving_thread.add_task(self._measurement_plan, path, self._auto_settings.binary_signatures)
+        self._plan_saving_tasks[task_id] = self._measurement_plan, self._plan_revision.revision
+        if not wait:
+            return True
+
+        results = {}
+        loop = QEventLoop()
+
+        def handle_saving_done(done_task_id: int, saved: bool) -> None:
+            if done_task_id == task_id:
+                results[task_id] = saved
+                loop.quit()
+
+        self.plan_saving_done.connect(handle_saving_done)
+        while task_id not in results:
+            loop.exec()
+        self.plan_saving_done.disconnect(handle_saving_done)
+        return results[task_id]
+
     def _save_last_signatures(self, curves: Dict[str, Optional[IVCurve]]) -> None:
         """
         :param curves: dictionary with new signatures.
@@ -921,8 +1021,9 @@ class EPLabWindow(QMainWindow):
         """
 
         if self._msystem and len(self._msystem.measurers) > 0:
-            curve = self._msystem.measurers[0].get_last_cached_iv_curve()
-            settings = self._msystem.get_settings()
+            with self._measurement_thread.device_lock:
+                curve = self._msystem.measurers[0].get_last_cached_iv_curve()
+                settings = self._msystem.get_settings()
             self._compare_measurement = Measurement(settings=settings, ivc=curve)
 
     def _set_hotkeys_for_moving_through_pins(self) -> None:
@@ -966,11 +1067,9 @@ class EPLabWindow(QMainWindow):
         :param settings: measurement settings to set.
         """
 
-        self._msystem.set_settings(settings)
-        # Skip next measurement because it still has old settings
-        self._skip_curve = True
-        # When new curve will be received plot parameters will be adjusted
-        self._settings_update_next_cycle = settings
+        # Frames with old settings will be discarded. When a frame with new settings is received, the plot parameters
+        # will be adjusted
+        self._measurement_thread.set_settings(settings)
 
     def _set_options_to_ui(self, options: Dict[EyePointProduct.Parameter, str]) -> None:
         """
@@ -1008,8 +1107,7 @@ class EPLabWindow(QMainWindow):
             for multiplexer in self._msystem.multiplexers:
                 multiplexer.open_device()
 
-        self._settings_update_next_cycle = None
-        self._skip_curve = False
+        self._plot_settings_generation = 0
         self._hide_current_curve = False
         self._hide_reference_curve = False
         self._compare_measurement = None
@@ -1027,9 +1125,10 @@ class EPLabWindow(QMainWindow):
         # Set ui settings state to current device
         with self._device_errors_handler:
             settings = self._auto_settings.get_measurement_settings(self._product)
-            if settings is not None:
-                self._msystem.set_settings(settings)
-            settings = self._msystem.get_settings()
+            with self._measurement_thread.device_lock:
+                if settings is not None:
+                    self._msystem.set_settings(settings)
+                settings = self._msystem.get_settings()
             self._adjust_plot_params(settings)
             self._create_scroll_areas_for_parameters(self._product.get_available_options(settings))
             options = self._product.settings_to_options(settings)
@@ -1061,6 +1160,17 @@ class EPLabWindow(QMainWindow):
             self._auto_settings.save_pin_shift_warning_info(False)
         return result
 
+    def _stop_measurement_thread(self) -> None:
+        """
+        Method stops the thread that performs measurements and waits for it to finish.
+        """
+
+        if self._measurement_thread:
+            self._measurement_thread.stop_thread()
+            self._measurement_thread.wait()
+            self._measurement_thread.deleteLater()
+            self._measurement_thread = None
+
     @pyqtSlot(WorkMode)
     def _switch_work_mode(self, mode: WorkMode) -> None:
         """
@@ -1211,6 +1321,7 @@ class EPLabWindow(QMainWindow):
         self._score_wrapper.set_tolerance(tolerance)
         self._player.set_tolerance(tolerance)
         self._comment_widget.update_table_for_new_tolerance()
+        self._board_window.update_pin_colors()
 
     @pyqtSlot(Settings)
     def apply_settings(self, new_settings: Settings) -> None:
@@ -1232,6 +1343,23 @@ class EPLabWindow(QMainWindow):
         self._auto_settings.pin_shift_warning_info = new_settings.pin_shift_warning_info
         self._update_tolerance(new_settings.tolerance)
 
+    def calculate_differences_for_pins(self, pins: Dict[int, Optional[Pin]]) -> Dict[int, float]:
+        """
+        :param pins: dictionary with pins and their indexes.
+        :return: dictionary with differences between reference and test signatures for pins that have both of them.
+        """
+
+        differences, pins_to_compare, hashes = self._difference_cache.get_differences(pins)
+        if pins_to_compare:
+            new_differences = {}
+            for index, pin in pins_to_compare.items():
+                reference, test, settings = pin.get_reference_and_test_measurements()
+                new_differences[index] = self._calculate_difference(reference.ivc, test.ivc, settings)
+            self._difference_cache.update(new_differences, hashes)
+            differences.update(new_differences)
+            self._board_window.update_pin_colors()
+        return differences
+
     @pyqtSlot(str)
     def change_window_title(self, measurement_plan_name: str) -> None:
         """
@@ -1266,9 +1394,14 @@ class EPLabWindow(QMainWindow):
 
         self._board_window.close()
         self._mux_and_plan_window.close()
+        self._stop_measurement_thread()
+        self._connection_checker.stop_thread()
         if self._report_generation_thread:
             self._report_generation_thread.stop_thread()
             self._report_generation_thread.wait()
+        # Plans that are being saved must be written completely
+        self._plan_saving_thread.stop_thread()
+        self._plan_saving_thread.wait()
 
     def connect_devices(self, uri_1: Optional[str] = None, uri_2: Optional[str] = None,
                         mux_uri: str = None, product_name: Optional[cw.ProductName] = None) -> None:
@@ -1335,7 +1468,11 @@ class EPLabWindow(QMainWindow):
         x, y = (point.x(), point.y()) if point else self.get_default_pin_coordinates()
         pin = Pin(x, y, measurements=[])
         self.measurement_plan.append_pin(pin)
+        self._plan_revision.increase()
         index = self.measurement_plan.get_current_index()
+        self._difference_cache.insert_pin(index)
+        self._measured_pins_checker.insert_pin(index)
+        self._mux_and_plan_window.measurement_plan_widget.add_pin(index, pin)
         self._board_window.add_pin_to_board_image(pin.x, pin.y, index)
         self._comment_widget.add_comment(index, pin)
 
@@ -1365,7 +1502,7 @@ class EPLabWindow(QMainWindow):
             is_user_defined_path = True
 
         if dir_path:
-            show_report_generation_window(self, self._report_generation_thread, self.measurement_plan, dir_path,
+            show_report_generation_window(self._report_generation_window, self.measurement_plan, dir_path,
                                           self.tolerance, self.work_mode)
             if is_user_defined_path:
                 self.dir_chosen_by_user = dir_path
@@ -1432,11 +1569,20 @@ class EPLabWindow(QMainWindow):
         """
 
         if 0 <= measurer_id < len(self._msystem.measurers):
-            if state:
-                self._msystem.measurers[measurer_id].freeze()
-            else:
-                self._msystem.measurers[measurer_id].unfreeze()
-                self._skip_curve = True
+            with self._measurement_thread.device_lock:
+                if state:
+                    self._msystem.measurers[measurer_id].freeze()
+                else:
+                    self._msystem.measurers[measurer_id].unfreeze()
+                    self._measurement_thread.invalidate_frames()
+
+    def get_cached_differences(self) -> Dict[int, float]:
+        """
+        :return: dictionary with differences between reference and test signatures that have already been calculated
+        or checked against the current signatures of pins.
+        """
+
+        return self._difference_cache.get_cached_differences()
 
     def get_default_pin_coordinates(self) -> Tuple[float, float]:
         """
@@ -1466,13 +1612,24 @@ class EPLabWindow(QMainWindow):
             return getattr(self._msystem.multiplexers[0], "_url")
         return None
 
+    def get_pin_hash(self, index: int, pin: Optional[Pin]) -> Optional[str]:
+        """
+        :param index: pin index;
+        :param pin: pin.
+        :return: hash of the reference and test measurements of the pin or None if the pin does not have them.
+        """
+
+        return self._difference_cache.get_pin_hash(index, pin)
+
     def get_settings(self) -> Settings:
         """
         :return: current applied settings in different objects.
         """
 
+        with self._measurement_thread.device_lock:
+            measurement_settings = self._msystem.get_settings()
         settings = Settings()
-        settings.set_measurement_settings(self._msystem.get_settings())
+        settings.set_measurement_settings(measurement_settings)
         if self.testing_mode_action.isChecked():
             settings.work_mode = WorkMode.TEST
         elif self.writing_mode_action.isChecked():
@@ -1603,6 +1760,15 @@ class EPLabWindow(QMainWindow):
             self._disconnect_devices()
             self._delete_measurement_plan()
 
+    @pyqtSlot()
+    def handle_device_error_in_measurement_thread(self) -> None:
+        """
+        Slot processes the signal that an error occurred with the devices in the measurement thread. The error will be
+        handled in the next periodic task.
+        """
+
+        self._device_errors_handler.all_ok = False
+
     @pyqtSlot(bool)
     def handle_measurement_plan_change(self, there_are_measured_pins: bool) -> None:
         """
@@ -1616,6 +1782,62 @@ class EPLabWindow(QMainWindow):
         if self.comparing_mode_action.isEnabled():
             self.testing_mode_action.setEnabled(bool(self._msystem and there_are_measured_pins))
 
+    @pyqtSlot(int, str)
+    def handle_plan_saving_failure(self, task_id: int, error: str) -> None:
+        """
+        Slot processes the signal that the measurement plan could not be saved.
+        :param task_id: ID of the saving task;
+        :param error: error message.
+        """
+
+        self._plan_saving_tasks.pop(task_id, None)
+        self.statusBar().clearMessage()
+        ut.show_message(qApp.translate("t", "Ошибка"),
+                        qApp.translate("t", "Не удалось сохранить план тестирования."), detailed_text=error)
+        self.plan_saving_done.emit(task_id, False)
+
+    @pyqtSlot(int, str)
+    def handle_plan_saving_finish(self, task_id: int, path: str) -> None:
+        """
+        Slot processes the signal that the measurement plan has been saved.
+        :param task_id: ID of the saving task;
+        :param path: path to the saved file.
+        """
+
+        plan, revision = self._plan_saving_tasks.pop(task_id, (None, None))
+        if plan is not None and plan is self._measurement_plan:
+            self._measurement_plan_path.path = path
+            self._plan_revision.mark_saved(revision)
+            if not self._plan_revision.is_modified:
+                # Differences are written only for the measurements that are in the saved file
+                self._difference_cache.save(path)
+        self.statusBar().showMessage(qApp.translate("t", "План тестирования сохранен в '{}'").format(path),
+                                     EPLabWindow.STATUS_MESSAGE_TIMEOUT_MS)
+        self.plan_saving_done.emit(task_id, True)
+
+    @pyqtSlot(int, int, int)
+    def handle_plan_saving_progress(self, task_id: int, done_steps: int, total_steps: int) -> None:
+        """
+        Slot shows the progress of saving the measurement plan.
+        :param task_id: ID of the saving task;
+        :param done_steps: number of completed steps;
+        :param total_steps: total number of steps.
+        """
+
+        if total_steps > 0:
+            self.statusBar().showMessage(qApp.translate("t", "Сохранение плана тестирования... {}%"
+                                                        ).format(100 * done_steps // total_steps))
+
+    @pyqtSlot(int, str)
+    def handle_plan_saving_start(self, task_id: int, path: str) -> None:
+        """
+        Slot processes the signal that the saving of the measurement plan has started.
+        :param task_id: ID of the saving task;
+        :param path: path to the file.
+        """
+
+        self.statusBar().showMessage(qApp.translate("t", "Сохранение плана тестирования в '{}'...").format(path))
+
     @pyqtSlot(bool)
     def handle_pedal_signal(self, pressed: bool) -> None:
         """
@@ -1704,11 +1926,19 @@ class EPLabWindow(QMainWindow):
                                                directory=self._dir_chosen_by_user)[0]
         if filename:
             epfilemanager.add_image_to_ufiv(filename, self._measurement_plan)
+            self._plan_revision.increase()
             self._board_window.update_board()
             self.update_current_pin()
             self._open_board_window_if_needed()
             self.dir_chosen_by_user = filename
 
+    def mark_measurement_plan_changed(self) -> None:
+        """
+        Method should be called by widgets after they change the measurement plan.
+        """
+
+        self._plan_revision.increase()
+
     @pyqtSlot()
     def open_board_image(self) -> None:
         """
@@ -1746,9 +1976,12 @@ class EPLabWindow(QMainWindow):
         if index is None:
             return
 
+        self._plan_revision.increase()
+        self._difference_cache.remove_pin(index)
         self._board_window.remove_pin_from_board_image(index)
         self._comment_widget.remove_comment(index)
         self._measured_pins_checker.remove_pin(index)
+        self._mux_and_plan_window.measurement_plan_widget.remove_pin(index)
         self.update_current_pin()
 
     def resizeEvent(self, event: QResizeEvent) -> None:
@@ -1774,28 +2007,27 @@ class EPLabWindow(QMainWindow):
         super().resizeEvent(event)
 
     @pyqtSlot()
-    def save_board(self) -> Optional[bool]:
+    def save_board(self, wait: bool = False) -> Optional[bool]:
         """
         Slot saves measurement plan to a file.
-        :return: True if measurement plan was saved otherwise False.
+        :param wait: if True, then the slot waits until the file is written.
+        :return: True if measurement plan was saved (or saving has started, if the slot does not wait) otherwise False.
         """
 
         if self._measured_pins_checker.check_measurement_plan_for_empty_pins():
             return None
 
         if not self._measurement_plan_path.path or not os.path.exists(self._measurement_plan_path.path):
-            return self.save_board_as()
+            return self.save_board_as(wait)
 
-        self._last_saved_measurement_plan_data = self._measurement_plan.to_json()
-        self._measurement_plan_path.path = epfilemanager.save_board_to_ufiv(self._measurement_plan_path.path,
-                                                                            self._measurement_plan)
-        return True
+        return self._save_measurement_plan_in_background(self._measurement_plan_path.path, wait)
 
     @pyqtSlot()
-    def save_board_as(self) -> Optional[bool]:
+    def save_board_as(self, wait: bool = False) -> Optional[bool]:
         """
         Slot saves measurement plan to a new file.
-        :return: True if measurement plan was saved otherwise False.
+        :param wait: if True, then the slot waits until the file is written.
+        :return: True if measurement plan was saved (or saving has started, if the slot does not wait) otherwise False.
         """
 
         if self._measured_pins_checker.check_measurement_plan_for_empty_pins():
@@ -1805,10 +2037,8 @@ class EPLabWindow(QMainWindow):
         filename = QFileDialog.getSaveFileName(self, qApp.translate("MainWindow", "Сохранить план тестирования"),
                                                filter="UFIV Archived File (*.uzf)", directory=default_path)[0]
         if filename:
-            self._last_saved_measurement_plan_data = self._measurement_plan.to_json()
-            self._measurement_plan_path.path = epfilemanager.save_board_to_ufiv(filename, self._measurement_plan)
             self.dir_chosen_by_user = filename
-            return True
+            return self._save_measurement_plan_in_background(filename, wait)
         return False
 
     @pyqtSlot()
@@ -1849,10 +2079,12 @@ class EPLabWindow(QMainWindow):
                 self.measurement_plan.save_last_measurement_as_reference(True)
 
         if self._work_mode in (WorkMode.TEST, WorkMode.WRITE):
+            self._plan_revision.increase()
             index = self.measurement_plan.get_current_index()
+            self._difference_cache.record_pin(index, self.measurement_plan.get_current_pin())
             self.update_current_pin(pin_centering)
-            self._comment_widget.save_comment(index)
             self._comment_widget.update_table_for_new_tolerance(index)
+            self._board_window.update_pin_colors()
             if self.measurement_plan and self.measurement_plan.multiplexer:
                 self._mux_and_plan_window.measurement_plan_widget.save_measurement(index)
 
@@ -1876,7 +2108,8 @@ class EPLabWindow(QMainWindow):
         with self._device_errors_handler:
             max_voltage = self._auto_settings.max_optimal_voltage
             searcher = Searcher(self._msystem.measurers[0], self._product.get_parameters(), max_voltage, True)
-            optimal_settings = searcher.search_optimal_settings()
+            with self._measurement_thread.device_lock:
+                optimal_settings = searcher.search_optimal_settings()
             self._set_msystem_settings(optimal_settings)
             options = self._product.settings_to_options(optimal_settings)
             self._set_options_to_ui(options)
@@ -1906,7 +2139,8 @@ class EPLabWindow(QMainWindow):
         """
 
         self.setFocus()
-        settings = self._msystem.get_settings()
+        with self._measurement_thread.device_lock:
+            settings = self._msystem.get_settings()
         old_settings = copy.deepcopy(settings)
         options = self._get_options_from_ui()
         settings = self._product.options_to_settings(options, settings)
@@ -1960,7 +2194,7 @@ class EPLabWindow(QMainWindow):
 
         for measurer in self._msystem.measurers:
             if measurer == selected_measurer:
-                show_measurer_settings_window(self, measurer, device_name)
+                show_measurer_settings_window(self, measurer, device_name, self._measurement_thread.device_lock)
                 return
 
     @pyqtSlot()
@@ -0,0 +1,476 @@
+"""
+File with functions to load measurement plans lazily. The skeleton of the plan (pins, coordinates, comments,
+multiplexer outputs and measurement settings) is parsed at once, and arrays of signatures are decoded only when they
+are needed.
+"""
+
+import io
+import json
+import logging
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from PIL import Image
+import epcore.filemanager as epfilemanager
+from epcore.elements import Board, IVCurve
+from .signaturesidecar import SignatureSidecar
+
+
+logger = logging.getLogger("eplab")
+CURVE_ARRAY_PATTERN = re.compile(rb'"(currents|voltages)"\s*:\s*\[[^\]]*\]')
+LOCAL_FILE_HEADER: struct.Struct = struct.Struct("<4s5H3I2H")
+LOCAL_FILE_HEADER_SIGNATURE: bytes = b"PK\x03\x04"
+
+
+def _create_iv_curve(currents: List[float], voltages: List[float]) -> IVCurve:
+    """
+    :param currents: currents of signature;
+    :param voltages: voltages of signature.
+    :return: ordinary signature with given values.
+    """
+
+    return IVCurve(currents=currents, voltages=voltages)
+
+
+class CurveDecoder:
+    """
+    Class decodes arrays of signatures from the measurement plan file on demand. Only a limited number of decoded
+    signatures stay in memory, the least recently used ones are dropped.
+    """
+
+    MAX_DECODED_CURVES: int = 256
+
+    def __init__(self, decode_array: Callable[[int], List[float]], max_decoded_curves: int = MAX_DECODED_CURVES
+                 ) -> None:
+        """
+        :param decode_array: function that decodes the array of values with the given index;
+        :param max_decoded_curves: maximum number of decoded signatures kept in memory.
+        """
+
+        self._decode_array: Callable[[int], List[float]] = decode_array
+        self._decoded: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._max_decoded_curves: int = max(1, max_decoded_curves)
+
+    @property
+    def decoded_number(self) -> int:
+        """
+        :return: number of decoded signatures kept in memory.
+        """
+
+        return len(self._decoded)
+
+    def get_curve(self, currents_index: int, voltages_index: int) -> Tuple[List[float], List[float]]:
+        """
+        :param currents_index: index of the array with currents;
+        :param voltages_index: index of the array with voltages.
+        :return: currents and voltages of signature.
+        """
+
+        key = currents_index, voltages_index
+        with self._lock:
+            values = self._decoded.get(key)
+            if values is not None:
+                self._decoded.move_to_end(key)
+                return values
+
+        values = tuple(self._decode_array(index) for index in key)
+        with self._lock:
+            self._decoded[key] = values
+            self._decoded.move_to_end(key)
+            while len(self._decoded) > self._max_decoded_curves:
+                self._decoded.popitem(last=False)
+        return values
+
+
+class CompressedText:
+    """
+    Class keeps the text of the measurement plan compressed in memory and reads parts of the text by their byte
+    offsets. The text is divided into blocks, and for each block the state of the decompressor at its beginning is
+    stored, so only the blocks with the required part are decompressed. For an archive the compressed data of the
+    archive member is used as is, so the text is neither compressed again nor written anywhere.
+    """
+
+    BLOCK_SIZE: int = 1 << 20
+    CHUNK_SIZE: int = 1 << 16
+    MAX_CACHED_BLOCKS: int = 4
+
+    def __init__(self, starts: List[int], blocks: List[Tuple[Any, bytes]], max_cached_blocks: int = MAX_CACHED_BLOCKS
+                 ) -> None:
+        """
+        :param starts: offsets of the beginnings of the blocks in the text;
+        :param blocks: decompressor at the beginning of each block and compressed data of the block;
+        :param max_cached_blocks: maximum number of decompressed blocks kept in memory.
+        """
+
+        self._blocks: List[Tuple[Any, bytes]] = blocks
+        self._cache: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._max_cached_blocks: int = max(1, max_cached_blocks)
+        self._starts: List[int] = starts
+
+    @classmethod
+    def from_deflated(cls, data: bytes, crc: int) -> Tuple["CompressedText", bytes]:
+        """
+        Method decompresses the deflated data of the archive member and stores the states of the decompressor.
+        :param data: deflated data;
+        :param crc: CRC-32 of the decompressed text.
+        :return: compressed text and decompressed text.
+        """
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        starts = [0]
+        blocks = []
+        block_decompressor = decompressor.copy()
+        block_position = 0
+        parts = []
+        size = 0
+        for position in range(0, len(data), cls.CHUNK_SIZE):
+            parts.append(decompressor.decompress(data[position:position + cls.CHUNK_SIZE]))
+            size += len(parts[-1])
+            if size - starts[-1] >= cls.BLOCK_SIZE:
+                blocks.append((block_decompressor, data[block_position:position + cls.CHUNK_SIZE]))
+                starts.append(size)
+                block_decompressor = decompressor.copy()
+                block_position = position + cls.CHUNK_SIZE
+        parts.append(decompressor.flush())
+        blocks.append((block_decompressor, data[block_position:]))
+        text = b"".join(parts)
+        if not decompressor.eof or zlib.crc32(text) != crc:
+            raise ValueError("Compressed measurement plan is broken")
+        return cls(starts, blocks), text
+
+    @classmethod
+    def from_text(cls, text: bytes) -> "CompressedText":
+        """
+        Method compresses each block of the text separately.
+        :param text: text.
+        :return: compressed text.
+        """
+
+        starts = list(range(0, max(len(text), 1), cls.BLOCK_SIZE))
+        blocks = []
+        for start in starts:
+            compressor = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+            data = compressor.compress(text[start:start + cls.BLOCK_SIZE]) + compressor.flush()
+            blocks.append((zlib.decompressobj(-zlib.MAX_WBITS), data))
+        return cls(starts, blocks)
+
+    def _get_block(self, index: int) -> bytes:
+        """
+        :param index: index of the block.
+        :return: decompressed block.
+        """
+
+        with self._lock:
+            block = self._cache.get(index)
+            if block is not None:
+                self._cache.move_to_end(index)
+                return block
+
+        decompressor, data = self._blocks[index]
+        block = decompressor.copy().decompress(data)
+        with self._lock:
+            self._cache[index] = block
+            while len(self._cache) > self._max_cached_blocks:
+                self._cache.popitem(last=False)
+        return block
+
+    def read(self, start: int, end: int) -> bytes:
+        """
+        :param start: offset of the beginning of the part of the text;
+        :param end: offset of the end of the part of the text.
+        :return: part of the text.
+        """
+
+        index = bisect_right(self._starts, start) - 1
+        parts = []
+        while index < len(self._starts) and self._starts[index] < end:
+            block_start = self._starts[index]
+            parts.append(self._get_block(index)[max(start - block_start, 0):end - block_start])
+            index += 1
+        return b"".join(parts)
+
+
+class JsonArrayReader:
+    """
+    Class decodes JSON arrays with values from the compressed text of the measurement plan by their byte offsets. The
+    measurement plan file is not used after loading, so it can be replaced when the plan is saved.
+    """
+
+    def __init__(self, text: CompressedText, starts: array, ends: array) -> None:
+        """
+        :param text: compressed text of the measurement plan file;
+        :param starts: byte offsets of the beginnings of the arrays;
+        :param ends: byte offsets of the ends of the arrays.
+        """
+
+        self._ends: array = ends
+        self._starts: array = starts
+        self._text: CompressedText = text
+
+    def read_array(self, index: int) -> List[float]:
+        """
+        :param index: index of the array.
+        :return: decoded array.
+        """
+
+        return json.loads(self._text.read(self._starts[index], self._ends[index]))
+
+
+class LazyIVCurve(IVCurve):
+    """
+    Class for signature whose values are decoded from the measurement plan file at the first access. After values are
+    assigned, the signature keeps them itself. Copies of the signature are ordinary signatures.
+    """
+
+    def __init__(self, decoder: CurveDecoder, currents_index: int, voltages_index: int) -> None:
+        """
+        :param decoder: decoder of signatures from the measurement plan file;
+        :param currents_index: index of the array with currents;
+        :param voltages_index: index of the array with voltages.
+        """
+
+        # The constructor of the base class assigns empty values through the properties, so the decoder is set after it
+        self._decoder: Optional[CurveDecoder] = None
+        self._values: Optional[Tuple[List[float], List[float]]] = [], []
+        super().__init__()
+        self._decoder = decoder
+        self._indexes: Tuple[int, int] = currents_index, voltages_index
+        self._values = None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, IVCurve):
+            return NotImplemented
+        return self.currents == other.currents and self.voltages == other.voltages
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return _create_iv_curve, (list(self.currents), list(self.voltages))
+
+    def __repr__(self) -> str:
+        return f"LazyIVCurve(decoded={self.is_decoded})"
+
+    @property
+    def currents(self) -> List[float]:
+        """
+        :return: currents of signature.
+        """
+
+        return self._get_values()[0]
+
+    @currents.setter
+    def currents(self, currents: List[float]) -> None:
+        """
+        :param currents: new currents of signature.
+        """
+
+        self._values = currents, self._get_values()[1]
+        self._decoder = None
+
+    @property
+    def is_decoded(self) -> bool:
+        """
+        :return: True if the signature keeps its values itself.
+        """
+
+        return self._decoder is None
+
+    @property
+    def voltages(self) -> List[float]:
+        """
+        :return: voltages of signature.
+        """
+
+        return self._get_values()[1]
+
+    @voltages.setter
+    def voltages(self, voltages: List[float]) -> None:
+        """
+        :param voltages: new voltages of signature.
+        """
+
+        self._values = self._get_values()[0], voltages
+        self._decoder = None
+
+    def _get_values(self) -> Tuple[List[float], List[float]]:
+        """
+        :return: currents and voltages of signature.
+        """
+
+        if self._decoder is None:
+            return self._values
+        return self._decoder.get_curve(*self._indexes)
+
+
+def _create_skeleton(data: bytes) -> Tuple[Dict[str, Any], array, array]:
+    """
+    Function replaces arrays of currents and voltages in the text of the measurement plan with indexes of these arrays
+    and parses the rest of the text.
+    :param data: text of the measurement plan file.
+    :return: parsed measurement plan without arrays of signatures and byte offsets of beginnings and ends of the
+    arrays in the text.
+    """
+
+    starts = array("Q")
+    ends = array("Q")
+    parts = []
+    position = 0
+    for match in CURVE_ARRAY_PATTERN.finditer(data):
+        start = data.index(b"[", match.start())
+        parts.append(data[position:start])
+        parts.append(str(len(starts)).encode())
+        starts.append(start)
+        ends.append(match.end())
+        position = match.end()
+    parts.append(data[position:])
+    return json.loads(b"".join(parts)), starts, ends
+
+
+def _create_lazy_board(skeleton: Dict[str, Any], arrays_number: int, decoder: CurveDecoder) -> Board:
+    """
+    Function creates the measurement plan from the skeleton in memory. Indexes of arrays of currents and voltages in
+    the skeleton are replaced with empty arrays, and then signatures of the created plan are replaced with lazy ones.
+    :param skeleton: measurement plan in which arrays of currents and voltages are replaced with their indexes;
+    :param arrays_number: number of arrays of values that the decoder can decode;
+    :param decoder: decoder of signatures.
+    :return: measurement plan with signatures that are decoded on demand.
+    """
+
+    if "version" not in skeleton:
+        raise ValueError("Version of file format is unknown")
+
+    curves = []
+    for element in skeleton["elements"]:
+        for pin in element["pins"]:
+            for curve in pin.get("iv_curves", []):
+                indexes = curve["currents"], curve["voltages"]
+                if not all(isinstance(index, int) for index in indexes):
+                    raise ValueError("Arrays of signature are not found")
+                curve["currents"], curve["voltages"] = [], []
+                curves.append(indexes)
+    if sorted(index for indexes in curves for index in indexes) != list(range(arrays_number)):
+        raise ValueError("Unexpected arrays of signatures")
+
+    board = Board.create_from_json(skeleton)
+    curves = iter(curves)
+    for element in board.elements:
+        for pin in element.pins:
+            for measurement in pin.measurements:
+                measurement.ivc = LazyIVCurve(decoder, *next(curves))
+    return board
+
+
+def _get_archive_members(archive: zipfile.ZipFile) -> Tuple[zipfile.ZipInfo, Optional[str]]:
+    """
+    :param archive: archive with the measurement plan.
+    :return: information about the JSON file with the measurement plan and name of the image file.
+    """
+
+    json_infos = [info for info in archive.infolist() if info.filename.lower().endswith(".json")]
+    image_names = [name for name in archive.namelist() if not name.lower().endswith(".json")]
+    if len(json_infos) != 1 or len(image_names) > 1:
+        raise ValueError("Unexpected content of the archive")
+    return json_infos[0], image_names[0] if image_names else None
+
+
+def _read_image(archive: zipfile.ZipFile, image_name: Optional[str]) -> Optional[Image.Image]:
+    """
+    :param archive: archive with the measurement plan;
+    :param image_name: name of the image file in the archive.
+    :return: image of the board.
+    """
+
+    return Image.open(io.BytesIO(archive.read(image_name))) if image_name else None
+
+
+def _read_raw_member(path: str, info: zipfile.ZipInfo) -> bytes:
+    """
+    :param path: path to the archive;
+    :param info: information about the archive member.
+    :return: compressed data of the archive member.
+    """
+
+    with open(path, "rb") as file:
+        file.seek(info.header_offset)
+        header = LOCAL_FILE_HEADER.unpack(file.read(LOCAL_FILE_HEADER.size))
+        if header[0] != LOCAL_FILE_HEADER_SIGNATURE:
+            raise ValueError("Archive member is broken")
+        file.seek(header[-2] + header[-1], io.SEEK_CUR)
+        data = file.read(info.compress_size)
+    if len(data) != info.compress_size:
+        raise ValueError("Archive member is broken")
+    return data
+
+
+def _read_ufiv(path: str, read_data: bool = True) -> Tuple[Optional[bytes], Optional[CompressedText],
+                                                           Optional[Image.Image]]:
+    """
+    Function reads the measurement plan file. The image of the board is taken explicitly from the archive, a JSON
+    file does not contain an image.
+    :param path: path to the measurement plan file;
+    :param read_data: if False, only the image of the board is read.
+    :return: text of the JSON file with the measurement plan, compressed text and image of the board.
+    """
+
+    if not zipfile.is_zipfile(path):
+        if not read_data:
+            return None, None, None
+        with open(path, "rb") as file:
+            data = file.read()
+        return data, CompressedText.from_text(data), None
+
+    with zipfile.ZipFile(path) as archive:
+        json_info, image_name = _get_archive_members(archive)
+        data, text = None, None
+        if read_data:
+            if json_info.flag_bits & 0x1:
+                raise ValueError("Archive is encrypted")
+            if json_info.compress_type == zipfile.ZIP_DEFLATED:
+                text, data = CompressedText.from_deflated(_read_raw_member(path, json_info), json_info.CRC)
+            else:
+                data = archive.read(json_info)
+                text = CompressedText.from_text(data)
+        return data, text, _read_image(archive, image_name)
+
+
+def load_board_lazily(path: str, max_decoded_curves: int = CurveDecoder.MAX_DECODED_CURVES) -> Board:
+    """
+    Function loads the measurement plan without decoding arrays of signatures. The signatures are decoded on demand.
+    If there is an up-to-date file with signatures in binary format next to the measurement plan file, the signatures
+    are read from it. If the file has a format that cannot be loaded lazily (for example, P10 format) or the file is
+    invalid, then the measurement plan is loaded by epcore, which reports the error.
+    :param path: path to the measurement plan file;
+    :param max_decoded_curves: maximum number of decoded signatures kept in memory.
+    :return: measurement plan.
+    """
+
+    sidecar = SignatureSidecar.open(path)
+    if sidecar is not None:
+        try:
+            board = _create_lazy_board(sidecar.skeleton, sidecar.arrays_number,
+                                       CurveDecoder(sidecar.get_array, max_decoded_curves))
+            board.image = _read_ufiv(path, False)[2]
+            return board
+        except Exception:
+            logger.warning("Failed to load measurement plan '%s' with binary signatures", path)
+
+    try:
+        data, text, image = _read_ufiv(path)
+        skeleton, starts, ends = _create_skeleton(data)
+        del data
+        board = _create_lazy_board(skeleton, len(starts),
+                                   CurveDecoder(JsonArrayReader(text, starts, ends).read_array, max_decoded_curves))
+    except Exception:
+        logger.info("Measurement plan '%s' cannot be loaded lazily, it will be loaded completely", path)
+        return epfilemanager.load_board_from_ufiv(path, auto_convert_p10=True)
+
+    board.image = image
+    return board
@@ -1,8 +1,9 @@
-from typing import List, Optional, Set, Tuple
+from typing import List, Optional, Tuple
 from PyQt5.QtCore import pyqtSignal, QCoreApplication as qApp, QObject
 from epcore.elements import Pin
 from epcore.measurementmanager import MeasurementPlan
 from . import utils as ut
+from .pinstateindex import PinStateIndex
 
 
 class MeasuredPinsChecker(QObject):
@@ -18,9 +19,8 @@ class MeasuredPinsChecker(QObject):
         """
 
         super().__init__()
-        self._empty_pins: Set[int] = set()
         self._main_window = main_window
-        self._measured_pins: Set[int] = set()
+        self._pin_states: PinStateIndex = PinStateIndex()
 
     @property
     def is_measured_pin(self) -> bool:
@@ -28,7 +28,7 @@ class MeasuredPinsChecker(QObject):
         :return: True, if the measurement plan contains a pin with a measured reference signature.
         """
 
-        return len(self._measured_pins) != 0
+        return self._pin_states.true_number != 0
 
     @property
     def measurement_plan(self) -> Optional[MeasurementPlan]:
@@ -58,34 +58,28 @@ class MeasuredPinsChecker(QObject):
         """
 
         if pin_index is None and self.measurement_plan.pins_number == 0:
-            self._empty_pins.clear()
-            self._measured_pins.clear()
+            self._pin_states.clear()
             return
 
-        pin = self.measurement_plan.get_pin_with_index(pin_index)
+        pin = None if pin_index is None or pin_index < 0 else self.measurement_plan.get_pin_with_index(pin_index)
         if pin is None:
-            self._empty_pins.discard(pin_index)
-            self._measured_pins.discard(pin_index)
-        elif self._check_pin(pin):
-            self._empty_pins.discard(pin_index)
-            self._measured_pins.add(pin_index)
-        else:
-            self._empty_pins.add(pin_index)
-            self._measured_pins.discard(pin_index)
+            return
+
+        if pin_index < len(self._pin_states):
+            self._pin_states.set(pin_index, self._check_pin(pin))
+        elif pin_index == len(self._pin_states):
+            self._pin_states.insert(pin_index, self._check_pin(pin))
 
     def _set_new_plan(self) -> None:
         """
         Method checks a new measurement plan for the presence of pins with measured reference signatures.
         """
 
-        self._empty_pins.clear()
-        self._measured_pins.clear()
         if self.measurement_plan:
-            for index, pin in self.measurement_plan.all_pins_iterator():
-                if self._check_pin(pin):
-                    self._measured_pins.add(index)
-                else:
-                    self._empty_pins.add(index)
+            self._pin_states = PinStateIndex(self._check_pin(pin) for _, pin in
+                                             self.measurement_plan.all_pins_iterator())
+        else:
+            self._pin_states = PinStateIndex()
 
     def check_empty_current_pin(self) -> bool:
         """
@@ -107,18 +101,17 @@ class MeasuredPinsChecker(QObject):
         :return: True if there are pins without reference signatures in measurement plan.
         """
 
-        if len(self._empty_pins) > 0:
+        if self._pin_states.false_number > 0:
             empty = True
-            empty_pins = list(self._empty_pins)
-            if len(empty_pins) > 1:
-                borders = get_borders(sorted(empty_pins))
+            borders = list(self._pin_states.get_ranges(False))
+            if self._pin_states.false_number > 1:
                 borders_text = get_borders_as_text(borders)
                 text = qApp.translate("t", "Точки {} не содержат сохраненных измерений. Для сохранения плана "
                                            "тестирования все точки должны содержать измерения.").format(borders_text)
             else:
                 text = qApp.translate("t", "Точка {} не содержит сохраненных измерений. Для сохранения плана "
                                            "тестирования все точки должны содержать измерения."
-                                      ).format(empty_pins[0] + 1)
+                                      ).format(borders[0][0] + 1)
             ut.show_message(qApp.translate("t", "Ошибка"), text)
         else:
             empty = False
@@ -131,16 +124,34 @@ class MeasuredPinsChecker(QObject):
 
         if self.measurement_plan:
             self._check_pin_with_index(pin_index)
-        measured = len(self._measured_pins) != 0
-        self.measured_pin_in_plan_signal.emit(measured)
+        self.measured_pin_in_plan_signal.emit(self.is_measured_pin)
+
+    def insert_pin(self, pin_index: int) -> None:
+        """
+        Method shifts indexes of the following pins. Only the new pin and its neighbour are checked again, because
+        callbacks of the measurement plan may have already changed them.
+        :param pin_index: index of the pin that has been inserted into the measurement plan.
+        """
+
+        if self.measurement_plan:
+            if len(self._pin_states) < self.measurement_plan.pins_number:
+                self._pin_states.insert(pin_index, False)
+            for index in (pin_index, pin_index + 1):
+                self._check_pin_with_index(index)
+
+        self.handle_measurement_plan_change(pin_index)
 
     def remove_pin(self, pin_index: int) -> None:
         """
+        Method shifts indexes of the following pins. Only the neighbours of the removed pin are checked again, because
+        callbacks of the measurement plan may have already changed them.
         :param pin_index: pin index that has been removed from the measurement plan.
         """
 
         if self.measurement_plan:
-            for index in range(pin_index, self.measurement_plan.pins_number + 1):
+            if len(self._pin_states) > self.measurement_plan.pins_number:
+                self._pin_states.remove(pin_index)
+            for index in (pin_index - 1, pin_index):
                 self._check_pin_with_index(index)
 
         self.handle_measurement_plan_change(pin_index)
@@ -165,18 +176,12 @@ def get_borders(array: List[int]) -> List[Tuple[int, int]]:
     :return: borders.
     """
 
-    def get_segment(array_: List[int], shift: int) -> Tuple[int, int]:
-        i = 0
-        while i + 1 < len(array_) and array_[i] + 1 == array_[i + 1]:
-            i += 1
-        return shift, i + shift
-
     borders = []
-    i_left = 0
-    while i_left < len(array):
-        i_left, i_right = get_segment(array[i_left:], i_left)
-        borders.append((array[i_left], array[i_right]))
-        i_left = i_right + 1
+    for value in array:
+        if borders and borders[-1][1] + 1 == value:
+            borders[-1] = borders[-1][0], value
+        else:
+            borders.append((value, value))
     return borders
 
 
@@ -0,0 +1,293 @@
+"""
+File with class for thread that performs measurements with IV-measurers of the measurement system.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from typing import Optional
+from PyQt5.QtCore import pyqtSignal, QThread
+from epcore.elements import MeasurementSettings
+from epcore.measurementmanager import MeasurementSystem
+from .common import DeviceErrorsHandler
+
+
+logger = logging.getLogger("eplab")
+MeasurementFrame = namedtuple("MeasurementFrame", ["curves", "settings", "sequence_number", "settings_generation"])
+
+
+class FpsCounter:
+    """
+    Class counts the number of frames per second and periodically writes it to the log.
+    """
+
+    LOG_INTERVAL: float = 10
+
+    def __init__(self, name: str) -> None:
+        """
+        :param name: name of the counter to be written to the log.
+        """
+
+        self._fps: float = 0
+        self._frames_number: int = 0
+        self._name: str = name
+        self._start_time: float = time.monotonic()
+
+    @property
+    def fps(self) -> float:
+        """
+        :return: number of frames per second in the last full interval.
+        """
+
+        return self._fps
+
+    def add_frame(self) -> None:
+        """
+        Method registers a new frame.
+        """
+
+        self._frames_number += 1
+        elapsed_time = time.monotonic() - self._start_time
+        if elapsed_time >= FpsCounter.LOG_INTERVAL:
+            self._fps = self._frames_number / elapsed_time
+            logger.info("%s: %.1f fps", self._name, self._fps)
+            self.reset()
+
+    def reset(self) -> None:
+        """
+        Method starts a new interval of counting.
+        """
+
+        self._frames_number = 0
+        self._start_time = time.monotonic()
+
+
+class MeasurementThread(QThread):
+    """
+    Class for thread that owns the measurement system while devices are connected. The thread waits for measurements
+    to be ready, copies the signatures of all IV-measurers into a frame and puts the frame into a bounded queue. The
+    main window takes frames from the queue at display rate. Any other access to the IV-measurers from the GUI thread
+    must be done under the device lock.
+
+    Each frame is tagged with a sequence number and with the settings generation that was current when the measurement
+    was triggered. The generation is increased every time the measurement settings change (or the signatures of
+    frozen IV-measurers are unfrozen), so frames measured with old settings are discarded exactly.
+
+    In pipelined mode the next measurement is triggered as soon as the signatures are copied, so that the devices
+    measure while the main window processes the previous frame. In sequential mode the next measurement is triggered
+    only after the main window reports that the frame has been processed.
+    """
+
+    FRAMES_QUEUE_SIZE: int = 4
+    IDLE_TIMEOUT: float = 0.002
+    device_error_signal: pyqtSignal = pyqtSignal()
+
+    def __init__(self, measurement_system: MeasurementSystem, parent=None, pipelined: bool = True) -> None:
+        """
+        :param measurement_system: measurement system whose IV-measurers will be used by the thread;
+        :param parent: parent object;
+        :param pipelined: if True, then the next measurement is triggered without waiting for the frame processing.
+        """
+
+        super().__init__(parent=parent)
+        self._device_errors_handler: DeviceErrorsHandler = DeviceErrorsHandler()
+        self._fps_counter: FpsCounter = FpsCounter("Measurement rate")
+        self._frame_processed: threading.Event = threading.Event()
+        self._frames: queue.Queue = queue.Queue(maxsize=MeasurementThread.FRAMES_QUEUE_SIZE)
+        self._lock: threading.RLock = threading.RLock()
+        self._msystem: MeasurementSystem = measurement_system
+        self._pipelined: bool = pipelined
+        self._sequence_number: int = 0
+        self._settings_generation: int = 0
+        self._stop_thread: bool = False
+        self._trigger_generation: int = 0  # settings generation at the moment of the last trigger
+        self._trigger_pending: bool = False
+
+    @property
+    def device_lock(self) -> threading.RLock:
+        """
+        :return: lock that must be held while working with IV-measurers outside the thread.
+        """
+
+        return self._lock
+
+    @property
+    def fps(self) -> float:
+        """
+        :return: number of measured frames per second.
+        """
+
+        return self._fps_counter.fps
+
+    @property
+    def pipelined(self) -> bool:
+        """
+        :return: True if the thread works in pipelined mode.
+        """
+
+        return self._pipelined
+
+    @property
+    def settings_generation(self) -> int:
+        """
+        :return: current settings generation.
+        """
+
+        return self._settings_generation
+
+    def _put_frame(self, frame: MeasurementFrame) -> None:
+        """
+        Method puts a new frame into the queue. If the queue is full, the oldest frame is dropped, because the main
+        window needs only the latest signatures.
+        :param frame: new frame.
+        """
+
+        while True:
+            try:
+                self._frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _read_frame(self) -> Optional[MeasurementFrame]:
+        """
+        :return: new frame with measured signatures or None if measurements are not ready yet.
+        """
+
+        with self._lock:
+            if not self._msystem.measurements_are_ready():
+                return None
+
+            if self._trigger_generation != self._settings_generation:
+                # The measurement was triggered before the settings were changed
+                self._trigger_measurements()
+                return None
+
+            curves = [measurer.get_last_cached_iv_curve() for measurer in self._msystem.measurers]
+            settings = self._msystem.get_settings()
+            self._sequence_number += 1
+            frame = MeasurementFrame(curves, settings, self._sequence_number, self._trigger_generation)
+            self._frame_processed.clear()
+            self._put_frame(frame)
+            if self._pipelined:
+                self._trigger_measurements()
+            else:
+                self._trigger_pending = True
+            self._fps_counter.add_frame()
+            return frame
+
+    def _trigger_after_frame_processing(self) -> bool:
+        """
+        Method triggers the next measurement in sequential mode when the main window has processed the last frame.
+        :return: True if the measurement was triggered.
+        """
+
+        if not self._frame_processed.wait(MeasurementThread.IDLE_TIMEOUT):
+            return False
+
+        with self._lock:
+            self._trigger_pending = False
+            self._trigger_measurements()
+        return True
+
+    def _trigger_measurements(self) -> None:
+        """
+        Method triggers the next measurement and remembers the current settings generation for it.
+        """
+
+        self._trigger_generation = self._settings_generation
+        self._msystem.trigger_measurements()
+
+    def clear_frames(self) -> None:
+        """
+        Method removes all frames from the queue. Removed frames are considered processed.
+        """
+
+        self._frame_processed.set()
+        while True:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                return
+
+    def frame_processed(self) -> None:
+        """
+        Method should be called by the consumer when the processing of the frame is finished.
+        """
+
+        self._frame_processed.set()
+
+    def get_last_frame(self) -> Optional[MeasurementFrame]:
+        """
+        Method takes all frames from the queue and returns the latest one.
+        :return: latest frame or None if there are no new frames.
+        """
+
+        frame = None
+        while True:
+            try:
+                frame = self._frames.get_nowait()
+            except queue.Empty:
+                return frame
+
+    def invalidate_frames(self) -> int:
+        """
+        Method starts a new settings generation. All frames measured before this moment become stale.
+        :return: new settings generation.
+        """
+
+        with self._lock:
+            self._settings_generation += 1
+            self.clear_frames()
+            return self._settings_generation
+
+    def run(self) -> None:
+        while not self._stop_thread:
+            frame = None
+            waiting_for_consumer = self._trigger_pending
+            with self._device_errors_handler:
+                if waiting_for_consumer:
+                    self._trigger_after_frame_processing()
+                else:
+                    frame = self._read_frame()
+
+            if not self._device_errors_handler.all_ok:
+                logger.error("Measurement thread stopped due to device error")
+                self.device_error_signal.emit()
+                break
+
+            if frame is None and not waiting_for_consumer:
+                time.sleep(MeasurementThread.IDLE_TIMEOUT)
+
+    def set_pipelined(self, pipelined: bool) -> None:
+        """
+        :param pipelined: if True, then the next measurement is triggered without waiting for the frame processing.
+        """
+
+        with self._lock:
+            self._pipelined = pipelined
+            self._fps_counter.reset()
+        self._frame_processed.set()
+
+    def set_settings(self, settings: MeasurementSettings) -> int:
+        """
+        Method sets new measurement settings. Frames that were measured with old settings are removed from the queue.
+        :param settings: new measurement settings.
+        :return: settings generation of frames with new settings.
+        """
+
+        with self._lock:
+            self._msystem.set_settings(settings)
+            return self.invalidate_frames()
+
+    def stop_thread(self) -> None:
+        """
+        Method stops the thread.
+        """
+
+        self._stop_thread = True
@@ -0,0 +1,142 @@
+"""
+File with class to cache product options for measurement settings.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from epcore.elements import MeasurementSettings
+from epcore.product import EyePointProduct
+from .breaksignaturessaver import create_filename
+from .language import Language
+
+
+SettingsKey = Tuple[float, float, float, float]
+
+
+def get_settings_key(settings: MeasurementSettings) -> SettingsKey:
+    """
+    :param settings: measurement settings.
+    :return: hashable key for given measurement settings.
+    """
+
+    return (settings.sampling_rate, settings.internal_resistance, settings.max_voltage,
+            settings.probe_signal_frequency)
+
+
+class _OptionsEntry:
+    """
+    Class for cached information about one measurement settings.
+    """
+
+    __slots__ = ("filenames", "labels", "options")
+
+    def __init__(self, options: Dict[EyePointProduct.Parameter, str], labels: Dict[Language, List[str]]) -> None:
+        """
+        :param options: names of options for parameters;
+        :param labels: localized labels of frequency, voltage and sensitivity options for each language.
+        """
+
+        self.filenames: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        self.labels: Dict[Language, List[str]] = labels
+        self.options: Dict[EyePointProduct.Parameter, str] = options
+
+
+class OptionsCache:
+    """
+    Class caches the results of searching the product option tables for measurement settings: names of options,
+    localized labels and names of break signature files. The cache is bounded, the least recently used settings are
+    removed first. The cache must be cleared when the product options change.
+    """
+
+    LABEL_PARAMETERS: Tuple[EyePointProduct.Parameter, ...] = (EyePointProduct.Parameter.frequency,
+                                                               EyePointProduct.Parameter.voltage,
+                                                               EyePointProduct.Parameter.sensitive)
+    MAX_SIZE: int = 256
+
+    def __init__(self, product: EyePointProduct, max_size: int = MAX_SIZE) -> None:
+        """
+        :param product: product;
+        :param max_size: maximum number of measurement settings in the cache.
+        """
+
+        self._entries: OrderedDict = OrderedDict()
+        self._max_size: int = max_size
+        self._product: EyePointProduct = product
+
+    def _create_entry(self, settings: MeasurementSettings) -> _OptionsEntry:
+        """
+        :param settings: measurement settings.
+        :return: information about options for the measurement settings.
+        """
+
+        options = self._product.settings_to_options(settings)
+        available = self._product.get_available_options(settings)
+        labels = {Language.EN: [], Language.RU: []}
+        for parameter in OptionsCache.LABEL_PARAMETERS:
+            for available_option in available[parameter]:
+                if available_option.name == options[parameter]:
+                    labels[Language.EN].append(available_option.label_en)
+                    labels[Language.RU].append(available_option.label_ru)
+        return _OptionsEntry(options, labels)
+
+    def _get_entry(self, settings: MeasurementSettings) -> _OptionsEntry:
+        """
+        :param settings: measurement settings.
+        :return: cached information about options for the measurement settings.
+        """
+
+        key: SettingsKey = get_settings_key(settings)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._create_entry(settings)
+            self._entries[key] = entry
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def clear(self) -> None:
+        """
+        Method clears the cache. The method must be called when the product options change.
+        """
+
+        self._entries.clear()
+
+    def get_break_signature_filename(self, settings: MeasurementSettings, frequency: Optional[str] = None,
+                                     sensitive: Optional[str] = None) -> str:
+        """
+        :param settings: measurement settings;
+        :param frequency: name of the frequency mode for break signatures. If None, then the frequency of the
+        measurement settings is used;
+        :param sensitive: name of the sensitivity mode for break signatures. If None, then the sensitivity of the
+        measurement settings is used.
+        :return: name of break signature file for the measurement settings.
+        """
+
+        entry = self._get_entry(settings)
+        filename = entry.filenames.get((frequency, sensitive))
+        if filename is None:
+            options = entry.options
+            filename = create_filename(options[EyePointProduct.Parameter.frequency] if frequency is None else frequency,
+                                       options[EyePointProduct.Parameter.sensitive] if sensitive is None else sensitive,
+                                       options[EyePointProduct.Parameter.voltage])
+            entry.filenames[(frequency, sensitive)] = filename
+        return filename
+
+    def get_labels(self, settings: MeasurementSettings, lang: Language) -> List[str]:
+        """
+        :param settings: measurement settings;
+        :param lang: language of labels.
+        :return: labels of frequency, voltage and sensitivity options for the measurement settings.
+        """
+
+        return self._get_entry(settings).labels[lang]
+
+    def get_options(self, settings: MeasurementSettings) -> Dict[EyePointProduct.Parameter, str]:
+        """
+        :param settings: measurement settings.
+        :return: names of options for parameters. The dictionary must not be changed.
+        """
+
+        return self._get_entry(settings).options
@@ -0,0 +1,298 @@
+"""
+File with class to draw pins of the board as clusters when the board is zoomed out.
+"""
+
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPen
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+from .pinspatialindex import PinSpatialIndex
+
+
+Cell = Tuple[int, int]
+
+
+class PinClusterItem(QGraphicsItem):
+    """
+    Class for graphics item that draws pins as clusters. Pins are grouped by cells of a grid whose size is chosen by
+    the current zoom, so that each cell takes about the same number of pixels on the screen. Each cluster is drawn as
+    one circle at the center of its pins, the color of the circle shows whether there are pins with differences greater
+    than the tolerance. Clusters of each grid are calculated once and cached, so the time of drawing depends only on
+    the size of the view and not on the number of pins. When a pin is added, moved or removed, only the cells of the
+    pin are updated in the cached grids.
+    """
+
+    BAD_COLOR: QColor = QColor(255, 80, 80, 220)
+    CELL_SIZE: float = 4.0
+    CLUSTER_SIZE: int = 24
+    CURRENT_PIN_COLOR: QColor = QColor(0, 0, 205)
+    GOOD_COLOR: QColor = QColor(80, 220, 80, 220)
+    MARGIN: float = 100
+    UNKNOWN_COLOR: QColor = QColor(200, 200, 200, 220)
+
+    def __init__(self, pin_index: PinSpatialIndex, get_states: Callable[[], Dict[int, bool]]) -> None:
+        """
+        :param pin_index: spatial index with coordinates of pins;
+        :param get_states: function that returns dictionary with pin indexes and True for pins whose difference is not
+        greater than the tolerance. Pins without differences are not in the dictionary.
+        """
+
+        super().__init__()
+        self._current_index: Optional[int] = None
+        self._get_states: Callable[[], Dict[int, bool]] = get_states
+        self._levels: Dict[int, Dict[Cell, List[float]]] = {}
+        self._pin_index: PinSpatialIndex = pin_index
+        self._pins_rect: Optional[QRectF] = None
+        self._rect: QRectF = QRectF()
+        self._states: Optional[Dict[int, bool]] = None
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.update_points()
+
+    @staticmethod
+    def _add_to_clusters(clusters: Dict[Cell, List[float]], cell_size: float, x: float, y: float, number: int,
+                         state: Optional[bool]) -> None:
+        """
+        Method adds a pin to the cluster of its cell or removes it from the cluster.
+        :param clusters: dictionary with clusters of the grid;
+        :param cell_size: size of cells of the grid;
+        :param x: X coordinate of the pin;
+        :param y: Y coordinate of the pin;
+        :param number: 1 to add the pin, -1 to remove it;
+        :param state: state of the pin.
+        """
+
+        cell = int(math.floor(x / cell_size)), int(math.floor(y / cell_size))
+        cluster = clusters.get(cell)
+        if cluster is None:
+            cluster = clusters[cell] = [0.0, 0.0, 0, 0, 0]
+        cluster[0] += number * x
+        cluster[1] += number * y
+        cluster[2] += number
+        if state is not None:
+            cluster[3 if state else 4] += number
+        if cluster[2] <= 0:
+            del clusters[cell]
+
+    def _add_to_levels(self, x: float, y: float, number: int, state: Optional[bool]) -> None:
+        """
+        Method adds a pin to the cached grids or removes it from them.
+        :param x: X coordinate of the pin;
+        :param y: Y coordinate of the pin;
+        :param number: 1 to add the pin, -1 to remove it;
+        :param state: state of the pin.
+        """
+
+        for level, clusters in self._levels.items():
+            self._add_to_clusters(clusters, PinClusterItem.CELL_SIZE * 2 ** level, x, y, number, state)
+
+    @staticmethod
+    def _extend_rect(rect: Optional[QRectF], x: float, y: float) -> QRectF:
+        """
+        :param rect: rectangle;
+        :param x: X coordinate of the point;
+        :param y: Y coordinate of the point.
+        :return: the smallest rectangle that contains the rectangle and the point.
+        """
+
+        if rect is None:
+            return QRectF(x, y, 0, 0)
+        return QRectF(QPointF(min(rect.left(), x), min(rect.top(), y)),
+                      QPointF(max(rect.right(), x), max(rect.bottom(), y)))
+
+    def _get_clusters(self, level: int) -> Dict[Cell, List[float]]:
+        """
+        :param level: level of the grid. The size of cells at the level is CELL_SIZE * 2 ** level.
+        :return: dictionary with cells and lists [sum of X coordinates, sum of Y coordinates, number of pins, number of
+        good pins, number of bad pins] of pins in the cells.
+        """
+
+        clusters = self._levels.get(level)
+        if clusters is not None:
+            return clusters
+
+        if self._states is None:
+            self._states = self._get_states()
+        cell_size = PinClusterItem.CELL_SIZE * 2 ** level
+        clusters = {}
+        for index in range(len(self._pin_index)):
+            self._add_to_clusters(clusters, cell_size, *self._pin_index.get_point(index), 1, self._states.get(index))
+        self._levels[level] = clusters
+        return clusters
+
+    @staticmethod
+    def _get_level(level_of_detail: float) -> int:
+        """
+        :param level_of_detail: scale of the view.
+        :return: level of the grid whose cells take at least CLUSTER_SIZE pixels on the screen.
+        """
+
+        if level_of_detail <= 0:
+            return 0
+        return max(0, math.ceil(math.log2(PinClusterItem.CLUSTER_SIZE / (level_of_detail * PinClusterItem.CELL_SIZE))))
+
+    @staticmethod
+    def _iterate_clusters(clusters: Dict[Cell, List[float]], rect: QRectF, cell_size: float) -> Iterable[List[float]]:
+        """
+        :param clusters: dictionary with clusters of the grid;
+        :param rect: area of the scene;
+        :param cell_size: size of cells of the grid.
+        :return: clusters of the cells that intersect the area.
+        """
+
+        first_column, last_column = int(math.floor(rect.left() / cell_size)), int(math.floor(rect.right() / cell_size))
+        first_row, last_row = int(math.floor(rect.top() / cell_size)), int(math.floor(rect.bottom() / cell_size))
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(clusters):
+            for (column, row), cluster in clusters.items():
+                if first_column <= column <= last_column and first_row <= row <= last_row:
+                    yield cluster
+        else:
+            for column in range(first_column, last_column + 1):
+                for row in range(first_row, last_row + 1):
+                    cluster = clusters.get((column, row))
+                    if cluster is not None:
+                        yield cluster
+
+    def _set_pins_rect(self, rect: Optional[QRectF]) -> None:
+        """
+        :param rect: rectangle with all pins. The bounding rectangle of the item is larger by a margin, so that the
+        circles of the clusters at the border are drawn.
+        """
+
+        self._pins_rect = rect
+        if rect is None:
+            bounding_rect = QRectF()
+        else:
+            margin = max(rect.width(), rect.height()) / 2 + PinClusterItem.MARGIN
+            bounding_rect = rect.adjusted(-margin, -margin, margin, margin)
+        if bounding_rect != self._rect:
+            self.prepareGeometryChange()
+            self._rect = bounding_rect
+
+    def _shift_states(self, start_index: int, shift: int) -> None:
+        """
+        :param start_index: index of the first pin whose index is changed;
+        :param shift: change of pin indexes.
+        """
+
+        if self._states is not None:
+            self._states = {index + shift if index >= start_index else index: state
+                            for index, state in self._states.items()}
+
+    def boundingRect(self) -> QRectF:
+        """
+        :return: rectangle with all pins in scene coordinates.
+        """
+
+        return self._rect
+
+    def insert_point(self, index: int, x: float, y: float) -> None:
+        """
+        Method must be called when a pin is added, before the pin is inserted into the spatial index.
+        :param index: index of the new pin;
+        :param x: X coordinate of the pin;
+        :param y: Y coordinate of the pin.
+        """
+
+        self._shift_states(index, 1)
+        self._add_to_levels(x, y, 1, None)
+        self._set_pins_rect(self._extend_rect(self._pins_rect, x, y))
+        self.update()
+
+    def invalidate_states(self) -> None:
+        """
+        Method must be called when differences of pins or tolerance change. New states of pins are obtained when the
+        item is drawn next time.
+        """
+
+        self._levels.clear()
+        self._states = None
+        self.update()
+
+    def move_point(self, index: int, x: float, y: float) -> None:
+        """
+        Method must be called when a pin is moved, before the pin is moved in the spatial index.
+        :param index: index of the pin;
+        :param x: new X coordinate of the pin;
+        :param y: new Y coordinate of the pin.
+        """
+
+        state = None if self._states is None else self._states.get(index)
+        self._add_to_levels(*self._pin_index.get_point(index), -1, state)
+        self._add_to_levels(x, y, 1, state)
+        self._set_pins_rect(self._extend_rect(self._pins_rect, x, y))
+        self.update()
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None) -> None:
+        """
+        :param painter: painter;
+        :param option: style options of the item;
+        :param widget: widget on which the item is drawn.
+        """
+
+        level_of_detail = option.levelOfDetailFromTransform(painter.worldTransform())
+        if level_of_detail <= 0 or len(self._pin_index) == 0:
+            return
+
+        level = self._get_level(level_of_detail)
+        cell_size = PinClusterItem.CELL_SIZE * 2 ** level
+        max_radius = PinClusterItem.CLUSTER_SIZE / 2 / level_of_detail
+        rect = option.exposedRect.adjusted(-max_radius, -max_radius, max_radius, max_radius)
+        painter.setPen(Qt.NoPen)
+        for x, y, number, good_number, bad_number in self._iterate_clusters(self._get_clusters(level), rect,
+                                                                            cell_size):
+            if bad_number:
+                color = PinClusterItem.BAD_COLOR
+            elif good_number:
+                color = PinClusterItem.GOOD_COLOR
+            else:
+                color = PinClusterItem.UNKNOWN_COLOR
+            radius = min(PinClusterItem.CLUSTER_SIZE / 2, 3 + 1.5 * math.log2(number)) / level_of_detail
+            painter.setBrush(QBrush(color))
+            painter.drawEllipse(QPointF(x / number, y / number), radius, radius)
+
+        if self._current_index is not None and 0 <= self._current_index < len(self._pin_index):
+            pen = QPen(PinClusterItem.CURRENT_PIN_COLOR, 2)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            radius = PinClusterItem.CLUSTER_SIZE / 2 / level_of_detail
+            painter.drawEllipse(QPointF(*self._pin_index.get_point(self._current_index)), radius, radius)
+
+    def remove_point(self, index: int) -> None:
+        """
+        Method must be called when a pin is removed, before the pin is removed from the spatial index. The bounding
+        rectangle is not reduced, so it may be larger than necessary until the points are updated.
+        :param index: index of the removed pin.
+        """
+
+        state = None if self._states is None else self._states.pop(index, None)
+        self._add_to_levels(*self._pin_index.get_point(index), -1, state)
+        self._shift_states(index + 1, -1)
+        if len(self._pin_index) == 1:
+            self._set_pins_rect(None)
+        self.update()
+
+    def set_current_index(self, index: Optional[int]) -> None:
+        """
+        :param index: index of the current pin. The current pin is marked with a ring.
+        """
+
+        if index != self._current_index:
+            self._current_index = index
+            self.update()
+
+    def update_points(self) -> None:
+        """
+        Method calculates the bounding rectangle of all pins of the spatial index again and clears the cached grids.
+        """
+
+        left = top = math.inf
+        right = bottom = -math.inf
+        for index in range(len(self._pin_index)):
+            x, y = self._pin_index.get_point(index)
+            left, right = min(left, x), max(right, x)
+            top, bottom = min(top, y), max(bottom, y)
+        self._set_pins_rect(QRectF(left, top, right - left, bottom - top) if self._pin_index else None)
+        self.invalidate_states()
@@ -0,0 +1,240 @@
+"""
+File with class for spatial index of pins on the board.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+Cell = Tuple[int, int]
+Point = Tuple[float, float]
+
+
+class PinSpatialIndex:
+    """
+    Class for spatial index of pins on the board. Coordinates of pins are stored in a list by pin indexes, so the
+    coordinates of a pin are found in O(1). The board is divided into square cells of a uniform grid, and each cell
+    stores indexes of the pins inside it. Rectangle and nearest-pin queries check only the cells near the given area.
+    """
+
+    CELL_SIZE: float = 100.0
+
+    def __init__(self, points: Iterable[Point] = (), cell_size: float = CELL_SIZE) -> None:
+        """
+        :param points: coordinates of pins in the order of pin indexes;
+        :param cell_size: size of a grid cell in scene coordinates.
+        """
+
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._cell_size: float = cell_size
+        self._cells: Dict[Cell, Set[int]] = defaultdict(set)
+        self._points: List[Point] = []
+        self.reset(points)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _add_to_cell(self, index: int, x: float, y: float) -> None:
+        """
+        :param index: pin index;
+        :param x: X coordinate of the pin;
+        :param y: Y coordinate of the pin.
+        """
+
+        column, row = self._get_cell(x, y)
+        self._cells[(column, row)].add(index)
+        if self._bounds is None:
+            self._bounds = column, row, column, row
+        else:
+            first_column, first_row, last_column, last_row = self._bounds
+            self._bounds = min(first_column, column), min(first_row, row), max(last_column, column), max(last_row, row)
+
+    def _get_cell(self, x: float, y: float) -> Cell:
+        """
+        :param x: X coordinate;
+        :param y: Y coordinate.
+        :return: grid cell that contains the point.
+        """
+
+        return int(math.floor(x / self._cell_size)), int(math.floor(y / self._cell_size))
+
+    def _get_max_radius(self, center: Cell) -> int:
+        """
+        :param center: central cell.
+        :return: distance in cells from the central cell to the farthest cell in which there may be pins.
+        """
+
+        if self._bounds is None:
+            return 0
+
+        first_column, first_row, last_column, last_row = self._bounds
+        return max(abs(first_column - center[0]), abs(last_column - center[0]), abs(first_row - center[1]),
+                   abs(last_row - center[1]))
+
+    def _iterate_ring(self, center: Cell, radius: int) -> Iterable[int]:
+        """
+        :param center: central cell;
+        :param radius: distance in cells from the central cell.
+        :return: indexes of pins in the cells on the border of the square with the given radius.
+        """
+
+        column, row = center
+        for cell_column in range(column - radius, column + radius + 1):
+            for cell_row in (row - radius, row + radius) if radius else (row,):
+                yield from self._cells.get((cell_column, cell_row), ())
+        for cell_row in range(row - radius + 1, row + radius):
+            for cell_column in (column - radius, column + radius) if radius else ():
+                yield from self._cells.get((cell_column, cell_row), ())
+
+    def _remove_from_cell(self, cell: Cell, index: int) -> None:
+        """
+        :param cell: grid cell;
+        :param index: index of the pin to remove from the cell.
+        """
+
+        indexes = self._cells[cell]
+        indexes.discard(index)
+        if not indexes:
+            del self._cells[cell]
+
+    def _shift_indexes(self, start_index: int, shift: int) -> None:
+        """
+        :param start_index: index of the first pin whose index is changed;
+        :param shift: change of pin indexes.
+        """
+
+        for cell, indexes in self._cells.items():
+            if any(index >= start_index for index in indexes):
+                self._cells[cell] = {index + shift if index >= start_index else index for index in indexes}
+
+    def find_nearest(self, x: float, y: float, max_distance: Optional[float] = None,
+                     direction: Optional[Point] = None) -> Optional[int]:
+        """
+        :param x: X coordinate of the point;
+        :param y: Y coordinate of the point;
+        :param max_distance: maximum distance from the point to the pin. If None, then the distance is not limited;
+        :param direction: if given, then only pins in this direction from the point are searched. A pin is in the
+        direction if the angle between the direction and the vector to the pin is not greater than 45 degrees.
+        :return: index of the nearest pin.
+        """
+
+        if not self._points:
+            return None
+
+        center = self._get_cell(x, y)
+        max_radius = self._get_max_radius(center)
+        if max_distance is not None:
+            max_radius = min(max_radius, int(math.ceil(max_distance / self._cell_size)))
+
+        best_index, best_distance = None, math.inf
+        for radius in range(max_radius + 1):
+            # Pins in the ring and further rings are at least (radius - 1) * cell_size away from the point
+            if best_index is not None and best_distance <= (radius - 1) * self._cell_size:
+                break
+
+            for index in self._iterate_ring(center, radius):
+                dx, dy = self._points[index][0] - x, self._points[index][1] - y
+                distance = math.hypot(dx, dy)
+                if direction is not None and (distance == 0 or dx * direction[0] + dy * direction[1] <
+                                              distance * math.hypot(*direction) * math.sqrt(0.5)):
+                    continue
+                if distance < best_distance or (distance == best_distance and index < best_index):
+                    best_index, best_distance = index, distance
+
+        if max_distance is not None and best_distance > max_distance:
+            return None
+        return best_index
+
+    def find_nearest_in_direction(self, index: int, dx: float, dy: float) -> Optional[int]:
+        """
+        :param index: index of the pin from which to search;
+        :param dx: X component of the direction;
+        :param dy: Y component of the direction.
+        :return: index of the nearest pin in the given direction from the pin.
+        """
+
+        x, y = self._points[index]
+        return self.find_nearest(x, y, direction=(dx, dy))
+
+    def get_point(self, index: int) -> Point:
+        """
+        :param index: pin index.
+        :return: coordinates of the pin.
+        """
+
+        return self._points[index]
+
+    def get_pins_in_rect(self, left: float, top: float, right: float, bottom: float) -> List[int]:
+        """
+        :param left: left border of the rectangle;
+        :param top: top border of the rectangle;
+        :param right: right border of the rectangle;
+        :param bottom: bottom border of the rectangle.
+        :return: sorted indexes of pins inside the rectangle.
+        """
+
+        first_column, first_row = self._get_cell(left, top)
+        last_column, last_row = self._get_cell(right, bottom)
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(self._cells):
+            cells = [cell for cell in self._cells if first_column <= cell[0] <= last_column and
+                     first_row <= cell[1] <= last_row]
+        else:
+            cells = [(column, row) for column in range(first_column, last_column + 1)
+                     for row in range(first_row, last_row + 1)]
+
+        indexes = []
+        for cell in cells:
+            for index in self._cells.get(cell, ()):
+                x, y = self._points[index]
+                if left <= x <= right and top <= y <= bottom:
+                    indexes.append(index)
+        return sorted(indexes)
+
+    def insert(self, index: int, x: float, y: float) -> None:
+        """
+        Method inserts a pin, indexes of the following pins are increased by one.
+        :param index: index of the new pin;
+        :param x: X coordinate of the pin;
+        :param y: Y coordinate of the pin.
+        """
+
+        if index < len(self._points):
+            self._shift_indexes(index, 1)
+        self._points.insert(index, (x, y))
+        self._add_to_cell(index, x, y)
+
+    def move(self, index: int, x: float, y: float) -> None:
+        """
+        :param index: pin index;
+        :param x: new X coordinate of the pin;
+        :param y: new Y coordinate of the pin.
+        """
+
+        old_cell = self._get_cell(*self._points[index])
+        new_cell = self._get_cell(x, y)
+        if old_cell != new_cell:
+            self._remove_from_cell(old_cell, index)
+            self._add_to_cell(index, x, y)
+        self._points[index] = x, y
+
+    def remove(self, index: int) -> None:
+        """
+        Method removes a pin, indexes of the following pins are decreased by one.
+        :param index: index of the pin to remove.
+        """
+
+        self._remove_from_cell(self._get_cell(*self._points.pop(index)), index)
+        if index < len(self._points):
+            self._shift_indexes(index + 1, -1)
+
+    def reset(self, points: Iterable[Point] = ()) -> None:
+        """
+        :param points: new coordinates of pins in the order of pin indexes.
+        """
+
+        self._bounds = None
+        self._cells.clear()
+        self._points = [(x, y) for x, y in points]
+        for index, (x, y) in enumerate(self._points):
+            self._add_to_cell(index, x, y)
@@ -0,0 +1,249 @@
+"""
+File with class to store states of pins of the measurement plan.
+"""
+
+import random
+from itertools import groupby
+from typing import Generator, Iterable, Optional, Tuple
+
+
+class _Run:
+    """
+    Class for node of the tree. The node describes a run of consecutive pins with the same state.
+    """
+
+    __slots__ = ("left", "length", "priority", "right", "size", "state", "true_number")
+
+    def __init__(self, state: bool, length: int, priority: Optional[float] = None) -> None:
+        """
+        :param state: state of pins in the run;
+        :param length: number of pins in the run;
+        :param priority: priority of the node in the tree.
+        """
+
+        self.left: Optional[_Run] = None
+        self.length: int = length
+        self.priority: float = random.random() if priority is None else priority
+        self.right: Optional[_Run] = None
+        self.size: int = length
+        self.state: bool = state
+        self.true_number: int = length if state else 0
+
+    def update(self) -> None:
+        """
+        Method recalculates the number of pins in the subtree after changing children of the node.
+        """
+
+        self.size = self.length
+        self.true_number = self.length if self.state else 0
+        for child in (self.left, self.right):
+            if child is not None:
+                self.size += child.size
+                self.true_number += child.true_number
+
+
+def _get_size(node: Optional[_Run]) -> int:
+    """
+    :param node: tree.
+    :return: number of pins in the tree.
+    """
+
+    return node.size if node is not None else 0
+
+
+def _join(left: Optional[_Run], right: Optional[_Run]) -> Optional[_Run]:
+    """
+    Function merges trees and combines the last run of the first tree with the first run of the second tree if they
+    have the same state.
+    :param left: tree with the first pins;
+    :param right: tree with the following pins.
+    :return: tree with pins of both trees.
+    """
+
+    if left is None or right is None:
+        return left or right
+
+    last = left
+    while last.right is not None:
+        last = last.right
+    first = right
+    while first.left is not None:
+        first = first.left
+    if last.state != first.state:
+        return _merge(left, right)
+
+    left, _ = _split(left, left.size - last.length)
+    _, right = _split(right, first.length)
+    return _merge(_merge(left, _Run(last.state, last.length + first.length)), right)
+
+
+def _merge(left: Optional[_Run], right: Optional[_Run]) -> Optional[_Run]:
+    """
+    :param left: tree with the first pins;
+    :param right: tree with the following pins.
+    :return: tree with pins of both trees.
+    """
+
+    if left is None or right is None:
+        return left or right
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _split(node: Optional[_Run], number: int) -> Tuple[Optional[_Run], Optional[_Run]]:
+    """
+    :param node: tree;
+    :param number: number of pins in the first tree. If the border is inside a run, then the run is divided.
+    :return: tree with the first pins and tree with the rest pins.
+    """
+
+    if node is None:
+        return None, None
+
+    left_size = _get_size(node.left)
+    if number <= left_size:
+        left, node.left = _split(node.left, number)
+        node.update()
+        return left, node
+
+    if number >= left_size + node.length:
+        node.right, right = _split(node.right, number - left_size - node.length)
+        node.update()
+        return node, right
+
+    # The new node takes the priority of the divided node, so the heap order is kept
+    offset = number - left_size
+    right_node = _Run(node.state, node.length - offset, node.priority)
+    right_node.right, node.right = node.right, None
+    node.length = offset
+    right_node.update()
+    node.update()
+    return node, right_node
+
+
+class PinStateIndex:
+    """
+    Class stores boolean states of pins (for example, whether the pin has a reference signature) by pin indexes.
+    Consecutive pins with the same state are stored as one run in a treap ordered by pin indexes. So insertion and
+    removal of a pin with shifting of the following indexes take O(log n) time, and ranges of pins with the given
+    state are reported without scanning all pins.
+    """
+
+    def __init__(self, states: Iterable[bool] = ()) -> None:
+        """
+        :param states: initial states of pins.
+        """
+
+        self._root: Optional[_Run] = None
+        for state, group in groupby(bool(state) for state in states):
+            self._root = _merge(self._root, _Run(state, sum(1 for _ in group)))
+
+    def __len__(self) -> int:
+        return _get_size(self._root)
+
+    @property
+    def false_number(self) -> int:
+        """
+        :return: number of pins with False state.
+        """
+
+        return len(self) - self.true_number
+
+    @property
+    def true_number(self) -> int:
+        """
+        :return: number of pins with True state.
+        """
+
+        return self._root.true_number if self._root is not None else 0
+
+    @staticmethod
+    def _check_index(index: int, size: int) -> None:
+        """
+        :param index: pin index;
+        :param size: maximum allowed index plus one.
+        """
+
+        if not 0 <= index < size:
+            raise IndexError(f"Pin index {index} is out of range")
+
+    def clear(self) -> None:
+        self._root = None
+
+    def get(self, index: int) -> bool:
+        """
+        :param index: pin index.
+        :return: state of the pin.
+        """
+
+        self._check_index(index, len(self))
+        node = self._root
+        while True:
+            left_size = _get_size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.length:
+                return node.state
+            else:
+                index -= left_size + node.length
+                node = node.right
+
+    def get_ranges(self, state: bool) -> Generator[Tuple[int, int], None, None]:
+        """
+        :param state: state of pins.
+        :return: first and last indexes of ranges of consecutive pins with the given state.
+        """
+
+        stack = []
+        node = self._root
+        start = 0
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+
+            node = stack.pop()
+            if node.state == state:
+                yield start, start + node.length - 1
+            start += node.length
+            node = node.right
+
+    def insert(self, index: int, state: bool) -> None:
+        """
+        Method inserts a pin, indexes of the following pins are increased by one.
+        :param index: index of the new pin;
+        :param state: state of the new pin.
+        """
+
+        self._check_index(index, len(self) + 1)
+        left, right = _split(self._root, index)
+        self._root = _join(_join(left, _Run(bool(state), 1)), right)
+
+    def remove(self, index: int) -> None:
+        """
+        Method removes a pin, indexes of the following pins are decreased by one.
+        :param index: index of the pin to remove.
+        """
+
+        self._check_index(index, len(self))
+        left, right = _split(self._root, index)
+        _, right = _split(right, 1)
+        self._root = _join(left, right)
+
+    def set(self, index: int, state: bool) -> None:
+        """
+        :param index: pin index;
+        :param state: new state of the pin.
+        """
+
+        if self.get(index) != bool(state):
+            self.remove(index)
+            self.insert(index, state)
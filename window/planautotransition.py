@@ -9,8 +9,10 @@ from epcore.elements import IVCurve, MeasurementSettings
 from epcore.product import EyePointProduct
 from connection_window.productname import ProductName
 from settings.autosettings import AutoSettings
-from .breaksignaturessaver import create_filename, iterate_settings, load_signature
+from .breakdetector import BreakDetector
+from .breaksignaturessaver import create_filename, iterate_settings, open_break_signature_store
 from .common import WorkMode
+from .optionscache import OptionsCache
 from .scorewrapper import check_difference_not_greater_tolerance, ScoreWrapper
 
 
@@ -31,8 +33,6 @@ class PlanAutoTransition(QObject):
         MEASURE = auto()
         SAVE = auto()
 
-    BREAK_NUMBER: int = 10
-    BREAK_TOLERANCE: float = 0.15
     TIME_TO_SHOW: float = 0.5
     TIMEOUT: int = 10
     go_to_next_signal: pyqtSignal = pyqtSignal(bool, bool)
@@ -40,7 +40,9 @@ class PlanAutoTransition(QObject):
 
     def __init__(self, product: EyePointProduct, auto_settings: AutoSettings, score_wrapper: ScoreWrapper,
                  calculate_score: Callable[[IVCurve, IVCurve, MeasurementSettings], float], dir_path: str,
-                 frequency: Optional[str] = None, sensitive: Optional[str] = None) -> None:
+                 frequency: Optional[str] = None, sensitive: Optional[str] = None,
+                 break_detector: Optional[BreakDetector] = None, options_cache: Optional[OptionsCache] = None
+                 ) -> None:
         """
         :param product: product;
         :param auto_settings: object with basic application settings;
@@ -50,16 +52,21 @@ class PlanAutoTransition(QObject):
         :param frequency: name of the frequency mode for break signatures. If None, then each frequency requires its
         own break signature;
         :param sensitive: name of the sensitivity mode for break signatures. If None, then each sensitivity requires
-        its own break signature.
+        its own break signature;
+        :param break_detector: object that detects that the probes are raised. If None, then each measured signature
+        is compared with the break signature by the comparator;
+        :param options_cache: cache of product options for measurement settings. If None, then the auto-transition
+        creates its own cache.
         """
 
         super().__init__()
         self._auto_settings: AutoSettings = auto_settings
-        self._break_number: int = 0
+        self._break_detector: BreakDetector = break_detector or BreakDetector(calculate_score)
         self._break_signatures: Dict[str, IVCurve] = dict()
         self._calculate_score: Callable[[IVCurve, IVCurve, MeasurementSettings], float] = calculate_score
         self._dir: str = dir_path
         self._need_to_save: bool = False
+        self._options_cache: OptionsCache = options_cache or OptionsCache(product)
         self._product: EyePointProduct = product
         self._process: "PlanAutoTransition.Process" = self.Process.MEASURE
         self._required_frequency: Optional[str] = frequency
@@ -108,27 +115,14 @@ class PlanAutoTransition(QObject):
 
     def _check_probes_raised(self, settings: MeasurementSettings, curve: IVCurve, break_signature: IVCurve) -> None:
         """
-        Method checks that the probes are raised. The probes are considered to be raised if the measured signature
-        matches the break signature a certain number of times.
+        Method checks that the probes are raised. The decision is made by the break detector.
         :param settings: measurement settings;
         :param curve: current measured signature;
         :param break_signature: break signature.
         """
 
-        score = self._calculate_score_for_curves(settings, curve, break_signature)
-        if score is not None and check_difference_not_greater_tolerance(score, self.BREAK_TOLERANCE):
-            self._break_number += 1
-            logger.info("Waiting for a break: score = %f, number of sequentially measured breaks = %d", score,
-                        self._break_number)
-        else:
-            logger.info("Waiting for a break: score = %s. Score does not correspond to the break, the number of "
-                        "sequentially measured breaks is reset to zero", score)
-            self._break_number = 0
-
-        if self._break_number >= self.BREAK_NUMBER:
-            logger.info("Probes raised")
+        if self._break_detector.add_signature(settings, curve, break_signature):
             self._process = self.Process.MEASURE
-            self._break_number = 0
 
     def _get_break_signature_for_settings(self, settings: MeasurementSettings) -> Optional[IVCurve]:
         """
@@ -136,13 +130,8 @@ class PlanAutoTransition(QObject):
         :return: signature for a given measurement settings.
         """
 
-        options = self._product.settings_to_options(settings)
-        frequency = options[EyePointProduct.Parameter.frequency] if self._required_frequency is None else \
-            self._required_frequency
-        sensitive = options[EyePointProduct.Parameter.sensitive] if self._required_sensitive is None else \
-            self._required_sensitive
-        voltage = options[EyePointProduct.Parameter.voltage]
-        filename = create_filename(frequency, sensitive, voltage)
+        filename = self._options_cache.get_break_signature_filename(settings, self._required_frequency,
+                                                                    self._required_sensitive)
         return self._break_signatures.get(filename, None)
 
     def check_auto_transition(self, work_mode: WorkMode, product_name: ProductName, settings: MeasurementSettings,
@@ -187,7 +176,7 @@ class PlanAutoTransition(QObject):
             self.go_to_next_signal.emit(False, True)
             self._process = self.Process.GO_TO_NEXT
             self._start_time = time.monotonic()
-            self._break_number = 0
+            self._break_detector.reset()
             return
 
         self._timer.start()
@@ -199,11 +188,10 @@ class PlanAutoTransition(QObject):
 
         self._break_signatures = dict()
         if os.path.exists(self._dir):
-            for frequency, sensitive, voltage in iterate_settings(self._product, self._required_frequency,
-                                                                  self._required_sensitive):
-                filename = create_filename(frequency, sensitive, voltage)
-                path = os.path.join(self._dir, filename)
-                self._break_signatures[filename] = load_signature(path)
+            filenames = [create_filename(frequency, sensitive, voltage)
+                         for frequency, sensitive, voltage in iterate_settings(self._product, self._required_frequency,
+                                                                               self._required_sensitive)]
+            self._break_signatures = open_break_signature_store(self._dir).load_signatures(filenames)
 
     def save_measurements(self) -> None:
         """
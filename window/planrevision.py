@@ -0,0 +1,56 @@
+"""
+File with class to track changes in the measurement plan.
+"""
+
+from typing import Optional
+
+
+class PlanRevision:
+    """
+    Class counts changes of the measurement plan. Every change of pins, measurements, comments, coordinates or board
+    image must increase the revision. The plan has unsaved changes if its revision differs from the revision at the
+    moment of the last saving.
+    """
+
+    def __init__(self) -> None:
+        self._revision: int = 0
+        self._saved_revision: Optional[int] = None
+
+    @property
+    def is_modified(self) -> bool:
+        """
+        :return: True if the measurement plan has been changed since the last saving.
+        """
+
+        return self._revision != self._saved_revision
+
+    @property
+    def revision(self) -> int:
+        """
+        :return: current revision of the measurement plan.
+        """
+
+        return self._revision
+
+    def increase(self) -> None:
+        """
+        Method should be called after any change in the measurement plan.
+        """
+
+        self._revision += 1
+
+    def mark_saved(self, revision: Optional[int] = None) -> None:
+        """
+        :param revision: revision of the measurement plan that was saved. If None, then the current revision is
+        considered saved.
+        """
+
+        self._saved_revision = self._revision if revision is None else revision
+
+    def reset(self) -> None:
+        """
+        Method resets the revision when the measurement plan is deleted.
+        """
+
+        self._revision = 0
+        self._saved_revision = None
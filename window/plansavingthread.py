@@ -0,0 +1,149 @@
+"""
+File with class for thread to save measurement plans to files.
+"""
+
+import copy
+import logging
+import os
+import queue
+import shutil
+import sys
+import tempfile
+from collections import namedtuple
+from typing import Optional
+from PyQt5.QtCore import pyqtSignal, QThread
+import epcore.filemanager as epfilemanager
+from epcore.elements import Board
+from epcore.measurementmanager import MeasurementPlan
+from .sharedimage import load_shared_image
+from .signaturesidecar import SignatureSidecar
+
+
+logger = logging.getLogger("eplab")
+SavingTask = namedtuple("SavingTask", ["board", "path", "task_id", "binary_signatures"])
+
+
+def create_board_snapshot(plan: MeasurementPlan) -> Board:
+    """
+    Function creates a board with the current state of the measurement plan. Elements, pins and lists of measurements
+    are copied, so further changes in the plan do not affect the snapshot. Measurements themselves are shared, because
+    the plan replaces measurements in pins instead of changing them. The image is shared too, so it is decoded before
+    it is passed to another thread.
+    :param plan: measurement plan.
+    :return: snapshot of the measurement plan.
+    """
+
+    elements = []
+    for element in plan.elements:
+        element_copy = copy.copy(element)
+        element_copy.pins = []
+        for pin in element.pins:
+            pin_copy = copy.copy(pin)
+            pin_copy.measurements = list(pin.measurements)
+            element_copy.pins.append(pin_copy)
+        elements.append(element_copy)
+    return Board(elements=elements, image=load_shared_image(plan.image))
+
+
+def save_board_atomically(board: Board, path: str) -> str:
+    """
+    Function saves the board to a temporary file in the directory of the given path and then renames the temporary
+    file. So the existing file is either replaced completely or not changed at all.
+    :param board: board to save;
+    :param path: path to the file.
+    :return: path to the saved file.
+    """
+
+    dir_name = os.path.dirname(os.path.abspath(path))
+    temp_dir = tempfile.mkdtemp(prefix=".eplab_saving_", dir=dir_name)
+    try:
+        temp_path = epfilemanager.save_board_to_ufiv(os.path.join(temp_dir, os.path.basename(path)), board)
+        saved_path = os.path.join(dir_name, os.path.basename(temp_path))
+        os.replace(temp_path, saved_path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return saved_path
+
+
+class PlanSavingThread(QThread):
+    """
+    Class for thread to save measurement plans. The main window puts snapshots of the plan into the queue and
+    continues to work while the thread writes files. The progress of saving is measured in pins: first all pins are
+    written to the measurement plan file, then, if it is enabled, their signatures are written to the file with binary
+    signatures.
+    """
+
+    PROGRESS_STEP: int = 100
+    saving_failed: pyqtSignal = pyqtSignal(int, str)
+    saving_finished: pyqtSignal = pyqtSignal(int, str)
+    saving_progress: pyqtSignal = pyqtSignal(int, int, int)
+    saving_started: pyqtSignal = pyqtSignal(int, str)
+
+    def __init__(self, parent=None) -> None:
+        """
+        :param parent: parent object.
+        """
+
+        super().__init__(parent=parent)
+        self._last_task_id: int = 0
+        self._tasks: queue.Queue = queue.Queue()
+
+    def _save(self, task: SavingTask) -> None:
+        """
+        :param task: task to save the board.
+        """
+
+        self.saving_started.emit(task.task_id, task.path)
+        pins_number = sum(len(element.pins) for element in task.board.elements)
+        total_steps = 2 * pins_number if task.binary_signatures else pins_number
+
+        def report_sidecar_progress(saved_pins_number: int) -> None:
+            if saved_pins_number % PlanSavingThread.PROGRESS_STEP == 0:
+                self.saving_progress.emit(task.task_id, pins_number + saved_pins_number, total_steps)
+
+        self.saving_progress.emit(task.task_id, 0, total_steps)
+        try:
+            saved_path = save_board_atomically(task.board, task.path)
+        except Exception as exc:
+            logger.error("Failed to save measurement plan to file '%s'", task.path, exc_info=sys.exc_info())
+            self.saving_failed.emit(task.task_id, str(exc))
+            return
+
+        self.saving_progress.emit(task.task_id, pins_number, total_steps)
+        try:
+            if task.binary_signatures:
+                SignatureSidecar.save(task.board, saved_path, progress=report_sidecar_progress)
+            else:
+                SignatureSidecar.remove(saved_path)
+        except Exception:
+            logger.warning("Failed to update binary signatures for measurement plan '%s'", saved_path)
+        self.saving_progress.emit(task.task_id, total_steps, total_steps)
+        self.saving_finished.emit(task.task_id, saved_path)
+
+    def add_task(self, plan: MeasurementPlan, path: str, binary_signatures: bool = False) -> int:
+        """
+        Method creates a snapshot of the measurement plan and adds a task to save it.
+        :param plan: measurement plan to save;
+        :param path: path to the file;
+        :param binary_signatures: if True, then signatures are also saved to the file with binary signatures,
+        otherwise an old file with binary signatures is removed.
+        :return: task ID.
+        """
+
+        self._last_task_id += 1
+        self._tasks.put(SavingTask(create_board_snapshot(plan), path, self._last_task_id, binary_signatures))
+        return self._last_task_id
+
+    def run(self) -> None:
+        while True:
+            task: Optional[SavingTask] = self._tasks.get()
+            if task is None:
+                break
+            self._save(task)
+
+    def stop_thread(self) -> None:
+        """
+        Method stops the thread. Plans already added to the queue will be saved before the thread finishes.
+        """
+
+        self._tasks.put(None)
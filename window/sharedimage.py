@@ -0,0 +1,25 @@
+"""
+File with function to decode images of boards that are used by several threads.
+"""
+
+import threading
+from typing import Optional
+from PIL import Image
+
+
+_LOCK: threading.Lock = threading.Lock()
+
+
+def load_shared_image(image: Optional[Image.Image]) -> Optional[Image.Image]:
+    """
+    Function decodes the image if it has not been decoded yet. PIL decodes images on the first access to pixels, and
+    decoding is not thread-safe. So an image of the board that is used by several threads must be decoded by this
+    function before its pixels are read, after that the image can be read from any thread.
+    :param image: image of the board.
+    :return: decoded image.
+    """
+
+    if image is not None:
+        with _LOCK:
+            image.load()
+    return image
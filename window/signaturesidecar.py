@@ -0,0 +1,198 @@
+"""
+File with class to store signatures of the measurement plan in binary format. The file with signatures is optional,
+it is stored next to the measurement plan file and is used only while the measurement plan file has not been changed.
+"""
+
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from epcore.elements import Board
+
+
+logger = logging.getLogger("eplab")
+
+
+class SignatureSidecar:
+    """
+    Class for file with signatures of the measurement plan in binary format. The file contains the header, the
+    measurement plan in JSON format in which arrays of currents and voltages are replaced with their indexes, lengths
+    of the arrays and a block of float values of all arrays. The header also contains the size, modification time and
+    CRC-32 of the measurement plan file from which the file was made.
+    """
+
+    DTYPES: str = "df"
+    FILE_EXTENSION: str = ".signatures.bin"
+    HEADER: struct.Struct = struct.Struct("<8sHQqIcQQ")
+    MAGIC: bytes = b"EPLABSIG"
+    READ_BLOCK_SIZE: int = 1 << 20
+    VERSION: int = 2
+
+    def __init__(self, skeleton: Dict[str, Any], lengths: array, data: bytes, dtype: str) -> None:
+        """
+        :param skeleton: measurement plan in which arrays of currents and voltages are replaced with their indexes;
+        :param lengths: lengths of arrays of values;
+        :param data: block of values of all arrays;
+        :param dtype: type code of values.
+        """
+
+        self._data: memoryview = memoryview(data)
+        self._dtype: str = dtype
+        self._item_size: int = array(dtype).itemsize
+        self._offsets: List[int] = [0, *accumulate(lengths)]
+        self._skeleton: Dict[str, Any] = skeleton
+        if self._offsets[-1] * self._item_size != len(data):
+            raise ValueError("Size of the block of values does not match lengths of arrays")
+
+    @property
+    def arrays_number(self) -> int:
+        """
+        :return: number of arrays of values.
+        """
+
+        return len(self._offsets) - 1
+
+    @property
+    def skeleton(self) -> Dict[str, Any]:
+        """
+        :return: measurement plan in which arrays of currents and voltages are replaced with their indexes.
+        """
+
+        return self._skeleton
+
+    @staticmethod
+    def _get_plan_stamp(plan_path: str) -> Tuple[int, int, int]:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: size, modification time and CRC-32 of the measurement plan file.
+        """
+
+        crc = 0
+        with open(plan_path, "rb") as file:
+            for block in iter(lambda: file.read(SignatureSidecar.READ_BLOCK_SIZE), b""):
+                crc = zlib.crc32(block, crc)
+        stat = os.stat(plan_path)
+        return stat.st_size, stat.st_mtime_ns, crc
+
+    def get_array(self, index: int) -> List[float]:
+        """
+        :param index: index of the array.
+        :return: values of the array.
+        """
+
+        values = array(self._dtype)
+        values.frombytes(self._data[self._offsets[index] * self._item_size:self._offsets[index + 1] * self._item_size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+
+    @staticmethod
+    def get_file_name(plan_path: str) -> str:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: path to the file with signatures in binary format for the measurement plan.
+        """
+
+        return os.path.splitext(plan_path)[0] + SignatureSidecar.FILE_EXTENSION
+
+    @classmethod
+    def open(cls, plan_path: str) -> Optional["SignatureSidecar"]:
+        """
+        :param plan_path: path to the measurement plan file.
+        :return: signatures in binary format if there is an up-to-date file with them, otherwise None.
+        """
+
+        file_name = cls.get_file_name(plan_path)
+        if not os.path.isfile(file_name):
+            return None
+
+        try:
+            with open(file_name, "rb") as file:
+                content = file.read()
+            magic, version, source_size, source_mtime, source_crc, dtype, skeleton_length, arrays_number = \
+                cls.HEADER.unpack_from(content)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                return None
+
+            if (source_size, source_mtime, source_crc) != cls._get_plan_stamp(plan_path):
+                logger.info("File with binary signatures '%s' is out of date", file_name)
+                return None
+
+            position = cls.HEADER.size
+            skeleton = json.loads(content[position:position + skeleton_length].decode("utf-8"))
+            position += skeleton_length
+            lengths = array("Q")
+            lengths.frombytes(content[position:position + arrays_number * lengths.itemsize])
+            if sys.byteorder == "big":
+                lengths.byteswap()
+            position += arrays_number * lengths.itemsize
+            return cls(skeleton, lengths, content[position:], dtype.decode())
+        except Exception:
+            logger.warning("Failed to read binary signatures from file '%s'", file_name)
+            return None
+
+    @classmethod
+    def remove(cls, plan_path: str) -> None:
+        """
+        Method removes the file with signatures of the measurement plan if it exists.
+        :param plan_path: path to the measurement plan file.
+        """
+
+        file_name = cls.get_file_name(plan_path)
+        if os.path.isfile(file_name):
+            os.remove(file_name)
+
+    @classmethod
+    def save(cls, board: Board, plan_path: str, dtype: str = "d", progress: Optional[Callable[[int], None]] = None
+             ) -> None:
+        """
+        Method writes signatures of the measurement plan to a file next to the measurement plan file. It must be
+        called after the measurement plan file is saved.
+        :param board: saved measurement plan;
+        :param plan_path: path to the measurement plan file;
+        :param dtype: type code of values, "d" for double precision and "f" for single precision;
+        :param progress: function that is called with the number of processed pins after each pin.
+        """
+
+        if dtype not in cls.DTYPES:
+            raise ValueError(f"Unsupported type code of values: {dtype}")
+
+        skeleton = board.to_json()
+        lengths = array("Q")
+        values = array(dtype)
+        pins_number = 0
+        for element in skeleton["elements"]:
+            for pin in element["pins"]:
+                for curve in pin.get("iv_curves", []):
+                    for key in ("currents", "voltages"):
+                        lengths.append(len(curve[key]))
+                        values.extend(curve[key])
+                        curve[key] = len(lengths) - 1
+                pins_number += 1
+                if progress is not None:
+                    progress(pins_number)
+        if sys.byteorder == "big":
+            lengths.byteswap()
+            values.byteswap()
+
+        skeleton_bytes = json.dumps(skeleton).encode("utf-8")
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, *cls._get_plan_stamp(plan_path), dtype.encode(),
+                                 len(skeleton_bytes), len(lengths))
+        file_name = cls.get_file_name(plan_path)
+        dir_name = os.path.dirname(os.path.abspath(file_name))
+        file_descriptor, temp_file_name = tempfile.mkstemp(prefix=".eplab_", dir=dir_name)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                for part in (header, skeleton_bytes, lengths.tobytes(), values.tobytes()):
+                    file.write(part)
+            os.replace(temp_file_name, file_name)
+        except Exception:
+            if os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
+            raise
@@ -0,0 +1,180 @@
+"""
+File with model for tables with information about pins of the measurement plan.
+"""
+
+from typing import Any, List, Optional
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush
+
+
+class TableModel(QAbstractTableModel):
+    """
+    Class for model of a table in which a row corresponds to a pin of the measurement plan. The model does not store
+    cell values. Values are requested from the table when the view draws visible rows, so filling, clearing and
+    renumbering rows do not depend on the number of pins.
+    """
+
+    def __init__(self, table, headers: List[str]) -> None:
+        """
+        :param table: table that provides values of cells;
+        :param headers: list with headers for table.
+        """
+
+        super().__init__(table)
+        self._headers: List[str] = headers
+        self._rows_number: int = 0
+        self._table = table
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        :param parent: parent index.
+        :return: number of columns.
+        """
+
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """
+        :param index: index of the cell;
+        :param role: data role.
+        :return: data of the cell for the given role.
+        """
+
+        if not index.isValid() or index.row() >= self._rows_number:
+            return None
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._table.get_cell_text(index.row(), index.column())
+
+        if role == Qt.BackgroundRole:
+            return self._table.get_row_brush(index.row())
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        """
+        :param index: index of the cell.
+        :return: flags of the cell.
+        """
+
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self._table.check_cell_editable(index.row(), index.column()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        """
+        :param section: number of the section;
+        :param orientation: orientation of the header;
+        :param role: data role.
+        :return: data of the header section.
+        """
+
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def insert_row(self, row: int) -> None:
+        """
+        Method inserts a row. Numbers of the following rows are updated when they are drawn.
+        :param row: number of the new row.
+        """
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows_number += 1
+        self.endInsertRows()
+        self.update_rows(row)
+
+    def remove_row(self, row: int) -> None:
+        """
+        :param row: number of the row to be deleted.
+        """
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._rows_number -= 1
+        self.endRemoveRows()
+        self.update_rows(row)
+
+    def reset(self, rows_number: int) -> None:
+        """
+        :param rows_number: new number of rows.
+        """
+
+        self.beginResetModel()
+        self._rows_number = rows_number
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        :param parent: parent index.
+        :return: number of rows.
+        """
+
+        return 0 if parent.isValid() else self._rows_number
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        """
+        :param index: index of the cell;
+        :param value: new value of the cell;
+        :param role: data role.
+        :return: True if the value has been set.
+        """
+
+        if role != Qt.EditRole or not index.isValid() or index.row() >= self._rows_number:
+            return False
+
+        if self._table.set_cell_text(index.row(), index.column(), str(value)):
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        return False
+
+    def update_rows(self, first_row: int = 0, last_row: Optional[int] = None) -> None:
+        """
+        Method notifies the view that the rows have been changed. The view requests values only for visible rows.
+        :param first_row: number of the first changed row;
+        :param last_row: number of the last changed row. If None, then all rows after the first one are changed.
+        """
+
+        last_row = self._rows_number - 1 if last_row is None else min(last_row, self._rows_number - 1)
+        if 0 <= first_row <= last_row:
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, self.columnCount() - 1))
+
+
+class TableItem:
+    """
+    Class gives access to a cell of the table as to an item of QTableWidget.
+    """
+
+    def __init__(self, index: QModelIndex) -> None:
+        """
+        :param index: index of the cell.
+        """
+
+        self._index: QModelIndex = index
+
+    def background(self) -> QBrush:
+        """
+        :return: background brush of the cell.
+        """
+
+        brush = self._index.data(Qt.BackgroundRole)
+        return brush if isinstance(brush, QBrush) else QBrush()
+
+    def column(self) -> int:
+        return self._index.column()
+
+    def flags(self) -> Qt.ItemFlags:
+        return self._index.flags()
+
+    def row(self) -> int:
+        return self._index.row()
+
+    def text(self) -> str:
+        """
+        :return: text of the cell.
+        """
+
+        text = self._index.data(Qt.DisplayRole)
+        return "" if text is None else str(text)
@@ -1,48 +1,35 @@
 from typing import Any, Callable, List, Optional
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, Qt
-from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableWidget, QTableWidgetItem
-from .pinindextableitem import PinIndexTableItem
-
-
-def change_item_state(item: QTableWidgetItem, read_only: bool) -> None:
-    """
-    :param item: table widget item as editable or not editable;
-    :param read_only: if True, then change the table widget item to an editable state, otherwise to a non-editable
-    state.
-    """
-
-    item.setFlags(item.flags() ^ Qt.ItemIsEditable if read_only else item.flags() | Qt.ItemIsEditable)
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QItemSelection
+from PyQt5.QtGui import QBrush
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+from .tablemodel import TableItem, TableModel
 
 
 def disconnect_item_signals(func: Callable[..., Any]):
     """
-    The decorator disconnects and reconnects the itemChanged and itemSelectionChanged signals to the slots after
+    The decorator disconnects and reconnects the selectionChanged signal of the selection model to the slot after
     executing the decorated function.
     :param func: function to be decorated.
     """
 
     def wrapper(self, *args, **kwargs) -> Any:
+        selection_model = self.selectionModel()
         try:
-            self.itemChanged.disconnect()
-        except Exception:
-            pass
-
-        try:
-            self.itemSelectionChanged.disconnect()
+            selection_model.selectionChanged.disconnect(self.send_current_row_index)
         except Exception:
             pass
 
         result = func(self, *args, **kwargs)
-        self.itemChanged.connect(self.handle_item_changed)
-        self.itemSelectionChanged.connect(self.send_current_row_index)
+        selection_model.selectionChanged.connect(self.send_current_row_index)
         return result
 
     return wrapper
 
 
-class TableWidget(QTableWidget):
+class TableWidget(QTableView):
     """
-    Class for a table.
+    Class for a table. Each row of the table corresponds to a pin of the measurement plan. Values of cells are not
+    stored in the table, they are calculated by the methods get_cell_text and get_row_brush when the rows are drawn.
     """
 
     current_row_signal: pyqtSignal = pyqtSignal(int, bool)
@@ -55,40 +42,57 @@ class TableWidget(QTableWidget):
 
         super().__init__()
         self._main_window = main_window
-        self._init_ui(headers)
+        self._model: TableModel = TableModel(self, headers)
+        self._init_ui()
 
     @disconnect_item_signals
     def _clear_table(self) -> None:
-        _ = [self.removeRow(row) for row in range(self.rowCount(), -1, -1)]
-        self.clearContents()
+        self._model.reset(0)
 
-    @staticmethod
-    def _create_table_item(read_only: bool = True) -> QTableWidgetItem:
+    def _get_pin(self, row: int):
         """
-        :param read_only: if True, then item will be non-editable.
-        :return: new table item.
+        :param row: row number.
+        :return: pin for the row.
         """
 
-        item = QTableWidgetItem()
-        change_item_state(item, read_only)
-        return item
+        measurement_plan = self._main_window.measurement_plan
+        return measurement_plan.get_pin_with_index(row) if measurement_plan else None
 
-    def _init_ui(self, headers: List[str]) -> None:
+    def _get_visible_rows(self) -> range:
         """
-        :param headers: list with headers for table.
+        :return: numbers of rows that are visible in the table.
         """
 
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
+        first_row = max(self.rowAt(0), 0)
+        last_row = self.rowAt(self.viewport().height() - 1)
+        if last_row < 0:
+            last_row = self.rowCount() - 1
+        return range(first_row, last_row + 1)
+
+    def _init_ui(self) -> None:
+        self.setModel(self._model)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setWordWrap(False)
         horizontal_header = self.horizontalHeader()
         horizontal_header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        # Widths of columns are calculated only from visible rows
+        horizontal_header.setResizeContentsPrecision(0)
         horizontal_header.setStretchLastSection(True)
         vertical_header = self.verticalHeader()
         vertical_header.setVisible(False)
-        vertical_header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.itemSelectionChanged.connect(self.send_current_row_index)
+        # Rows have the same height, so the height of all rows is not calculated from their contents
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.selectionModel().selectionChanged.connect(self.send_current_row_index)
+
+    @disconnect_item_signals
+    def _insert_row(self, index: int) -> None:
+        """
+        :param index: index of the row to be inserted.
+        """
+
+        self._model.insert_row(index)
 
     @disconnect_item_signals
     def _remove_row(self, index: int) -> None:
@@ -96,29 +100,70 @@ class TableWidget(QTableWidget):
         :param index: index of the row to be deleted.
         """
 
-        self.removeRow(index)
+        self._model.remove_row(index)
+
+    def _reset_rows(self) -> None:
+        """
+        Method sets the number of rows equal to the number of pins in the measurement plan.
+        """
+
+        measurement_plan = self._main_window.measurement_plan
+        self._model.reset(measurement_plan.pins_number if measurement_plan else 0)
 
-    @disconnect_item_signals
     def _update_indexes(self, start_row: Optional[int] = 0) -> None:
         """
-        Method updates row indexes in the table.
+        Method updates row indexes in the table. Indexes are calculated when rows are drawn, so only the view is
+        notified.
         :param start_row: row number in the table, starting from which to update the row indexes.
         """
 
-        if start_row is None:
-            start_row = 0
-        column = 0
-        for row in range(start_row, self.rowCount()):
-            item = self.item(row, column)
-            if isinstance(item, PinIndexTableItem):
-                item.set_index(row)
+        self._model.update_rows(start_row or 0)
 
-    @pyqtSlot(QTableWidgetItem)
-    def handle_item_changed(self, item: QTableWidgetItem) -> None:
+    def check_cell_editable(self, row: int, column: int) -> bool:
         """
-        :param item: item whose data changed.
+        :param row: row number;
+        :param column: column number.
+        :return: True if the cell can be edited.
         """
 
+        return False
+
+    def columnCount(self) -> int:
+        return self._model.columnCount()
+
+    def currentRow(self) -> int:
+        return self.currentIndex().row()
+
+    def get_cell_text(self, row: int, column: int) -> str:
+        """
+        :param row: row number;
+        :param column: column number.
+        :return: text of the cell. The first column contains pin indexes.
+        """
+
+        return str(row + 1) if column == 0 else ""
+
+    def get_row_brush(self, row: int) -> Optional[QBrush]:
+        """
+        :param row: row number.
+        :return: background brush for the row.
+        """
+
+        return None
+
+    def item(self, row: int, column: int) -> Optional[TableItem]:
+        """
+        :param row: row number;
+        :param column: column number.
+        :return: cell of the table.
+        """
+
+        index = self._model.index(row, column)
+        return TableItem(index) if index.isValid() else None
+
+    def rowCount(self) -> int:
+        return self._model.rowCount()
+
     @disconnect_item_signals
     def select_row(self) -> None:
         """
@@ -129,11 +174,25 @@ class TableWidget(QTableWidget):
         if index is not None:
             self.selectRow(index)
 
-    @pyqtSlot()
-    def send_current_row_index(self) -> None:
+    @pyqtSlot(QItemSelection, QItemSelection)
+    def send_current_row_index(self, selected: Optional[QItemSelection] = None, _: Optional[QItemSelection] = None
+                               ) -> None:
         """
         Slot sends a signal with the number of the table row that is activated.
+        :param selected: selected cells.
         """
 
-        pin_index = self.currentRow()
+        indexes = selected.indexes() if selected is not None else []
+        pin_index = indexes[0].row() if indexes else self.currentRow()
         self.current_row_signal.emit(pin_index, True)
+
+    def set_cell_text(self, row: int, column: int, text: str) -> bool:
+        """
+        Method is called when the user has edited the cell.
+        :param row: row number;
+        :param column: column number;
+        :param text: new text of the cell.
+        :return: True if the new text has been saved.
+        """
+
+        return False
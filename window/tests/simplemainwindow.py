@@ -1,5 +1,8 @@
+from typing import Dict, Optional
+from epcore.elements import Pin
 from epcore.filemanager import load_board_from_ufiv
-from epcore.measurementmanager import MeasurementPlan
+from epcore.measurementmanager import IVCComparator, MeasurementPlan
+from window.differencecache import DifferenceCache
 
 
 class SimpleMainWindow:
@@ -12,6 +15,8 @@ class SimpleMainWindow:
         :param board_path: path to file with board.
         """
 
+        self._comparator: IVCComparator = IVCComparator()
+        self._difference_cache: DifferenceCache = DifferenceCache(lambda settings: (0.6, 0.002))
         self._measurement_plan: MeasurementPlan = self._create_measurement_plan(board_path)
 
     @property
@@ -31,3 +36,26 @@ class SimpleMainWindow:
 
         board = load_board_from_ufiv(board_path)
         return MeasurementPlan(board, None)
+
+    def calculate_differences_for_pins(self, pins: Dict[int, Optional[Pin]]) -> Dict[int, float]:
+        """
+        :param pins: dictionary with pins and their indexes.
+        :return: dictionary with differences between reference and test signatures.
+        """
+
+        differences = {}
+        self._comparator.set_min_ivc(0.6, 0.002)
+        for index, pin in pins.items():
+            if self._difference_cache.get_pin_hash(index, pin) is not None:
+                reference, test, _ = pin.get_reference_and_test_measurements()
+                differences[index] = self._comparator.compare_ivc(reference.ivc, test.ivc)
+        return differences
+
+    def get_pin_hash(self, index: int, pin: Optional[Pin]) -> Optional[str]:
+        """
+        :param index: pin index;
+        :param pin: pin.
+        :return: hash of the reference and test measurements of the pin or None if the pin does not have them.
+        """
+
+        return self._difference_cache.get_pin_hash(index, pin)
@@ -0,0 +1,37 @@
+import unittest
+from PIL import Image
+from PyQt5.QtGui import QColor
+from window.boardimagethread import pil_to_qimage
+
+
+class TestPilToQImage(unittest.TestCase):
+
+    def check_pixel(self, image: Image.Image, expected_color: QColor) -> None:
+        """
+        :param image: PIL image;
+        :param expected_color: expected color of the pixel (1, 2) in QImage.
+        """
+
+        q_image, data = pil_to_qimage(image)
+        self.assertEqual((q_image.width(), q_image.height()), image.size)
+        self.assertEqual(q_image.pixelColor(1, 2).getRgb(), expected_color.getRgb())
+
+    def test_grayscale(self) -> None:
+        image = Image.new("L", (3, 5), 0)
+        image.putpixel((1, 2), 77)
+        self.check_pixel(image, QColor(77, 77, 77))
+
+    def test_palette(self) -> None:
+        image = Image.new("RGB", (3, 5), (0, 0, 0))
+        image.putpixel((1, 2), (255, 0, 0))
+        self.check_pixel(image.convert("P"), QColor(255, 0, 0))
+
+    def test_rgb(self) -> None:
+        image = Image.new("RGB", (3, 5), (0, 0, 0))
+        image.putpixel((1, 2), (10, 20, 30))
+        self.check_pixel(image, QColor(10, 20, 30))
+
+    def test_rgba(self) -> None:
+        image = Image.new("RGBA", (3, 5), (0, 0, 0, 255))
+        image.putpixel((1, 2), (10, 20, 30, 40))
+        self.check_pixel(image, QColor(10, 20, 30, 40))
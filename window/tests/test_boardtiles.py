@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+from PIL import Image
+from window.boardtiles import TilePyramid
+
+
+class TestTilePyramid(unittest.TestCase):
+
+    def test_create(self) -> None:
+        image = Image.new("RGB", (1300, 700), (10, 20, 30))
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "plan.uzf")
+            pyramid = TilePyramid.create(image, plan_path)
+            self.assertEqual((pyramid.width, pyramid.height), (1300, 700))
+            self.assertEqual(pyramid.levels_number, 3)
+            self.assertEqual(pyramid.get_level_size(2), (325, 175))
+            self.assertTrue(os.path.isdir(plan_path + TilePyramid.DIR_EXTENSION))
+
+            with Image.open(pyramid.get_tile_path(0, 2, 1)) as tile:
+                self.assertEqual(tile.size, (1300 - 2 * TilePyramid.TILE_SIZE, 700 - TilePyramid.TILE_SIZE))
+                self.assertEqual(tile.getpixel((0, 0)), (10, 20, 30))
+
+            os.remove(pyramid.get_tile_path(2, 0, 0))
+            pyramid = TilePyramid.create(image, plan_path)
+            self.assertFalse(os.path.exists(pyramid.get_tile_path(2, 0, 0)))
+
+    def test_create_for_new_image(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "plan.uzf")
+            pyramid_1 = TilePyramid.create(Image.new("L", (100, 100), 0), plan_path)
+            pyramid_2 = TilePyramid.create(Image.new("L", (100, 100), 255), plan_path)
+            self.assertNotEqual(pyramid_1.get_tile_path(0, 0, 0), pyramid_2.get_tile_path(0, 0, 0))
+            self.assertEqual(pyramid_2.levels_number, 1)
+
+    def test_create_from_smallest_level(self) -> None:
+        image = Image.new("RGB", (1300, 700), (10, 20, 30))
+        levels = []
+        with tempfile.TemporaryDirectory() as dir_name:
+            pyramid = TilePyramid.create(image, os.path.join(dir_name, "plan.uzf"),
+                                         level_ready=lambda pyramid_: levels.append(pyramid_.available_level))
+            self.assertEqual(levels, [2, 1, 0])
+            self.assertEqual(pyramid.available_level, 0)
+
+    def test_prune(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "plan.uzf")
+            for color in range(TilePyramid.MAX_CACHED_PYRAMIDS + 2):
+                TilePyramid.create(Image.new("L", (100, 100), color), plan_path)
+            cache_dir = plan_path + TilePyramid.DIR_EXTENSION
+            self.assertEqual(len(os.listdir(cache_dir)), TilePyramid.MAX_CACHED_PYRAMIDS)
+
+    def test_stored_image_key(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "plan.uzf")
+            with zipfile.ZipFile(plan_path, "w") as archive:
+                archive.writestr("plan.json", "{}")
+                archive.writestr("image.png", b"image")
+            with mock.patch.object(Image.Image, "tobytes", side_effect=AssertionError):
+                pyramid_1 = TilePyramid.create(Image.new("L", (100, 100), 0), plan_path, True)
+                pyramid_2 = TilePyramid.create(Image.new("L", (100, 100), 255), plan_path, True)
+            self.assertEqual(pyramid_1.get_tile_path(0, 0, 0), pyramid_2.get_tile_path(0, 0, 0))
@@ -0,0 +1,88 @@
+import math
+import unittest
+from typing import Tuple
+from epcore.elements import IVCurve, MeasurementSettings
+from window.breakdetector import BreakDetector, calculate_features, FeatureBreakDetector
+
+
+def create_curve(resistance: float, points_number: int = 100) -> IVCurve:
+    """
+    :param resistance: resistance between probes. If zero, then the probes are raised;
+    :param points_number: number of points in signature.
+    :return: signature.
+    """
+
+    voltages = [5 * math.sin(2 * math.pi * i / points_number) for i in range(points_number)]
+    currents = [voltage / resistance if resistance else 0.0 for voltage in voltages]
+    return IVCurve(currents=currents, voltages=voltages)
+
+
+def get_noise_amplitudes(settings: MeasurementSettings) -> Tuple[float, float]:
+    """
+    :param settings: measurement settings.
+    :return: noise amplitudes of voltage and current.
+    """
+
+    return 0.25, 0.0005
+
+
+class TestBreakDetector(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._break_signature: IVCurve = create_curve(0)
+        self._scores_number: int = 0
+        self._settings: MeasurementSettings = MeasurementSettings(sampling_rate=10000, internal_resistance=4750.0,
+                                                                  max_voltage=5.0, probe_signal_frequency=100)
+
+    def _calculate_score(self, curve_1: IVCurve, curve_2: IVCurve, settings: MeasurementSettings) -> float:
+        """
+        :param curve_1: first signature;
+        :param curve_2: second signature;
+        :param settings: measurement settings.
+        :return: simple difference between signatures.
+        """
+
+        self._scores_number += 1
+        return min(1.0, max(abs(i_1 - i_2) for i_1, i_2 in zip(curve_1.currents, curve_2.currents)) / 0.01)
+
+    def test_break_detector(self) -> None:
+        detector = BreakDetector(self._calculate_score)
+        results = [detector.add_signature(self._settings, create_curve(0), self._break_signature)
+                   for _ in range(BreakDetector.BREAK_NUMBER)]
+        self.assertEqual(results, [False] * (BreakDetector.BREAK_NUMBER - 1) + [True])
+        self.assertEqual(self._scores_number, BreakDetector.BREAK_NUMBER)
+
+    def test_features(self) -> None:
+        features = calculate_features(create_curve(1000))
+        self.assertAlmostEqual(features.slope, 0.001)
+        self.assertAlmostEqual(features.max_current, 0.005, places=4)
+        self.assertAlmostEqual(features.area, 0)
+
+    def test_feature_detector_accepts_break_faster(self) -> None:
+        detector = FeatureBreakDetector(self._calculate_score, get_noise_amplitudes)
+        frames_number = 0
+        while not detector.add_signature(self._settings, create_curve(0), self._break_signature):
+            frames_number += 1
+        self.assertLess(frames_number + 1, BreakDetector.BREAK_NUMBER)
+        self.assertEqual(self._scores_number, 0)
+
+    def test_feature_detector_rejects_contact(self) -> None:
+        detector = FeatureBreakDetector(self._calculate_score, get_noise_amplitudes)
+        for _ in range(5):
+            detector.add_signature(self._settings, create_curve(0), self._break_signature)
+        self.assertFalse(detector.add_signature(self._settings, create_curve(100), self._break_signature))
+        self.assertEqual(detector.confidence, 0)
+        self.assertEqual(self._scores_number, 0)
+
+    def test_feature_detector_uses_comparator_for_ambiguous_signatures(self) -> None:
+        detector = FeatureBreakDetector(self._calculate_score, get_noise_amplitudes)
+        detector.add_signature(self._settings, create_curve(10000), self._break_signature)
+        self.assertEqual(self._scores_number, 1)
+        self.assertEqual(detector.confidence, FeatureBreakDetector.DEFAULT_CONFIG.comparator_weight)
+
+    def test_feature_detector_with_zero_noise(self) -> None:
+        detector = FeatureBreakDetector(self._calculate_score, lambda settings: (0.0, 0.0))
+        self.assertFalse(detector.add_signature(self._settings, create_curve(100), self._break_signature))
+        self.assertEqual(detector.confidence, 0)
+        detector.add_signature(self._settings, create_curve(0), self._break_signature)
+        self.assertEqual(detector.confidence, FeatureBreakDetector.DEFAULT_CONFIG.feature_weight)
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from window.breaksignaturemanifest import BreakSignatureManifest
+from window.breaksignaturessaver import verify_break_signature
+
+
+class TestBreakSignatureManifest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir_path: str = tempfile.mkdtemp()
+        self._filename: str = "100hz-high-5v.json"
+        self._write_file('{"currents": [0, 1], "voltages": [2, 3]}')
+        manifest = BreakSignatureManifest(self._dir_path)
+        manifest.update_file(self._filename, [100, 10000, 47500.0, 5.0])
+        manifest.save()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._dir_path)
+
+    def _write_file(self, content: str) -> None:
+        """
+        :param content: content of break signature file.
+        """
+
+        path = os.path.join(self._dir_path, self._filename)
+        with open(path, "w") as file:
+            file.write(content)
+        # Modification time must change even on file systems with low time resolution
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+
+    def test_changed_file(self) -> None:
+        self._write_file('{"currents": [0, 1], "voltages": [2, 4]}')
+        manifest = BreakSignatureManifest(self._dir_path)
+        self.assertFalse(manifest.check_stat(self._filename))
+        self.assertFalse(manifest.check_hash(self._filename))
+
+    def test_check_options(self) -> None:
+        manifest = BreakSignatureManifest(self._dir_path)
+        self.assertTrue(manifest.check_options(self._filename, [100, 10000, 47500.0, 5.0]))
+        self.assertFalse(manifest.check_options(self._filename, [100, 10000, 4750.0, 5.0]))
+        self.assertFalse(manifest.check_options("unknown.json", [100, 10000, 47500.0, 5.0]))
+
+    def test_removed_file(self) -> None:
+        manifest = BreakSignatureManifest(self._dir_path)
+        self.assertTrue(verify_break_signature(self._dir_path, self._filename, [100, 10000, 47500.0, 5.0], manifest))
+        os.remove(os.path.join(self._dir_path, self._filename))
+        self.assertFalse(verify_break_signature(self._dir_path, self._filename, [100, 10000, 47500.0, 5.0], manifest))
+
+    def test_touched_file(self) -> None:
+        self._write_file('{"currents": [0, 1], "voltages": [2, 3]}')
+        manifest = BreakSignatureManifest(self._dir_path)
+        self.assertFalse(manifest.check_stat(self._filename))
+        self.assertTrue(manifest.check_hash(self._filename))
+        self.assertTrue(manifest.check_stat(self._filename))
+
+    def test_unchanged_file(self) -> None:
+        manifest = BreakSignatureManifest(self._dir_path)
+        self.assertTrue(manifest.check_stat(self._filename))
+
+    def test_verify_unknown_file(self) -> None:
+        filename = "100hz-low-5v.json"
+        with open(os.path.join(self._dir_path, filename), "w") as file:
+            file.write('{"currents": [0, 1], "voltages": [2, 3]}')
+        manifest_dir_path = os.path.join(self._dir_path, "cache")
+        manifest = BreakSignatureManifest(self._dir_path, manifest_dir_path)
+        self.assertTrue(verify_break_signature(self._dir_path, filename, [100, 10000, 4750.0, 5.0], manifest))
+        self.assertTrue(manifest.check_options(filename, [100, 10000, 47500.0, 5.0]))
+        self.assertFalse(os.path.exists(manifest_dir_path))
+
+        manifest.save()
+        self.assertTrue(os.path.isfile(os.path.join(manifest_dir_path, BreakSignatureManifest.FILE_NAME)))
+        self.assertFalse(verify_break_signature(self._dir_path, self._filename, [100, 10000, 4750.0, 5.0],
+                                                BreakSignatureManifest(self._dir_path)))
@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from epcore.elements import IVCurve
+from window.breaksignaturessaver import convert_break_signatures, load_signature, open_break_signature_store
+from window.breaksignaturestore import BreakSignatureStore
+
+
+DIR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "break_signatures")
+
+
+class TestBreakSignatureStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir_path: str = tempfile.mkdtemp()
+        for filename in os.listdir(DIR_PATH):
+            if filename.endswith(".json"):
+                shutil.copy(os.path.join(DIR_PATH, filename), self._dir_path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._dir_path)
+
+    def test_convert(self) -> None:
+        store = convert_break_signatures(self._dir_path)
+        filenames = [filename for filename in os.listdir(self._dir_path) if filename.endswith(".json")]
+        self.assertEqual(sorted(store.get_names()), sorted(filenames))
+
+        signatures = store.load_signatures(filenames + ["unknown.json"])
+        self.assertIsNone(signatures["unknown.json"])
+        for filename in filenames:
+            curve = load_signature(os.path.join(self._dir_path, filename))
+            self.assertEqual(signatures[filename].currents, curve.currents)
+            self.assertEqual(signatures[filename].voltages, curve.voltages)
+
+    def test_no_store(self) -> None:
+        store = BreakSignatureStore(self._dir_path)
+        self.assertFalse(store.exists)
+        self.assertEqual(store.get_names(), [])
+
+    def test_open_outdated_store(self) -> None:
+        store = open_break_signature_store(self._dir_path)
+        self.assertTrue(store.exists)
+        filename = store.get_names()[0]
+        path = os.path.join(self._dir_path, filename)
+        curve = load_signature(path)
+        new_curve = IVCurve(currents=[value + 1 for value in curve.currents], voltages=curve.voltages)
+        with open(path, "w") as file:
+            json.dump(new_curve.to_json(), file)
+        os.utime(path, ns=(store.mtime_ns + 1, store.mtime_ns + 1))
+
+        store = open_break_signature_store(self._dir_path)
+        self.assertEqual(store.load_signatures([filename])[filename].currents, new_curve.currents)
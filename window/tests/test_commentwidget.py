@@ -2,6 +2,7 @@ import os
 import sys
 import unittest
 from typing import Tuple
+from unittest import mock
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
 from window.commentwidget import CommentWidget
@@ -60,3 +61,28 @@ class TestCommentWidget(unittest.TestCase):
         for row in range(comment_widget.rowCount()):
             item = comment_widget.item(row, 1)
             self.assertEqual(item.text(), f"comment for pin {row + 1}")
+
+    def test_update_indexes(self) -> None:
+        _, comment_widget = prepare_data("simple_board.json")
+        comment_widget.update_info()
+        comment_widget.remove_comment(0)
+        self.assertEqual(comment_widget.rowCount(), 2)
+        for row in range(comment_widget.rowCount()):
+            self.assertEqual(comment_widget.item(row, 0).text(), str(row + 1))
+
+    def test_row_brushes_are_calculated_after_drawing(self) -> None:
+        window, comment_widget = prepare_data("simple_board.json")
+        window.check_good_difference = lambda *args: True
+        window.tolerance = 0.5
+        comment_widget.update_info()
+        with mock.patch.object(window, "calculate_differences_for_pins", wraps=window.calculate_differences_for_pins
+                               ) as calculate:
+            self.assertIsNone(comment_widget.get_row_brush(0))
+            calculate.assert_not_called()
+            self._app.processEvents()
+            calculate.assert_called_once()
+            self.assertIsNotNone(comment_widget.get_row_brush(0))
+
+            comment_widget.update_table_for_new_tolerance(0)
+            self._app.processEvents()
+            calculate.assert_called_once()
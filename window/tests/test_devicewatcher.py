@@ -0,0 +1,87 @@
+import time
+import unittest
+from collections import namedtuple
+from typing import Callable, List
+import connection_window as cw
+from window.devicewatcher import DeviceWatcher, WatchTask
+
+
+Port = namedtuple("Port", ["device", "vid", "pid"])
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 2) -> bool:
+    """
+    :param condition: function that returns True when the condition is met;
+    :param timeout: maximum waiting time in seconds.
+    :return: True if the condition has been met.
+    """
+
+    end_time = time.monotonic() + timeout
+    while time.monotonic() < end_time:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestDeviceWatcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._attempts: List[int] = []
+        self._connected: bool = False
+        self._ports: List[Port] = []
+        self._watcher: DeviceWatcher = DeviceWatcher(self._connect, lambda: list(self._ports), poll_interval=0.01,
+                                                     retry_interval=60)
+        self._watcher.start()
+        self._vid, self._pid = cw.utils.get_vid_and_pid("ivm")
+
+    def tearDown(self) -> None:
+        self._watcher.stop_thread()
+        self._watcher.wait()
+
+    def _connect(self, task_id: int) -> bool:
+        """
+        :param task_id: ID of the task.
+        :return: True if devices have been connected.
+        """
+
+        self._attempts.append(task_id)
+        return self._connected
+
+    def test_connect_when_port_appears(self) -> None:
+        self._watcher.watch(WatchTask(1, {cw.utils.create_uri_name("ttyACM0"): "ivm"}))
+        time.sleep(0.1)
+        self.assertEqual(self._attempts, [])
+
+        self._ports.append(Port("ttyACM0", self._vid + 1, self._pid))
+        time.sleep(0.1)
+        self.assertEqual(self._attempts, [])
+
+        self._ports.append(Port("ttyACM1", self._vid, self._pid))
+        self._ports[0] = Port("ttyACM0", self._vid, self._pid)
+        self.assertTrue(wait_for(lambda: self._attempts == [1]))
+        time.sleep(0.1)
+        self.assertEqual(self._attempts, [1])
+
+        self._ports.pop()
+        self.assertTrue(wait_for(lambda: self._attempts == [1, 1]))
+
+        self._watcher.request_attempt()
+        self.assertTrue(wait_for(lambda: self._attempts == [1, 1, 1]))
+
+    def test_stop_after_connection(self) -> None:
+        self._connected = True
+        self._watcher.watch(WatchTask(2, {}))
+        self.assertTrue(wait_for(lambda: self._attempts == [2]))
+        self._watcher.request_attempt()
+        time.sleep(0.1)
+        self.assertEqual(self._attempts, [2])
+
+    def test_stop_watching(self) -> None:
+        self._ports.append(Port("ttyACM0", self._vid, self._pid))
+        self._watcher.stop_watching()
+        self._watcher.watch(WatchTask(3, {cw.utils.create_uri_name("ttyACM1"): "ivm"}))
+        self._watcher.stop_watching()
+        self._ports.append(Port("ttyACM1", self._vid, self._pid))
+        time.sleep(0.1)
+        self.assertEqual(self._attempts, [])
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from typing import Dict
+from unittest import mock
+from epcore.elements import IVCurve, Measurement, MeasurementSettings, Pin
+from window.differencecache import DifferenceCache
+
+
+def create_pin(shift: float) -> Pin:
+    """
+    :param shift: shift of current in the test signature.
+    :return: pin with reference and test measurements.
+    """
+
+    settings = MeasurementSettings(sampling_rate=10000, internal_resistance=4750.0, max_voltage=5.0,
+                                   probe_signal_frequency=100)
+    reference = Measurement(settings=settings, ivc=IVCurve(currents=[0.0, 0.1, 0.2], voltages=[0.0, 1.0, 2.0]),
+                            is_reference=True)
+    test = Measurement(settings=settings, ivc=IVCurve(currents=[shift, 0.1 + shift, 0.2 + shift],
+                                                      voltages=[0.0, 1.0, 2.0]))
+    return Pin(0, 0, measurements=[reference, test])
+
+
+class TestDifferenceCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._cache: DifferenceCache = DifferenceCache(lambda settings: (0.6, 0.002))
+        self._pins: Dict[int, Pin] = {index: create_pin(0.01 * index) for index in range(4)}
+        _, pins, hashes = self._cache.get_differences(self._pins)
+        self._cache.update({index: 0.1 * index for index in pins}, hashes)
+
+    def test_cached_differences(self) -> None:
+        differences, pins, _ = self._cache.get_differences(self._pins)
+        self.assertEqual(pins, {})
+        self.assertEqual(differences, {index: 0.1 * index for index in range(4)})
+
+    def test_get_cached_differences(self) -> None:
+        self._cache.invalidate(1)
+        self.assertEqual(self._cache.get_cached_differences(), {0: 0, 2: 0.2, 3: 0.1 * 3})
+
+    def test_changed_measurement(self) -> None:
+        self._pins[2] = create_pin(1)
+        differences, pins, _ = self._cache.get_differences(self._pins)
+        self.assertEqual(list(pins.keys()), [2])
+        self.assertNotIn(2, differences)
+
+    def test_lookup_does_not_read_signatures(self) -> None:
+        with mock.patch("window.differencecache.get_measurement_hash") as get_measurement_hash:
+            differences, pins, _ = self._cache.get_differences(self._pins)
+        get_measurement_hash.assert_not_called()
+        self.assertEqual(pins, {})
+
+    def test_record_pin(self) -> None:
+        self._pins[1] = create_pin(1)
+        self._cache.record_pin(1, self._pins[1])
+        self.assertNotIn(1, self._cache.get_cached_differences())
+        _, pins, hashes = self._cache.get_differences(self._pins)
+        self.assertEqual(list(pins.keys()), [1])
+        self._cache.update({1: 0.5}, hashes)
+        self.assertEqual(self._cache.get_cached_differences()[1], 0.5)
+
+    def test_invalidate(self) -> None:
+        self._cache.invalidate(1)
+        _, pins, _ = self._cache.get_differences(self._pins)
+        self.assertEqual(list(pins.keys()), [1])
+
+    def test_remove_pin(self) -> None:
+        self._cache.remove_pin(1)
+        pins = {0: self._pins[0], 1: self._pins[2], 2: self._pins[3]}
+        differences, missing_pins, _ = self._cache.get_differences(pins)
+        self.assertEqual(missing_pins, {})
+        self.assertEqual(differences, {0: 0, 1: 0.2, 2: 0.1 * 3})
+
+    def test_save_and_load(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "board.uzf")
+            self._cache.save(plan_path)
+            self.assertTrue(os.path.isfile(os.path.join(dir_name, "board.differences.json")))
+
+            cache = DifferenceCache(lambda settings: (0.6, 0.002))
+            cache.load(plan_path, self._pins.items())
+            self.assertEqual(cache.get_cached_differences(), {})
+            differences, pins, _ = cache.get_differences(self._pins)
+            self.assertEqual(pins, {})
+            self.assertEqual(differences, {index: 0.1 * index for index in range(4)})
+
+    def test_save_and_load_with_plan_file(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            plan_path = os.path.join(dir_name, "board.uzf")
+            with open(plan_path, "w") as file:
+                file.write("plan")
+            self._cache.save(plan_path)
+
+            cache = DifferenceCache(lambda settings: (0.6, 0.002))
+            cache.load(plan_path, self._pins.items())
+            self.assertEqual(cache.get_cached_differences(), {index: 0.1 * index for index in range(4)})
+            with mock.patch("window.differencecache.get_measurement_hash") as get_measurement_hash:
+                differences, _, _ = cache.get_differences(self._pins)
+            get_measurement_hash.assert_not_called()
+            self.assertEqual(differences, {index: 0.1 * index for index in range(4)})
+
+            with open(plan_path, "w") as file:
+                file.write("changed plan")
+            cache.load(plan_path, self._pins.items())
+            self.assertEqual(cache.get_cached_differences(), {})
+            with mock.patch("window.differencecache.get_measurement_hash", return_value="") as get_measurement_hash:
+                cache.get_differences(self._pins)
+            self.assertEqual(get_measurement_hash.call_count, 4)
@@ -0,0 +1,103 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+import zlib
+from unittest import mock
+from epcore.elements import IVCurve
+from epcore.filemanager import load_board_from_ufiv
+from window.lazyplanloader import CompressedText, CurveDecoder, LazyIVCurve, load_board_lazily
+
+
+DIR_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+class TestLazyPlanLoader(unittest.TestCase):
+
+    def test_compressed_text(self) -> None:
+        text = bytes(range(256)) * 300
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        data = compressor.compress(text) + compressor.flush()
+        with mock.patch.object(CompressedText, "BLOCK_SIZE", 1000), \
+                mock.patch.object(CompressedText, "CHUNK_SIZE", 100):
+            compressed_text, decompressed_text = CompressedText.from_deflated(data, zlib.crc32(text))
+            compressed_texts = [compressed_text, CompressedText.from_text(text)]
+        compressed_texts.append(CompressedText.from_deflated(data, zlib.crc32(text))[0])
+        self.assertEqual(decompressed_text, text)
+        for compressed_text in compressed_texts:
+            for start, end in ((0, 10), (990, 1010), (500, 5500), (len(text) - 5, len(text))):
+                self.assertEqual(compressed_text.read(start, end), text[start:end])
+        with self.assertRaises(ValueError):
+            CompressedText.from_deflated(data, zlib.crc32(text) ^ 1)
+
+    def test_curve_decoder(self) -> None:
+        arrays = [[0, 1], [2.5, 3], [4, 5]]
+        decoder = CurveDecoder(arrays.__getitem__, max_decoded_curves=1)
+        self.assertEqual(decoder.get_curve(0, 1), ([0, 1], [2.5, 3]))
+        self.assertEqual(decoder.get_curve(1, 2), ([2.5, 3], [4, 5]))
+        self.assertEqual(decoder.decoded_number, 1)
+
+    def test_lazy_curve(self) -> None:
+        decoder = CurveDecoder([[0, 1], [2, 3]].__getitem__)
+        curve = LazyIVCurve(decoder, 0, 1)
+        self.assertFalse(curve.is_decoded)
+        self.assertEqual(curve, IVCurve(currents=[0, 1], voltages=[2, 3]))
+        self.assertEqual(type(copy.deepcopy(curve)), IVCurve)
+
+        curve.currents = [5, 6]
+        self.assertTrue(curve.is_decoded)
+        self.assertEqual(curve.currents, [5, 6])
+        self.assertEqual(curve.voltages, [2, 3])
+
+    def test_load_board_lazily(self) -> None:
+        for file_name in ("simple_board.json", "board_mux.json"):
+            path = os.path.join(DIR_NAME, file_name)
+            board = load_board_from_ufiv(path, auto_convert_p10=True)
+            lazy_board = load_board_lazily(path, max_decoded_curves=1)
+            self.assertEqual(len(lazy_board.elements), len(board.elements))
+            for element, lazy_element in zip(board.elements, lazy_board.elements):
+                self.assertEqual(len(lazy_element.pins), len(element.pins))
+                for pin, lazy_pin in zip(element.pins, lazy_element.pins):
+                    self.assertEqual((lazy_pin.x, lazy_pin.y, lazy_pin.comment), (pin.x, pin.y, pin.comment))
+                    self.assertEqual(len(lazy_pin.measurements), len(pin.measurements))
+                    for measurement, lazy_measurement in zip(pin.measurements, lazy_pin.measurements):
+                        self.assertIsInstance(lazy_measurement.ivc, LazyIVCurve)
+                        self.assertEqual(lazy_measurement.settings, measurement.settings)
+                        self.assertEqual(lazy_measurement.ivc.currents, measurement.ivc.currents)
+                        self.assertEqual(lazy_measurement.ivc.voltages, measurement.ivc.voltages)
+
+    def test_load_board_lazily_from_archive(self) -> None:
+        board = load_board_from_ufiv(os.path.join(DIR_NAME, "board_mux.json"))
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = os.path.join(dir_name, "board.uzf")
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(os.path.join(DIR_NAME, "board_mux.json"), "board.json")
+            with mock.patch.object(CompressedText, "BLOCK_SIZE", 1 << 14):
+                lazy_board = load_board_lazily(path)
+            os.remove(path)
+            self.assertEqual(os.listdir(dir_name), [])
+
+        lazy_pins = [pin for element in lazy_board.elements for pin in element.pins]
+        pins = [pin for element in board.elements for pin in element.pins]
+        self.assertEqual(len(lazy_pins), len(pins))
+        for pin, lazy_pin in zip(reversed(pins), reversed(lazy_pins)):
+            for measurement, lazy_measurement in zip(pin.measurements, lazy_pin.measurements):
+                self.assertIsInstance(lazy_measurement.ivc, LazyIVCurve)
+                self.assertEqual(lazy_measurement.ivc.currents, measurement.ivc.currents)
+                self.assertEqual(lazy_measurement.ivc.voltages, measurement.ivc.voltages)
+
+    def test_load_board_lazily_and_replace_file(self) -> None:
+        board = load_board_from_ufiv(os.path.join(DIR_NAME, "simple_board.json"), auto_convert_p10=True)
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = os.path.join(dir_name, "board.json")
+            shutil.copy(os.path.join(DIR_NAME, "simple_board.json"), path)
+            lazy_board = load_board_lazily(path)
+            with open(path, "w") as file:
+                file.write("{}")
+            self.assertEqual(os.listdir(dir_name), ["board.json"])
+            measurement = board.elements[0].pins[0].measurements[0]
+            lazy_measurement = lazy_board.elements[0].pins[0].measurements[0]
+            self.assertIsInstance(lazy_measurement.ivc, LazyIVCurve)
+            self.assertEqual(lazy_measurement.ivc.currents, measurement.ivc.currents)
@@ -0,0 +1,101 @@
+import sys
+import time
+import unittest
+from PyQt5.QtWidgets import QApplication
+from epcore.ivmeasurer import IVMeasurerVirtual
+from epcore.measurementmanager import MeasurementSystem
+from window.measurementthread import MeasurementThread
+
+
+def create_measurement_thread(pipelined: bool) -> MeasurementThread:
+    """
+    :param pipelined: if True, then the thread will work in pipelined mode.
+    :return: started measurement thread with virtual IV-measurer.
+    """
+
+    measurement_system = MeasurementSystem([IVMeasurerVirtual()])
+    measurement_system.trigger_measurements()
+    thread = MeasurementThread(measurement_system, pipelined=pipelined)
+    thread.start()
+    return thread
+
+
+def measure_fps(pipelined: bool, processing_time: float = 0.02, duration: float = 1) -> float:
+    """
+    Function models the main window that takes frames from the measurement thread and spends some time to process
+    each frame.
+    :param pipelined: if True, then the thread will work in pipelined mode;
+    :param processing_time: time to process one frame;
+    :param duration: duration of measurements.
+    :return: number of frames measured per second.
+    """
+
+    thread = create_measurement_thread(pipelined)
+    last_frame = None
+    start_time = time.monotonic()
+    while time.monotonic() - start_time < duration:
+        frame = thread.get_last_frame()
+        if frame is None:
+            time.sleep(0.001)
+            continue
+
+        last_frame = frame
+        time.sleep(processing_time)
+        thread.frame_processed()
+
+    thread.stop_thread()
+    thread.wait()
+    return last_frame.sequence_number / duration if last_frame else 0
+
+
+class TestMeasurementThread(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = QApplication(sys.argv)
+
+    def tearDown(self) -> None:
+        self.app.exit(0)
+
+    def test_frames_in_sequential_mode(self) -> None:
+        thread = create_measurement_thread(False)
+        frame = None
+        while frame is None:
+            frame = thread.get_last_frame()
+        time.sleep(0.1)
+        self.assertIsNone(thread.get_last_frame())
+
+        thread.frame_processed()
+        next_frame = None
+        while next_frame is None:
+            next_frame = thread.get_last_frame()
+        self.assertEqual(next_frame.sequence_number, frame.sequence_number + 1)
+        self.assertEqual(len(next_frame.curves), 1)
+
+        thread.stop_thread()
+        thread.wait()
+
+    def test_pipelined_mode_is_faster(self) -> None:
+        sequential_fps = measure_fps(False)
+        pipelined_fps = measure_fps(True)
+        self.assertGreater(sequential_fps, 0)
+        self.assertGreater(pipelined_fps, sequential_fps,
+                           f"Pipelined mode: {pipelined_fps:.1f} fps, sequential mode: {sequential_fps:.1f} fps")
+
+    def test_stale_frames_after_settings_change(self) -> None:
+        thread = create_measurement_thread(True)
+        frame = None
+        while frame is None:
+            frame = thread.get_last_frame()
+        self.assertEqual(frame.settings_generation, 0)
+
+        generation = thread.set_settings(frame.settings)
+        self.assertEqual(generation, 1)
+        self.assertEqual(thread.settings_generation, generation)
+        for _ in range(5):
+            next_frame = None
+            while next_frame is None:
+                next_frame = thread.get_last_frame()
+            self.assertEqual(next_frame.settings_generation, generation)
+
+        thread.stop_thread()
+        thread.wait()
@@ -0,0 +1,58 @@
+import os
+import unittest
+from typing import Dict
+from epcore.elements import MeasurementSettings
+from epcore.filemanager import load_board_from_ufiv
+from epcore.product import EyePointProduct
+from window.breaksignaturessaver import create_filename
+from window.language import Language
+from window.optionscache import OptionsCache
+
+
+class CountingProduct(EyePointProduct):
+    """
+    Class for product that counts searches of options for measurement settings.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls_number: int = 0
+
+    def settings_to_options(self, settings: MeasurementSettings) -> Dict[EyePointProduct.Parameter, str]:
+        self.calls_number += 1
+        return super().settings_to_options(settings)
+
+
+def get_settings() -> MeasurementSettings:
+    """
+    :return: measurement settings of the first measurement from the test board.
+    """
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data", "simple_board.json")
+    board = load_board_from_ufiv(path, auto_convert_p10=True)
+    return board.elements[0].pins[0].measurements[0].settings
+
+
+class TestOptionsCache(unittest.TestCase):
+
+    def test_break_signature_filename(self) -> None:
+        product = EyePointProduct()
+        settings = get_settings()
+        options = product.settings_to_options(settings)
+        cache = OptionsCache(product)
+        filename = create_filename(options[EyePointProduct.Parameter.frequency],
+                                   options[EyePointProduct.Parameter.sensitive],
+                                   options[EyePointProduct.Parameter.voltage])
+        self.assertEqual(cache.get_break_signature_filename(settings), filename)
+
+    def test_cache(self) -> None:
+        product = CountingProduct()
+        settings = get_settings()
+        cache = OptionsCache(product)
+        self.assertEqual(cache.get_options(settings), product.settings_to_options(settings))
+        self.assertEqual(len(cache.get_labels(settings, Language.EN)), len(cache.get_labels(settings, Language.RU)))
+        self.assertEqual(product.calls_number, 2)
+
+        cache.clear()
+        cache.get_options(settings)
+        self.assertEqual(product.calls_number, 3)
@@ -0,0 +1,79 @@
+import sys
+import time
+import unittest
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+from window.pinclusters import PinClusterItem
+from window.pinspatialindex import PinSpatialIndex
+
+
+def render(scene: QGraphicsScene, source: QRectF, size: int = 200) -> QImage:
+    """
+    :param scene: scene to draw;
+    :param source: area of the scene to draw;
+    :param size: size of the image.
+    :return: image of the area of the scene.
+    """
+
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(QColor(0, 0, 0))
+    painter = QPainter(image)
+    scene.render(painter, QRectF(0, 0, size, size), source)
+    painter.end()
+    return image
+
+
+class TestPinClusterItem(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._app: QApplication = QApplication(sys.argv)
+
+    def test_colors(self) -> None:
+        pin_index = PinSpatialIndex([(100, 100), (102, 102), (900, 900), (902, 902), (500, 100)])
+        scene = QGraphicsScene()
+        item = PinClusterItem(pin_index, lambda: {0: True, 1: False, 2: True})
+        scene.addItem(item)
+        image = render(scene, QRectF(0, 0, 1000, 1000))
+        bad_color = image.pixelColor(20, 20)
+        self.assertGreater(bad_color.red(), bad_color.green())
+        good_color = image.pixelColor(180, 180)
+        self.assertGreater(good_color.green(), good_color.red())
+        unknown_color = image.pixelColor(100, 20)
+        self.assertEqual(unknown_color.red(), unknown_color.green())
+        self.assertGreater(unknown_color.red(), 0)
+        self.assertEqual(image.pixelColor(100, 100).rgb(), QColor(0, 0, 0).rgb())
+
+    def test_time_does_not_depend_on_pins_number(self) -> None:
+        durations = []
+        for size in (30, 300):
+            pin_index = PinSpatialIndex([(10 * x, 10 * y) for x in range(size) for y in range(size)])
+            scene = QGraphicsScene()
+            scene.addItem(PinClusterItem(pin_index, dict))
+            source = QRectF(0, 0, 10 * size, 10 * size)
+            render(scene, source)
+            start = time.perf_counter()
+            render(scene, source)
+            durations.append(time.perf_counter() - start)
+        self.assertLess(durations[1], 10 * durations[0] + 0.05)
+
+    def test_incremental_update(self) -> None:
+        pin_index = PinSpatialIndex([(100, 100), (102, 102), (900, 900)])
+        scene = QGraphicsScene()
+        item = PinClusterItem(pin_index, lambda: {0: True, 1: False})
+        scene.addItem(item)
+        source = QRectF(0, 0, 1000, 1000)
+        render(scene, source)
+
+        item.insert_point(0, 500, 100)
+        pin_index.insert(0, 500, 100)
+        item.move_point(2, 900, 500)
+        pin_index.move(2, 900, 500)
+        item.remove_point(3)
+        pin_index.remove(3)
+        image = render(scene, source)
+
+        expected_scene = QGraphicsScene()
+        expected_scene.addItem(PinClusterItem(PinSpatialIndex([(500, 100), (100, 100), (900, 500)]),
+                                              lambda: {1: True, 2: False}))
+        self.assertEqual(image, render(expected_scene, source))
@@ -0,0 +1,51 @@
+import math
+import random
+import unittest
+from window.pinspatialindex import PinSpatialIndex
+
+
+class TestPinSpatialIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        random.seed(1)
+        self.points = [(random.uniform(-500, 2000), random.uniform(-500, 2000)) for _ in range(500)]
+        self.index = PinSpatialIndex(self.points, cell_size=50)
+
+    def test_find_nearest(self) -> None:
+        for _ in range(50):
+            x, y = random.uniform(-1000, 2500), random.uniform(-1000, 2500)
+            expected = min(range(len(self.points)),
+                           key=lambda i: (math.hypot(self.points[i][0] - x, self.points[i][1] - y), i))
+            self.assertEqual(self.index.find_nearest(x, y), expected)
+
+    def test_find_nearest_with_max_distance(self) -> None:
+        index = PinSpatialIndex([(0, 0), (100, 0)])
+        self.assertEqual(index.find_nearest(10, 0, max_distance=20), 0)
+        self.assertIsNone(index.find_nearest(50, 40, max_distance=20))
+        self.assertIsNone(PinSpatialIndex().find_nearest(0, 0))
+
+    def test_find_nearest_in_direction(self) -> None:
+        index = PinSpatialIndex([(0, 0), (10, 1), (-30, 0), (0, 20), (3, -300)])
+        self.assertEqual(index.find_nearest_in_direction(0, 1, 0), 1)
+        self.assertEqual(index.find_nearest_in_direction(0, -1, 0), 2)
+        self.assertEqual(index.find_nearest_in_direction(0, 0, 1), 3)
+        self.assertEqual(index.find_nearest_in_direction(0, 0, -1), 4)
+        self.assertIsNone(index.find_nearest_in_direction(1, 1, 0))
+
+    def test_get_pins_in_rect(self) -> None:
+        expected = [i for i, (x, y) in enumerate(self.points) if 100 <= x <= 700 and -200 <= y <= 300]
+        self.assertEqual(self.index.get_pins_in_rect(100, -200, 700, 300), expected)
+        self.assertEqual(self.index.get_pins_in_rect(-1e6, -1e6, 1e6, 1e6), list(range(len(self.points))))
+
+    def test_insert_move_remove(self) -> None:
+        index = PinSpatialIndex([(0, 0), (500, 500), (1000, 1000)])
+        index.insert(1, 200, 200)
+        self.assertEqual(index.find_nearest(990, 990), 3)
+        self.assertEqual(index.find_nearest(210, 210), 1)
+        index.move(1, 2000, 2000)
+        self.assertEqual(index.find_nearest(210, 210), 0)
+        self.assertEqual(index.get_point(1), (2000, 2000))
+        index.remove(0)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.get_pins_in_rect(400, 400, 2500, 2500), [0, 1, 2])
+        self.assertEqual(index.find_nearest(0, 0), 1)
@@ -0,0 +1,66 @@
+import random
+import unittest
+from typing import List, Tuple
+from window.pinstateindex import PinStateIndex
+
+
+def get_ranges(states: List[bool], state: bool) -> List[Tuple[int, int]]:
+    """
+    :param states: states of pins;
+    :param state: required state.
+    :return: ranges of consecutive pins with the required state.
+    """
+
+    ranges = []
+    for index, pin_state in enumerate(states):
+        if pin_state != state:
+            continue
+        if ranges and ranges[-1][1] + 1 == index:
+            ranges[-1] = ranges[-1][0], index
+        else:
+            ranges.append((index, index))
+    return ranges
+
+
+class TestPinStateIndex(unittest.TestCase):
+
+    def test_get_ranges(self) -> None:
+        states = [index in (1, 2, 3, 5, 6, 27, 34, 35, 36, 37) for index in range(40)]
+        index = PinStateIndex(states)
+        self.assertEqual(list(index.get_ranges(True)), [(1, 3), (5, 6), (27, 27), (34, 37)])
+        self.assertEqual(index.true_number, 10)
+        self.assertEqual(index.false_number, 30)
+
+    def test_insert_and_remove(self) -> None:
+        index = PinStateIndex([True, True, False, True])
+        index.insert(0, False)
+        self.assertEqual(list(index.get_ranges(False)), [(0, 0), (3, 3)])
+        index.remove(3)
+        self.assertEqual(list(index.get_ranges(True)), [(1, 3)])
+        index.set(2, False)
+        self.assertEqual([index.get(i) for i in range(len(index))], [False, True, False, True])
+        with self.assertRaises(IndexError):
+            index.remove(4)
+
+    def test_random_operations(self) -> None:
+        random.seed(1)
+        states = [random.random() < 0.5 for _ in range(50)]
+        index = PinStateIndex(states)
+        for _ in range(1000):
+            operation = random.random()
+            if operation < 0.3 or not states:
+                position, state = random.randint(0, len(states)), random.random() < 0.5
+                states.insert(position, state)
+                index.insert(position, state)
+            elif operation < 0.6:
+                position = random.randrange(len(states))
+                states.pop(position)
+                index.remove(position)
+            else:
+                position, state = random.randrange(len(states)), random.random() < 0.5
+                states[position] = state
+                index.set(position, state)
+            self.assertEqual(len(index), len(states))
+            self.assertEqual(index.true_number, sum(states))
+        for state in (False, True):
+            self.assertEqual(list(index.get_ranges(state)), get_ranges(states, state))
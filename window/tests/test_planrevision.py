@@ -0,0 +1,35 @@
+import unittest
+from window.planrevision import PlanRevision
+
+
+class TestPlanRevision(unittest.TestCase):
+
+    def test_is_modified(self) -> None:
+        plan_revision = PlanRevision()
+        self.assertTrue(plan_revision.is_modified)
+
+        plan_revision.mark_saved()
+        self.assertFalse(plan_revision.is_modified)
+
+        plan_revision.increase()
+        self.assertTrue(plan_revision.is_modified)
+        self.assertEqual(plan_revision.revision, 1)
+
+        plan_revision.mark_saved()
+        self.assertFalse(plan_revision.is_modified)
+
+    def test_mark_saved_old_revision(self) -> None:
+        plan_revision = PlanRevision()
+        plan_revision.mark_saved()
+        saved_revision = plan_revision.revision
+        plan_revision.increase()
+        plan_revision.mark_saved(saved_revision)
+        self.assertTrue(plan_revision.is_modified)
+
+    def test_reset(self) -> None:
+        plan_revision = PlanRevision()
+        plan_revision.increase()
+        plan_revision.mark_saved()
+        plan_revision.reset()
+        self.assertEqual(plan_revision.revision, 0)
+        self.assertTrue(plan_revision.is_modified)
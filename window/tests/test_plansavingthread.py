@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from PyQt5.QtCore import Qt
+from epcore.elements import Pin
+from epcore.filemanager import load_board_from_ufiv
+from epcore.measurementmanager import MeasurementPlan
+from window.plansavingthread import create_board_snapshot, PlanSavingThread, save_board_atomically
+
+
+def create_measurement_plan() -> MeasurementPlan:
+    """
+    :return: simple measurement plan loaded from a file.
+    """
+
+    dir_name = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+    board = load_board_from_ufiv(os.path.join(dir_name, "simple_board.json"))
+    return MeasurementPlan(board, None)
+
+
+def get_pins_number(board) -> int:
+    """
+    :param board: board.
+    :return: number of pins on the board.
+    """
+
+    return sum(len(element.pins) for element in board.elements)
+
+
+class TestPlanSaving(unittest.TestCase):
+
+    def test_board_snapshot(self) -> None:
+        plan = create_measurement_plan()
+        snapshot = create_board_snapshot(plan)
+        comment = snapshot.elements[0].pins[0].comment
+
+        plan.append_pin(Pin(10, 10, measurements=[]))
+        plan.go_pin(0)
+        plan.get_current_pin().comment = "new comment"
+        plan.get_current_pin().measurements.clear()
+        self.assertEqual(get_pins_number(snapshot), 3)
+        self.assertEqual(snapshot.elements[0].pins[0].comment, comment)
+        self.assertEqual(len(snapshot.elements[0].pins[0].measurements), 1)
+
+    def test_save_board_atomically(self) -> None:
+        plan = create_measurement_plan()
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = save_board_atomically(create_board_snapshot(plan), os.path.join(dir_name, "board.uzf"))
+            self.assertEqual(os.listdir(dir_name), [os.path.basename(path)])
+            board = load_board_from_ufiv(path)
+            self.assertEqual(get_pins_number(board), get_pins_number(plan))
+
+    def test_saving_thread(self) -> None:
+        plan = create_measurement_plan()
+        progress = []
+        finished = []
+        thread = PlanSavingThread()
+        thread.saving_progress.connect(lambda *args: progress.append(args), Qt.DirectConnection)
+        thread.saving_finished.connect(lambda *args: finished.append(args), Qt.DirectConnection)
+        thread.start()
+        with tempfile.TemporaryDirectory() as dir_name:
+            task_id = thread.add_task(plan, os.path.join(dir_name, "board.uzf"))
+            start = time.monotonic()
+            thread.stop_thread()
+            self.assertTrue(thread.wait(10000))
+            self.assertLess(time.monotonic() - start, 10)
+
+        self.assertEqual([args[0] for args in finished], [task_id])
+        steps = [done_steps for _, done_steps, _ in progress]
+        self.assertEqual(steps, sorted(steps))
+        self.assertEqual(progress[0], (task_id, 0, 3))
+        self.assertEqual(progress[-1], (task_id, 3, 3))
+
+    def test_saving_thread_with_binary_signatures(self) -> None:
+        plan = create_measurement_plan()
+        progress = []
+        thread = PlanSavingThread()
+        thread.saving_progress.connect(lambda *args: progress.append(args), Qt.DirectConnection)
+        thread.start()
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = os.path.join(dir_name, "board.uzf")
+            task_id = thread.add_task(plan, path, True)
+            thread.add_task(plan, path)
+            thread.stop_thread()
+            self.assertTrue(thread.wait(10000))
+            self.assertEqual(os.listdir(dir_name), ["board.uzf"])
+
+        self.assertIn((task_id, 6, 6), progress)
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from epcore.filemanager import load_board_from_ufiv
+from window.lazyplanloader import load_board_lazily
+from window.signaturesidecar import SignatureSidecar
+
+
+DIR_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+class TestSignatureSidecar(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir_name: str = tempfile.mkdtemp()
+        self._path: str = os.path.join(self._dir_name, "board_mux.json")
+        shutil.copy(os.path.join(DIR_NAME, "board_mux.json"), self._path)
+        self._board = load_board_from_ufiv(self._path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._dir_name)
+
+    def test_load_from_sidecar(self) -> None:
+        SignatureSidecar.save(self._board, self._path)
+        sidecar = SignatureSidecar.open(self._path)
+        self.assertIsNotNone(sidecar)
+        self.assertLess(os.path.getsize(SignatureSidecar.get_file_name(self._path)), os.path.getsize(self._path))
+
+        board = load_board_lazily(self._path)
+        measurement = self._board.elements[0].pins[0].measurements[0]
+        lazy_measurement = board.elements[0].pins[0].measurements[0]
+        self.assertEqual(lazy_measurement.ivc.currents, measurement.ivc.currents)
+        self.assertEqual(lazy_measurement.ivc.voltages, measurement.ivc.voltages)
+        pin = self._board.elements[0].pins[0]
+        self.assertEqual(board.elements[0].pins[0].multiplexer_output, pin.multiplexer_output)
+
+    def test_outdated_sidecar(self) -> None:
+        SignatureSidecar.save(self._board, self._path)
+        with open(self._path, "a") as file:
+            file.write(" ")
+        self.assertIsNone(SignatureSidecar.open(self._path))
+
+    def test_outdated_sidecar_with_same_size_and_time(self) -> None:
+        SignatureSidecar.save(self._board, self._path)
+        stat = os.stat(self._path)
+        with open(self._path, "r+b") as file:
+            first_byte = file.read(1)
+            file.seek(0)
+            file.write(b" " if first_byte != b" " else b"\n")
+        os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIsNone(SignatureSidecar.open(self._path))
+
+    def test_single_precision(self) -> None:
+        SignatureSidecar.save(self._board, self._path, "f")
+        sidecar = SignatureSidecar.open(self._path)
+        currents = self._board.elements[0].pins[0].measurements[0].ivc.currents
+        for value, expected_value in zip(sidecar.get_array(0), currents):
+            self.assertAlmostEqual(value, expected_value, places=6)